@@ -5,8 +5,9 @@ import html
 import json
 import os
 from pathlib import Path
-import queue
 import re
+import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -18,6 +19,7 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse
 from urllib.request import Request, urlopen
 from tkinter import filedialog, messagebox, scrolledtext, simpledialog, ttk
+from tkinter import font as tkfont
 
 import mistune
 import numpy as np
@@ -44,6 +46,25 @@ try:
         LIGHT_TEXT,
         apply_theme,
     )
+    from .byte_codec import format_bytes
+    from .console_store import CONSOLE_RING_LINES, CaptureWriter, ConsoleLog
+    from .plot_lod import MinMaxPyramid
+    from .raster import RasterImage
+    from .sniffer_capture import CaptureRows, SnifferCapture
+    from .sniffer_export import ExportCancelled, export_capture, export_format_for_path
+    from .sniffer_format import ROW_BYTES, TagRuns, format_row
+    from .sniffer_pcapng import PcapngWriter, read_pcapng
+    from .sniffer_replay import capture_chunks, replay
+    from .sniffer_protocol import TransactionDecoder, latency_histogram, transaction_summary
+    from .serial_bridge import SNIFFER_RX_BUFFER_BYTES, ForwardLatency, forward_loop, read_loop, timed_read_loop
+    from .serial_tap import TappedSerial
+    from .results_db import RESULTS_DB_NAME, RESULTS_QUERY_LIMIT, ResultsDB, session_file_rows
+    from .sample_bus import RunStarted, Sample, SampleBus
+    from .session_store import SESSION_FSYNC_POLICIES, SessionWriter, recover_sessions
+    from .sniffer_search import SEARCH_KINDS, SEARCH_MAX_RESULTS, compile_pattern, search_capture
+    from .sniffer_trigger import TRIGGER_IDLE_S, TRIGGER_KINDS, TRIGGER_POST_S, TRIGGER_PRE_BYTES, Trigger, TriggerEngine
+    from .sniffer_timing import CHAR_GAP_BITS, GAP_KIND_NAMES, IDLE_GAP_S, describe_gap, find_gaps, gap_histogram, gap_summary
+    from .ui_events import UI_EVENT_LATEST, UI_EVENT_MERGE, UIEventDispatcher, UIEventQueue
 except ImportError:
     from styles import (
         DARK_ACCENT,
@@ -65,6 +86,25 @@ except ImportError:
         LIGHT_TEXT,
         apply_theme,
     )
+    from byte_codec import format_bytes
+    from console_store import CONSOLE_RING_LINES, CaptureWriter, ConsoleLog
+    from plot_lod import MinMaxPyramid
+    from raster import RasterImage
+    from sniffer_capture import CaptureRows, SnifferCapture
+    from sniffer_export import ExportCancelled, export_capture, export_format_for_path
+    from sniffer_format import ROW_BYTES, TagRuns, format_row
+    from sniffer_pcapng import PcapngWriter, read_pcapng
+    from sniffer_replay import capture_chunks, replay
+    from sniffer_protocol import TransactionDecoder, latency_histogram, transaction_summary
+    from serial_bridge import SNIFFER_RX_BUFFER_BYTES, ForwardLatency, forward_loop, read_loop, timed_read_loop
+    from serial_tap import TappedSerial
+    from results_db import RESULTS_DB_NAME, RESULTS_QUERY_LIMIT, ResultsDB, session_file_rows
+    from sample_bus import RunStarted, Sample, SampleBus
+    from session_store import SESSION_FSYNC_POLICIES, SessionWriter, recover_sessions
+    from sniffer_search import SEARCH_KINDS, SEARCH_MAX_RESULTS, compile_pattern, search_capture
+    from sniffer_trigger import TRIGGER_IDLE_S, TRIGGER_KINDS, TRIGGER_POST_S, TRIGGER_PRE_BYTES, Trigger, TriggerEngine
+    from sniffer_timing import CHAR_GAP_BITS, GAP_KIND_NAMES, IDLE_GAP_S, describe_gap, find_gaps, gap_histogram, gap_summary
+    from ui_events import UI_EVENT_LATEST, UI_EVENT_MERGE, UIEventDispatcher, UIEventQueue
 
 # Canvas background for dark mode plots
 DARK_CANVAS = "#060e18"
@@ -88,6 +128,58 @@ CONSOLE_QUICK_READ_LINE_TIMEOUT_S = 0.12
 CONSOLE_MANUAL_READ_MAX_WINDOW_S = 8.0
 CONSOLE_MANUAL_READ_IDLE_WINDOW_S = 1.5
 CONSOLE_MANUAL_READ_LINE_TIMEOUT_S = 0.15
+LIVE_ZOOM_STEP = 1.25
+LIVE_ZOOM_MIN_SPAN = 8
+LIVE_PLOT_REFRESH_MS = 80
+LIVE_GRID_MIN_BUCKETS = 32
+UI_EVENT_TICK_MS = 60
+UI_EVENT_MAX_PER_TICK = 5000
+UI_EVENT_QUEUE_MAX = 20000
+# Sniffer bytes waiting for the UI; readers wait beyond this rather than grow memory.
+SNIFFER_UI_PENDING_BYTES = 8 * 1024 * 1024
+UI_DIAG_REFRESH_MS = 1000
+UI_LAG_WARN_S = 1.0
+CONSOLE_BANNER = "Terminal mode: type command here and press Enter to send."
+CONSOLE_WHEEL_LINES = 3
+# Rows listed in the sniffer gap table (longest first); all gaps are counted.
+SNIFFER_GAPS_SHOWN = 2000
+# Session CSV columns ahead of the per-measureand <key>_std/<key>_avg pairs.
+SESSION_CSV_FIELDS = [
+    "timestamp",
+    "session_id",
+    "port",
+    "serial",
+    "operator",
+    "notes",
+    "bath_id",
+    "bath_temp_c",
+    "salinity_psu",
+    "sample_count",
+    "run_index",
+    "run_total",
+    "caldate",
+    "cal_age_days",
+    "red_noise_ns",
+    "blue_noise_ns",
+    "red_blue_noise_ns",
+    "red_voltage_std",
+    "red_voltage_avg",
+    "blue_voltage_std",
+    "blue_voltage_avg",
+    "red_pll_voltage_std",
+    "red_pll_voltage_avg",
+    "blue_pll_voltage_std",
+    "blue_pll_voltage_avg",
+    "raw_temp_voltage_std",
+    "raw_temp_voltage_avg",
+    "electronics_temp_voltage_std",
+    "electronics_temp_voltage_avg",
+    "severity",
+    "flags",
+    "sample_csv",
+    "unit_log",
+    "unit_json",
+]
 
 TSR_FIELDS = [
     "red_phase",
@@ -199,6 +291,13 @@ def _resolve_app_config_file():
 
 
 APP_CONFIG_FILE = _resolve_app_config_file()
+# Working files (console logs, TX/RX capture segments, sniffer capture) live on
+# local disk, not on the results share; Save Session copies them over.
+WORK_DIR_KEEP_DAYS = 7
+
+
+def _default_work_root():
+    return os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), "sbs_dsw", "work")
 
 
 class SBE83GuiApp:
@@ -236,7 +335,11 @@ class SBE83GuiApp:
         self.available_ports = []
         self.port_slots = {}
         self.debug_tabs = {}
-        self.debug_max_lines = 1500
+        # port -> ConsoleLog; serial workers write these (and the TX/RX capture) directly.
+        self.console_logs = {}
+        self._console_store_lock = threading.Lock()
+        self.debug_ring_lines = CONSOLE_RING_LINES
+        self._console_line_px = None
 
         self.session_start = dt.datetime.now()
         self.session_id = self.session_start.strftime("%Y%m%d_%H%M%S")
@@ -245,7 +348,9 @@ class SBE83GuiApp:
         self.session_dir = os.path.join(self.non_debug_results_root, "sessions", PRECAL_TEST_SUBDIR)
         os.makedirs(self.session_dir, exist_ok=True)
         self.session_csv = os.path.join(self.session_dir, f"sbe83_session_{self.session_id}.csv")
-        self.live_run_series_by_port = {}  # port -> field -> list[float]
+        self.work_root = str(self.app_config.get("work_dir", "")).strip() or _default_work_root()
+        self._prune_work_dirs()
+        self.live_run_series_by_port = {}  # port -> field -> MinMaxPyramid
         self.live_run_total_samples_by_port = {}  # port -> int
         self.live_run_serial_by_port = {}  # port -> serial label
         self.live_port_colors = {}  # port -> hex color
@@ -270,10 +375,23 @@ class SBE83GuiApp:
         self.stream_threads = {}
         self.stream_stop_events = {}
         self.stream_enabled = {}
-        self.manual_capture_rows = []
+        self.manual_capture = None  # CaptureWriter, opened once session_dir is known
         self.reference_session_rows = []
         self.reference_session_path = ""
-        self.ui_event_queue = queue.Queue()
+        self.ui_event_queue = UIEventQueue(UI_EVENT_QUEUE_MAX)
+        self._configure_ui_event_policies()
+        self.ui_dispatcher = UIEventDispatcher(self.ui_event_queue, UI_EVENT_MAX_PER_TICK)
+        self.ui_dispatcher.register_many(self._ui_event_routes())
+        # Runs publish parsed samples here; each consumer drains its own queue.
+        self.sample_bus = SampleBus()
+        self.session_writer = None  # SessionWriter, opened with the session's first row
+        self.results_db = None  # ResultsDB, opened once logging is up
+        self.results_history_window = None
+        self._results_history_query = None
+        self._live_sample_sub = self.sample_bus.subscribe("live view")
+        self._live_samples_dropped = 0
+        self._ui_tick_ms = 0.0
+        self._ui_diag_next = 0.0
         self.shutdown_event = threading.Event()
         self.profile_dir = os.path.join(self.session_dir, "profiles")
         os.makedirs(self.profile_dir, exist_ok=True)
@@ -286,13 +404,28 @@ class SBE83GuiApp:
         self.live_ymin_var = tk.StringVar(value="")
         self.live_ymax_var = tk.StringVar(value="")
         self.live_show_points_var = tk.BooleanVar(value=True)
+        self.live_raster_var = tk.BooleanVar(value=bool(self.app_config.get("live_raster_plot", False)))
+        self.live_grid_var = tk.BooleanVar(value=False)
+        self.session_raster_var = tk.BooleanVar(value=bool(self.app_config.get("session_raster_plot", False)))
         self.live_visible_only_var = tk.BooleanVar(value=False)
         self.live_x_start_var = tk.IntVar(value=1)
         self.live_x_end_var = tk.IntVar(value=0)
+        self.live_view_range = None  # (x0, x1) sample indices while zoomed/panned
+        self._live_plot_panels = []  # hover/zoom geometry per drawn plot panel
+        self._live_refresh_after_id = None
+        self._live_std_key = None  # (field, per-port series and sample count) behind the Std Dev label
+        self.live_grid_fields = set()  # empty -> every live field in grid mode
+        self._live_pan_anchor = None
+        self._live_hover_xy = None
         self.console_detached = False
         self.console_send_cr_var = tk.BooleanVar(value=True)
         self.console_send_lf_var = tk.BooleanVar(value=True)
         self.console_display_mode_var = tk.StringVar(value="ascii")
+        # Plain copy for serial workers, which must not touch Tk variables.
+        self.console_display_mode = "ascii"
+        self.console_display_mode_var.trace_add(
+            "write", lambda *_a: setattr(self, "console_display_mode", self.console_display_mode_var.get())
+        )
         self.batch_runs_remaining_by_port = {}
         self.runs_left_var = tk.StringVar(value="Runs left: n/a")
         self.sample_format_expanded = False
@@ -311,17 +444,39 @@ class SBE83GuiApp:
         self.sniffer_port_var = tk.StringVar(value="")
         self.sniffer_baud_var = tk.IntVar(value=9600)
         self.sniffer_running = False
-        self.sniffer_serial = None
-        self.sniffer_thread = None
-        self.sniffer_stop_event = threading.Event()
+        self.sniffer_serials = {}  # port -> Serial opened by the sniffer
+        self.sniffer_threads = {}  # port -> reader thread
+        self.sniffer_stop_events = {}  # port -> Event that stops its reader
         self.sniffer_display_mode_var = tk.StringVar(value="hexdump")
         self.sniffer_show_timestamp_var = tk.BooleanVar(value=True)
         self.sniffer_autoscroll_var = tk.BooleanVar(value=True)
-        self.sniffer_buffer = []  # list of (timestamp, bytes, direction)
-        self.sniffer_byte_offset = 0
-        self.sniffer_mirror_mode = False  # True when mirroring an existing connection
-        self.sniffer_mirror_port = None   # Port being mirrored
+        self.sniffer_capture = None  # SnifferCapture, opened on first data
+        self._sniffer_capture_seq = 0
+        self.sniffer_rows = None  # CaptureRows for the current capture, mode and filter
+        self.sniffer_view_top = 0
+        self.sniffer_follow = True
+        self._sniffer_line_px = None
+        self._sniffer_search_cancel = None
+        self._sniffer_search_offsets = []
+        self._sniffer_export_cancel = None
+        self.sniffer_export_window = None
+        self.sniffer_pcapng_var = tk.BooleanVar(value=False)  # Record a live .pcapng next to the capture
+        self.sniffer_pcapng = None
+        self.sniffer_transactions = None  # TransactionDecoder while the Transactions window is open
+        self._sniffer_transactions_dirty = False  # summary/histogram need a redraw on the next diagnostics tick
+        self.sniffer_transactions_window = None
+        self.sniffer_replay_window = None
+        self._sniffer_replay_stop = None
+        self.sniffer_precise_timing_var = tk.BooleanVar(value=False)  # Time every read with perf_counter_ns
+        self.sniffer_gaps_window = None
+        self.sniffer_gaps = None
+        self.sniffer_trigger_conditions = []  # Trigger objects edited in the Trigger dialog
+        self.sniffer_trigger = None  # TriggerEngine while armed
+        self.sniffer_trigger_writer = None  # PcapngWriter of the open trigger segment
+        self.sniffer_trigger_window = None
+        self.sniffer_mirror_ports = {}  # Port mirrored from an existing connection -> TapReader
         self.sniffer_direction_var = tk.StringVar(value="both")  # "both", "rx", "tx"
+        self.sniffer_port_filter_var = tk.StringVar(value="All")  # "All" or one port of the capture
         
         # com0com Bridge State
         self.bridge_mode = False
@@ -332,6 +487,7 @@ class SBE83GuiApp:
         self.bridge_thread_rx = None  # Real → Virtual
         self.bridge_thread_tx = None  # Virtual → Real
         self.bridge_stop_event = threading.Event()
+        self.bridge_latency = {"TX": ForwardLatency(), "RX": ForwardLatency()}
 
         self._build_ui()
         self._apply_results_root(self.non_debug_results_root, log_change=False)
@@ -343,9 +499,11 @@ class SBE83GuiApp:
             self._update_mode_status_text()
         self.refresh_ports()
         self._apply_theme(persist=False)
-        self.root.after(60, self._process_ui_events)
+        self.root.after(UI_EVENT_TICK_MS, self._process_ui_events)
         self.log(f"Session started: {self.session_id}")
         self.log(f"Session summary file: {self.session_csv}")
+        self._recover_sessions()
+        self._open_results_db()
         self._refresh_update_status_banner()
         self.root.after(1400, self._startup_update_check)
 
@@ -483,6 +641,9 @@ class SBE83GuiApp:
         data["update_manifest_url"] = str(getattr(self, "update_manifest_url", "")).strip()
         if hasattr(self, "auto_check_updates_var"):
             data["auto_check_updates"] = bool(self.auto_check_updates_var.get())
+        if hasattr(self, "live_raster_var"):
+            data["live_raster_plot"] = bool(self.live_raster_var.get())
+            data["session_raster_plot"] = bool(self.session_raster_var.get())
         data["non_debug_results_root"] = str(getattr(self, "non_debug_results_root", SENSOR_TEST_DIR)).strip() or SENSOR_TEST_DIR
         data["test_setup_collapsed"] = not bool(getattr(self, "test_setup_visible", True))
         data["layout_state"] = self._capture_layout_state()
@@ -1378,6 +1539,7 @@ class SBE83GuiApp:
         ttk.Button(session_grp, text="Plot", command=self.plot_current_session, style="Secondary.TButton").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Button(session_grp, text="Load", command=self.load_session_plot, style="Secondary.TButton").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Button(session_grp, text="Reload", command=self.reload_current_session_plot, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(session_grp, text="History", command=self.show_results_history, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Button(session_grp, text="CSV Col", command=self.toggle_csv_column, style="Toolbar.TButton").pack(side=tk.LEFT)
         
         # Maximize view button - collapses all panels for more notebook space
@@ -1556,7 +1718,13 @@ class SBE83GuiApp:
         )
         self.live_field_combo.pack(side=tk.LEFT, padx=(4, 12))
         self.live_field_combo.bind("<<ComboboxSelected>>", self._on_live_field_changed)
-        ttk.Button(live_controls, text="↻", command=self.refresh_live_plot, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 12))
+        ttk.Button(live_controls, text="↻", command=self.refresh_live_plot, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Checkbutton(live_controls, text="Grid", variable=self.live_grid_var, command=self.refresh_live_plot).pack(
+            side=tk.LEFT, padx=(0, 4)
+        )
+        ttk.Button(live_controls, text="Fields", command=self.select_live_grid_fields, style="Toolbar.TButton").pack(
+            side=tk.LEFT, padx=(0, 12)
+        )
         
         # Y-axis controls
         ttk.Checkbutton(live_controls, text="Auto Y", variable=self.live_autoscale_var, command=self.refresh_live_plot).pack(
@@ -1571,6 +1739,9 @@ class SBE83GuiApp:
         ttk.Checkbutton(live_controls, text="●", variable=self.live_show_points_var, command=self.refresh_live_plot).pack(
             side=tk.LEFT, padx=(0, 6)
         )
+        ttk.Checkbutton(live_controls, text="Raster", variable=self.live_raster_var, command=self._on_live_renderer_changed).pack(
+            side=tk.LEFT, padx=(0, 6)
+        )
         ttk.Checkbutton(
             live_controls, text="Filter", variable=self.live_visible_only_var, command=self.refresh_live_plot
         ).pack(side=tk.LEFT, padx=(0, 4))
@@ -1580,7 +1751,10 @@ class SBE83GuiApp:
         ttk.Label(live_controls, text="X:", style="Small.TLabel").pack(side=tk.LEFT)
         ttk.Entry(live_controls, textvariable=self.live_x_start_var, width=5).pack(side=tk.LEFT, padx=(4, 2))
         ttk.Label(live_controls, text="—", style="Small.TLabel").pack(side=tk.LEFT)
-        ttk.Entry(live_controls, textvariable=self.live_x_end_var, width=5).pack(side=tk.LEFT, padx=(2, 12))
+        ttk.Entry(live_controls, textvariable=self.live_x_end_var, width=5).pack(side=tk.LEFT, padx=(2, 4))
+        ttk.Button(live_controls, text="⤢", command=self.reset_live_view, style="Toolbar.TButton", width=3).pack(
+            side=tk.LEFT, padx=(0, 12)
+        )
 
         # Stats display
         self.live_std_var = tk.StringVar(value="σ: n/a")
@@ -1598,6 +1772,15 @@ class SBE83GuiApp:
         self.live_canvas = tk.Canvas(live_grid, bg=DARK_CANVAS, height=230, highlightthickness=1, highlightbackground=DARK_BORDER)
         self.live_canvas.grid(row=0, column=0, sticky="nsew", padx=(0, 8))
         self.live_canvas.bind("<Configure>", lambda _e: self.refresh_live_plot())
+        self.live_canvas.bind("<MouseWheel>", self._on_live_plot_wheel)
+        self.live_canvas.bind("<Button-4>", self._on_live_plot_wheel)
+        self.live_canvas.bind("<Button-5>", self._on_live_plot_wheel)
+        self.live_canvas.bind("<ButtonPress-1>", self._on_live_plot_press)
+        self.live_canvas.bind("<B1-Motion>", self._on_live_plot_drag)
+        self.live_canvas.bind("<ButtonRelease-1>", self._on_live_plot_release)
+        self.live_canvas.bind("<Double-Button-1>", lambda _e: self.reset_live_view())
+        self.live_canvas.bind("<Motion>", self._on_live_plot_motion)
+        self.live_canvas.bind("<Leave>", self._on_live_plot_leave)
 
         self.live_text = scrolledtext.ScrolledText(
             live_grid,
@@ -1626,6 +1809,15 @@ class SBE83GuiApp:
         )
         self.log_box.pack(fill=tk.BOTH, expand=True)
 
+        diag = ttk.LabelFrame(self.log_tab, text="🩺 UI Diagnostics", padding=(10, 6))
+        diag.pack(fill=tk.X, pady=(8, 0))
+        self.ui_diag_state_var = tk.StringVar(value="OK")
+        self.ui_diag_state_label = ttk.Label(diag, textvariable=self.ui_diag_state_var, style="OK.TLabel", width=12)
+        self.ui_diag_state_label.pack(side=tk.LEFT, padx=(0, 8))
+        self.ui_diag_var = tk.StringVar(value="Queue: 0")
+        ttk.Label(diag, textvariable=self.ui_diag_var, style="Muted.TLabel").pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(diag, text="Reset", command=self.reset_ui_diagnostics, style="Toolbar.TButton").pack(side=tk.RIGHT)
+
 
         debug = ttk.LabelFrame(self.debug_tab, text="Serial Debug Consoles (Per COM Port)", padding=8)
         debug.pack(fill=tk.BOTH, expand=True)
@@ -2842,7 +3034,7 @@ exit /b 0
     def _reset_live_series_for_current_fields(self):
         keys = list(self.live_plot_fields.values())
         for port in list(self.live_run_series_by_port.keys()):
-            self.live_run_series_by_port[port] = {k: [] for k in keys}
+            self.live_run_series_by_port[port] = {k: MinMaxPyramid() for k in keys}
 
     @staticmethod
     def _to_float_or_none(v):
@@ -3036,8 +3228,22 @@ exit /b 0
         metric_combo.pack(side=tk.LEFT, padx=(6, 10))
         plot_paused_var = tk.BooleanVar(value=False)
         ttk.Button(top, text="Load Reference Session", command=lambda: load_reference_and_render(), style="Secondary.TButton").pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(
+            top,
+            text="Reference From History",
+            command=lambda: load_reference_and_render(
+                lambda: self._load_reference_rows_from_history(_selected_serials(current_list))
+            ),
+            style="Secondary.TButton",
+        ).pack(side=tk.LEFT, padx=(0, 8))
         pause_btn = ttk.Button(top, text="Pause Plot", style="Secondary.TButton")
         pause_btn.pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(
+            top,
+            text="Raster",
+            variable=self.session_raster_var,
+            command=lambda: (self._save_app_config(), render()),
+        ).pack(side=tk.LEFT, padx=(0, 8))
         reference_name_var = tk.StringVar(value="Reference: not loaded")
         ttk.Label(top, textvariable=reference_name_var, foreground=DARK_MUTED).pack(side=tk.LEFT, padx=(6, 0))
 
@@ -3095,10 +3301,11 @@ exit /b 0
                 metric_label_var.get(),
                 current_label="Current",
                 reference_label="Reference",
+                raster=self.session_raster_var.get(),
             )
 
-        def load_reference_and_render():
-            loaded = self._load_reference_rows()
+        def load_reference_and_render(loader=None):
+            loaded = (loader or self._load_reference_rows)()
             if not loaded:
                 return
             reference_rows_var.clear()
@@ -3152,6 +3359,193 @@ exit /b 0
             messagebox.showerror("Reference Load Failed", str(exc))
             return False
 
+    def _results_db_path(self):
+        path = str(self.app_config.get("results_db_path", "")).strip()
+        return path or os.path.join(os.path.dirname(APP_CONFIG_FILE), RESULTS_DB_NAME)
+
+    def _open_results_db(self):
+        path = self._results_db_path()
+        try:
+            self.results_db = ResultsDB(path)
+        except (OSError, sqlite3.Error) as exc:
+            self.results_db = None
+            self.log(f"Results database unavailable ({path}): {exc}")
+
+    def _record_run(self, summary, samples):
+        """Index a finished run in the results database (samples too if ``results_db_samples`` is set)."""
+        if self.results_db is None:
+            return
+        keep_samples = bool(self.app_config.get("results_db_samples", False))
+        try:
+            self.results_db.add_run(summary, samples if keep_samples else None)
+        except sqlite3.Error as exc:
+            self.log(f"Results database insert failed: {exc}")
+
+    def _load_reference_rows_from_history(self, serials):
+        """Earlier runs of ``serials`` from the results database as the plot reference."""
+        if self.results_db is None:
+            messagebox.showinfo("Results History", "The results database is not available.")
+            return False
+        try:
+            rows = self.results_db.query_runs(serial=list(serials), exclude_session=self.session_id)
+        except sqlite3.Error as exc:
+            messagebox.showerror("Results History", str(exc))
+            return False
+        if not rows:
+            messagebox.showinfo("Results History", "No earlier runs of these serials in the results database.")
+            return False
+        self.reference_session_rows = rows
+        self.reference_session_path = "results history"
+        self.log(f"Loaded reference rows: {len(rows)} from the results database")
+        return True
+
+    def show_results_history(self):
+        """Query every indexed run by serial, port, operator, severity and age."""
+        if self.results_db is None:
+            messagebox.showinfo("Results History", "The results database is not available.")
+            return
+        if self.results_history_window is not None:
+            self.results_history_window.lift()
+            return
+        db = self.results_db
+        win = tk.Toplevel(self.root)
+        self.results_history_window = win
+        win.title("Results History")
+        win.geometry("1000x480")
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        filters = ttk.Frame(frame)
+        filters.pack(fill=tk.X)
+        filter_vars = {}
+        for column, label, width in (
+            ("serial", "Serial", 10),
+            ("port", "Port", 8),
+            ("operator", "Operator", 12),
+            ("severity", "Severity", 8),
+        ):
+            ttk.Label(filters, text=f"{label}:").pack(side=tk.LEFT)
+            var = tk.StringVar(value="")
+            combo = ttk.Combobox(filters, textvariable=var, width=width, values=[""] + db.distinct(column))
+            combo.pack(side=tk.LEFT, padx=(4, 10))
+            combo.bind("<Return>", lambda _e: run_query())
+            filter_vars[column] = var
+        ttk.Label(filters, text="Last days:").pack(side=tk.LEFT)
+        days_var = tk.StringVar(value="")
+        ttk.Entry(filters, textvariable=days_var, width=6).pack(side=tk.LEFT, padx=(4, 10))
+        ttk.Button(filters, text="Query", command=lambda: run_query(), style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 6))
+        ttk.Button(filters, text="Import Sessions…", command=self._import_results_history, style="Secondary.TButton").pack(
+            side=tk.RIGHT
+        )
+
+        columns = (
+            ("timestamp", "Timestamp", 150),
+            ("session_id", "Session", 120),
+            ("port", "Port", 60),
+            ("serial", "Serial", 80),
+            ("operator", "Operator", 90),
+            ("severity", "Severity", 70),
+            ("red_noise_ns", "Red ns", 70),
+            ("blue_noise_ns", "Blue ns", 70),
+            ("flags", "Flags", 200),
+        )
+        table = ttk.Frame(frame)
+        table.pack(fill=tk.BOTH, expand=True, pady=(8, 6))
+        tree = ttk.Treeview(table, columns=[c for c, _t, _w in columns], show="headings", selectmode=tk.EXTENDED)
+        for col, text, width in columns:
+            tree.heading(col, text=text)
+            tree.column(col, width=width, anchor=tk.W, stretch=col == "flags")
+        scroll = ttk.Scrollbar(table, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scroll.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
+        status_var = tk.StringVar(value="")
+        ttk.Label(frame, textvariable=status_var, style="Muted.TLabel").pack(side=tk.LEFT)
+        rows = []
+
+        def run_query():
+            query = {column: var.get().strip() for column, var in filter_vars.items()}
+            since = None
+            days = days_var.get().strip()
+            if days:
+                try:
+                    since = (dt.datetime.now() - dt.timedelta(days=float(days))).isoformat(timespec="seconds")
+                except ValueError:
+                    messagebox.showwarning("Results History", "Enter the number of days as a number.", parent=win)
+                    return
+            t0 = time.perf_counter()
+            try:
+                found = db.query_runs(since=since, **query)
+            except sqlite3.Error as exc:
+                messagebox.showerror("Results History", str(exc), parent=win)
+                return
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            rows[:] = found
+            tree.delete(*tree.get_children())
+            for i, row in enumerate(reversed(found)):
+                values = []
+                for col, _text, _width in columns:
+                    value = row.get(col, "")
+                    values.append(self.fmt(self._to_float(value)) if col.endswith("_ns") else value)
+                tree.insert("", tk.END, iid=str(len(found) - 1 - i), values=values)
+            limit_note = " (newest shown)" if len(found) >= RESULTS_QUERY_LIMIT else ""
+            status_var.set(f"{len(found):,} run(s){limit_note} of {db.run_count():,} in {elapsed_ms:.1f} ms")
+
+        def chosen_rows():
+            picked = [rows[int(iid)] for iid in tree.selection()]
+            return sorted(picked, key=lambda r: r["run_id"]) if picked else list(rows)
+
+        def plot():
+            self._open_session_plot_window(chosen_rows(), "Session Plot - Results History")
+
+        buttons = ttk.Frame(frame)
+        buttons.pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="Plot", command=plot).pack(side=tk.LEFT, padx=(0, 6))
+        ttk.Button(buttons, text="Close", command=self._close_results_history, style="Secondary.TButton").pack(side=tk.LEFT)
+        win.protocol("WM_DELETE_WINDOW", self._close_results_history)
+        self._results_history_query = run_query
+        run_query()
+
+    def _close_results_history(self):
+        if self.results_history_window is not None:
+            self.results_history_window.destroy()
+        self.results_history_window = None
+        self._results_history_query = None
+
+    def _import_results_history(self):
+        """Backfill the results database from saved session JSON files or journals (in the background)."""
+        paths = filedialog.askopenfilenames(
+            title="Import Sessions Into Results History",
+            initialdir=self.session_dir,
+            filetypes=[("Session files", "*.json *.jsonl"), ("All files", "*.*")],
+            parent=self.results_history_window,
+        )
+        if not paths:
+            return
+        db = self.results_db
+
+        def worker():
+            added = 0
+            failed = []
+            for path in paths:
+                try:
+                    added += db.add_runs(session_file_rows(path))
+                except (OSError, ValueError, sqlite3.Error) as exc:
+                    failed.append(f"{os.path.basename(path)}: {exc}")
+            self._ui_post("results_import_done", added, len(paths), failed)
+
+        self.log(f"Importing {len(paths)} session file(s) into the results database...")
+        threading.Thread(target=worker, name="results-import", daemon=True).start()
+
+    def _on_results_import_done(self, added, file_count, failed):
+        self.log(f"Results import: {added:,} new run(s) from {file_count} file(s)")
+        for message in failed:
+            self.log(f"Results import skipped {message}")
+        if self._results_history_query is not None:
+            self._results_history_query()
+
     def _session_plot_fields_for_rows(self, rows):
         fields = dict(self.session_plot_fields)
         keys = set()
@@ -3196,6 +3590,7 @@ exit /b 0
         metric_label,
         current_label="Current",
         reference_label="Reference",
+        raster=False,
     ):
         canvas.delete("all")
         if not current_rows and not reference_rows:
@@ -3242,13 +3637,18 @@ exit /b 0
             ymin -= pad
             ymax += pad
 
+        # Raster mode draws grid, bands and markers into one image; text stays as items.
+        img = RasterImage(width, height, "#0b1220") if raster else None
         canvas.create_rectangle(left, top, right, bottom, outline=DARK_BORDER, width=1)
         y_ticks = 5
         for i in range(y_ticks + 1):
             frac = i / y_ticks
             y = bottom - frac * ph
             val = ymin + frac * (ymax - ymin)
-            canvas.create_line(left, y, right, y, fill="#1f2937")
+            if img is not None:
+                img.hline(y, left, right, "#1f2937")
+            else:
+                canvas.create_line(left, y, right, y, fill="#1f2937")
             canvas.create_text(left - 8, y, text=self.fmt(val), anchor="e", fill=DARK_MUTED)
 
         serials = []
@@ -3281,12 +3681,18 @@ exit /b 0
                 band_left = (prev_x + x) / 2.0 if i > 0 else x_left
                 band_right = (x + next_x) / 2.0 if i < n_serials - 1 else x_right
             shade = "#0f172a" if i % 2 == 0 else "#111827"
-            canvas.create_rectangle(band_left, top, band_right, bottom, fill=shade, outline="")
+            if img is not None:
+                img.fill_rect(band_left, top, band_right, bottom, shade)
+            else:
+                canvas.create_rectangle(band_left, top, band_right, bottom, fill=shade, outline="")
 
         label_step = max(1, n_serials // 12)
         for i, serial in enumerate(serials):
             x = serial_base_x[serial]
-            canvas.create_line(x, top, x, bottom, fill="#1f2937", dash=(2, 3))
+            if img is not None:
+                img.vline(x, top, bottom, "#1f2937", dash=(2, 3))
+            else:
+                canvas.create_line(x, top, x, bottom, fill="#1f2937", dash=(2, 3))
             if i % label_step == 0 or i == n_serials - 1:
                 canvas.create_text(
                     x,
@@ -3296,8 +3702,12 @@ exit /b 0
                     fill=DARK_MUTED,
                     font=("Segoe UI", 7),
                 )
-        canvas.create_line(x_left, top, x_left, bottom, fill=DARK_BORDER)
-        canvas.create_line(x_right, top, x_right, bottom, fill=DARK_BORDER)
+        if img is not None:
+            img.vline(x_left, top, bottom, DARK_BORDER)
+            img.vline(x_right, top, bottom, DARK_BORDER)
+        else:
+            canvas.create_line(x_left, top, x_left, bottom, fill=DARK_BORDER)
+            canvas.create_line(x_right, top, x_right, bottom, fill=DARK_BORDER)
 
         canvas.create_text((left + right) / 2, height - 18, text="Sensor Serial", anchor="center", fill=DARK_TEXT)
         canvas.create_text(18, (top + bottom) / 2, text=y_axis_label, angle=90, anchor="center", fill=DARK_TEXT)
@@ -3336,6 +3746,8 @@ exit /b 0
                 for j, row_idx in enumerate(idxs):
                     x_positions[row_idx] = serial_base_x[serial] + session_offset[session_name] + start + (j * intra_step)
 
+            marker_x = []
+            marker_y = []
             for i, row in enumerate(rows):
                 raw_val = self._to_float(row.get(metric_key))
                 if not np.isfinite(raw_val):
@@ -3343,7 +3755,11 @@ exit /b 0
                 scaled_val = raw_val * scale_factor
                 x = x_positions[i]
                 y = bottom - ((scaled_val - ymin) / y_den) * ph
-                canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
+                if img is not None:
+                    marker_x.append(x)
+                    marker_y.append(y)
+                else:
+                    canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
                 run_idx = row.get("run_index", i + 1)
                 serial = str(row.get("serial", "")).strip() or "UNKNOWN"
                 point_meta.append(
@@ -3354,6 +3770,12 @@ exit /b 0
                     }
                 )
 
+            if img is not None and marker_x:
+                img.markers(marker_x, marker_y, color, radius=3)
+
+        if img is not None:
+            self._blit_raster(canvas, img, 0, 0)
+
         legend = []
         if current_rows:
             legend.append((current_label, session_colors[current_label], len(current_rows)))
@@ -3523,9 +3945,12 @@ exit /b 0
         self.ui_event_queue.put((event, args, kwargs))
 
     def _log_main(self, msg: str):
+        self._log_main_batch([msg])
+
+    def _log_main_batch(self, msgs):
         ts = dt.datetime.now().strftime("%H:%M:%S")
         self.log_box.configure(state=tk.NORMAL)
-        self.log_box.insert(tk.END, f"[{ts}] {msg}\n")
+        self.log_box.insert(tk.END, "".join(f"[{ts}] {msg}\n" for msg in msgs))
         self.log_box.see(tk.END)
         self.log_box.configure(state=tk.DISABLED)
         
@@ -3642,8 +4067,12 @@ exit /b 0
         if port in self.debug_tabs:
             return self.debug_tabs[port]["text"]
         tab = ttk.Frame(self.debug_notebook)
-        text = scrolledtext.ScrolledText(
-            tab,
+        view = ttk.Frame(tab)
+        view.pack(fill=tk.BOTH, expand=True, pady=(0, 6))
+        # The Text only ever holds the visible window; the scrollbar spans the
+        # whole ConsoleLog, so scrollback costs nothing until it is viewed.
+        text = tk.Text(
+            view,
             height=9,
             wrap=tk.NONE,
             font=self._console_font(),
@@ -3652,9 +4081,16 @@ exit /b 0
             insertbackground=DARK_TEXT,
             relief=tk.FLAT,
         )
-        text.pack(fill=tk.BOTH, expand=True, pady=(0, 6))
-        text.insert(tk.END, "Terminal mode: type command here and press Enter to send.\n")
+        scroll = ttk.Scrollbar(view, orient=tk.VERTICAL, command=lambda *a, p=port: self._on_console_yview(p, *a))
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         text.bind("<Return>", lambda e, p=port: self._on_debug_text_enter(e, p))
+        text.bind("<Configure>", lambda _e, p=port: self._render_debug_tab(p))
+        text.bind("<MouseWheel>", lambda e, p=port: self._on_console_wheel(e, p))
+        text.bind("<Button-4>", lambda e, p=port: self._on_console_wheel(e, p))
+        text.bind("<Button-5>", lambda e, p=port: self._on_console_wheel(e, p))
+        text.bind("<Prior>", lambda _e, p=port: self._on_console_yview(p, "scroll", -1, "pages") or "break")
+        text.bind("<Next>", lambda _e, p=port: self._on_console_yview(p, "scroll", 1, "pages") or "break")
         controls = ttk.Frame(tab)
         controls.pack(fill=tk.X)
         cmd_var = tk.StringVar()
@@ -3668,10 +4104,111 @@ exit /b 0
             controls, text="Stream", variable=stream_var, command=lambda p=port, v=stream_var: self.toggle_stream(p, v.get())
         ).pack(side=tk.LEFT, padx=(6, 0))
         self.debug_notebook.add(tab, text=port)
-        self.debug_tabs[port] = {"tab": tab, "text": text, "lines": 1, "cmd_var": cmd_var, "stream_var": stream_var}
+        self.debug_tabs[port] = {
+            "tab": tab,
+            "text": text,
+            "scroll": scroll,
+            "log": self._console_log(port),
+            "top": 0,
+            "follow": True,
+            "cmd_var": cmd_var,
+            "stream_var": stream_var,
+        }
         self.stream_enabled[port] = False
+        self._render_debug_tab(port)
         return text
 
+    def _console_log_path(self, port):
+        safe_port = re.sub(r"[^A-Za-z0-9_.-]+", "_", str(port)).strip("_") or "port"
+        return self._work_path("console", f"console_{self.session_id}_{safe_port}.log")
+
+    def _console_log(self, port):
+        """The port's ConsoleLog, created on first use (from any thread)."""
+        with self._console_store_lock:
+            log = self.console_logs.get(port)
+            if log is None:
+                log = ConsoleLog(self._console_log_path(port), self.debug_ring_lines)
+                self.console_logs[port] = log
+            return log
+
+    def _rotate_console_logs(self):
+        """Start fresh per-port console logs for a new session."""
+        with self._console_store_lock:
+            old_logs = list(self.console_logs.values())
+            self.console_logs = {}
+        for log in old_logs:
+            log.close()
+        for port, info in self.debug_tabs.items():
+            info["log"] = self._console_log(port)
+            info["top"] = 0
+            info["follow"] = True
+            self._render_debug_tab(port)
+
+    def _console_rows(self, box):
+        if self._console_line_px is None:
+            self._console_line_px = max(1, tkfont.Font(root=self.root, font=self._console_font()).metrics("linespace"))
+        return max(1, int(box.winfo_height()) // self._console_line_px)
+
+    def _render_debug_tab(self, port):
+        """Redraw only the visible window of a console tab from its ConsoleLog."""
+        info = self.debug_tabs.get(port)
+        if not info:
+            return
+        box = info["text"]
+        log = info["log"]
+        rows = self._console_rows(box)
+        total = len(log)
+        first = log.first_available
+        # While following, leave the last row for the line being typed.
+        tail_top = max(total - rows + 1, first)
+        top = tail_top if info["follow"] else min(max(info["top"], first), tail_top)
+        info["top"] = top
+        if info.get("rendered_follow"):
+            info["typed"] = box.get("end-1c linestart", "end-1c")
+        lines = log.get(top, top + rows) if total else [CONSOLE_BANNER]
+        box.delete("1.0", tk.END)
+        box.insert("1.0", "\n".join(lines) + "\n")
+        if info["follow"]:
+            box.insert(tk.END, info.get("typed", ""))
+            box.mark_set(tk.INSERT, "end-1c")
+            box.see(tk.END)
+        else:
+            box.yview_moveto(0.0)
+        info["rendered_follow"] = info["follow"]
+        self._update_console_scrollbar(port)
+
+    def _update_console_scrollbar(self, port):
+        info = self.debug_tabs[port]
+        log = info["log"]
+        first = log.first_available
+        span = max(len(log) - first, 1)
+        rows = self._console_rows(info["text"])
+        lo = (info["top"] - first) / span
+        info["scroll"].set(min(max(lo, 0.0), 1.0), min(lo + rows / span, 1.0))
+
+    def _on_console_yview(self, port, op, *args):
+        info = self.debug_tabs.get(port)
+        if not info:
+            return
+        log = info["log"]
+        rows = self._console_rows(info["text"])
+        first = log.first_available
+        if op == "moveto":
+            top = first + int(float(args[0]) * max(len(log) - first, 0))
+        else:
+            step = rows if str(args[1]).startswith("page") else 1
+            top = info["top"] + int(args[0]) * step
+        info["top"] = top
+        info["follow"] = top >= len(log) - rows + 1
+        self._render_debug_tab(port)
+
+    def _on_console_wheel(self, event, port):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._on_console_yview(port, "scroll", -CONSOLE_WHEEL_LINES, "units")
+        else:
+            self._on_console_yview(port, "scroll", CONSOLE_WHEEL_LINES, "units")
+        return "break"
+
     def _on_debug_text_enter(self, event, port):
         box = self.debug_tabs[port]["text"]
         line = box.get("insert linestart", "insert lineend").strip()
@@ -3682,24 +4219,23 @@ exit /b 0
         return "break"
 
     def _ensure_console_trailing_newline(self, port):
+        """Jump back to the live tail with an empty input line."""
         info = self.debug_tabs.get(port)
         if not info:
             return
-        box = info["text"]
-        tail = box.get("end-2c", "end-1c")
-        if tail != "\n":
-            box.insert(tk.END, "\n")
-        box.mark_set(tk.INSERT, tk.END)
-        box.see(tk.END)
+        info["follow"] = True
+        info["rendered_follow"] = False
+        info["typed"] = ""
+        self._render_debug_tab(port)
 
     def clear_debug_tab(self, port):
         info = self.debug_tabs.get(port)
         if not info:
             return
-        box = info["text"]
-        box.delete("1.0", tk.END)
-        box.insert(tk.END, "Terminal mode: type command here and press Enter to send.\n")
-        info["lines"] = 0
+        info["log"].clear_view()
+        info["top"] = 0
+        info["follow"] = True
+        self._render_debug_tab(port)
 
     def clear_selected_debug_tab(self):
         if not self.debug_notebook.tabs():
@@ -3743,8 +4279,7 @@ exit /b 0
         try:
             payload_bytes = self._console_command_bytes(cmd)
             if from_entry:
-                box = self.debug_tabs[port]["text"]
-                box.insert(tk.END, f"> {cmd}\n")
+                self.debug_tabs[port]["log"].append([f"> {cmd}"])
                 self._ensure_console_trailing_newline(port)
             self.serial_debug(port, "TX", payload_bytes)
             ser.write(payload_bytes)
@@ -3818,87 +4353,133 @@ exit /b 0
             self.log(f"[{port}] Manual read: no response")
 
     def serial_debug(self, port, direction, payload):
-        if threading.current_thread() is not threading.main_thread():
-            self._ui_post("debug_line", port, direction, payload)
-            return
-        self._append_debug_line(port, direction, payload)
+        """Log one TX/RX payload; callable from serial workers.
 
-    def _append_debug_line(self, port, direction, payload):
+        The line goes to the port's ConsoleLog and the TX/RX capture right
+        away, on the calling thread, so nothing is lost when the UI is busy.
+        Only the console redraw goes through the UI queue, coalesced per port.
+        """
         if not port:
             return
-        payload_text = self._format_console_payload(payload)
-        box = self.ensure_debug_tab(port)
+        self._record_debug_lines(port, [(direction, payload)])
+        if threading.current_thread() is not threading.main_thread():
+            self._ui_post("debug_line", port)
+            return
+        self._show_debug_lines(port)
+
+    def _record_debug_lines(self, port, entries):
+        """Write ``(direction, payload)`` pairs to the console log and the TX/RX capture."""
+        now = dt.datetime.now()
+        ts = now.strftime("%H:%M:%S.%f")[:-3]
+        iso_ts = now.isoformat(timespec="milliseconds")
+        lines = []
+        capture_rows = []
+        for direction, payload in entries:
+            payload_text = self._format_console_payload(payload)
+            lines.append(f"[{ts}] {direction}: {payload_text}")
+            capture_rows.append((iso_ts, port, direction, payload_text))
+        self._write_manual_capture(capture_rows)
+        self._console_log(port).append(lines)
+
+    def _show_debug_lines(self, port):
+        """Bring a console tab up to date with lines already in its log."""
+        self.ensure_debug_tab(port)
         info = self.debug_tabs[port]
-        ts = dt.datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        line = f"[{ts}] {direction}: {payload_text}\n"
-        box.insert(tk.END, line)
-        info["lines"] += 1
-        if info["lines"] > self.debug_max_lines:
-            box.delete("1.0", "2.0")
-            info["lines"] -= 1
-        box.see(tk.END)
-        self.manual_capture_rows.append(
-            {
-                "timestamp": dt.datetime.now().isoformat(timespec="milliseconds"),
-                "port": port,
-                "direction": direction,
-                "payload": payload_text,
-            }
+        if info["follow"]:
+            self._render_debug_tab(port)
+        else:
+            self._update_console_scrollbar(port)
+
+    def _configure_ui_event_policies(self):
+        """Coalescing per event class; anything not listed takes one queue slot per event."""
+        q = self.ui_event_queue
+        by_port = lambda args, kwargs: kwargs.get("port", args[0] if args else None)  # noqa: E731
+        # Console lines are already logged by the worker; this only redraws.
+        q.set_policy("debug_line", UI_EVENT_LATEST, key=by_port)
+        q.set_policy("set_port_status", UI_EVENT_LATEST, key=by_port)
+        # Sniffer/bridge reads share one slot of bounded size; the UI renders them per tick.
+        q.set_policy(
+            "sniffer_data", UI_EVENT_MERGE, limit=SNIFFER_UI_PENDING_BYTES, cost=lambda args, kwargs: len(args[0])
         )
-        
-        # Feed to sniffer if mirroring this port
-        if self.sniffer_mirror_mode and self.sniffer_mirror_port == port:
-            dir_filter = self.sniffer_direction_var.get()
-            if dir_filter == "both" or dir_filter == direction.lower():
-                raw = payload if isinstance(payload, (bytes, bytearray)) else str(payload).encode("utf-8", errors="replace")
-                timestamp = dt.datetime.now()
-                self.sniffer_buffer.append((timestamp, raw))
-                self._append_sniffer_data(raw, timestamp, direction=direction)
+        q.set_policy("sniffer_search_progress", UI_EVENT_LATEST)
+        q.set_policy("sniffer_export_progress", UI_EVENT_LATEST)
+        q.set_policy("sniffer_replay_progress", UI_EVENT_LATEST)
+
+    def _refresh_ui_diagnostics(self):
+        if not hasattr(self, "ui_diag_var"):
+            return
+        st = self.ui_event_queue.stats()
+        overloaded = st["depth"] >= UI_EVENT_QUEUE_MAX or st["waiting"] or st["last_latency_s"] >= UI_LAG_WARN_S
+        self.ui_diag_var.set(
+            f"Queue: {st['depth']} (peak {st['max_depth']})  |  "
+            f"Lag: {st['last_latency_s'] * 1000:.0f} ms (max {st['max_latency_s'] * 1000:.0f} ms)  |  "
+            f"Tick: {self._ui_tick_ms:.1f} ms  |  "
+            f"Events: {st['enqueued']} (merged {st['merged']}, workers held {st['blocked']})"
+        )
+        if overloaded:
+            self.ui_diag_state_var.set("OVERLOADED")
+            self.ui_diag_state_label.configure(style="Fail.TLabel")
+        else:
+            self.ui_diag_state_var.set("OK")
+            self.ui_diag_state_label.configure(style="OK.TLabel")
+
+    def reset_ui_diagnostics(self):
+        self.ui_event_queue.reset_stats()
+        self._refresh_ui_diagnostics()
+
+    def _ui_event_routes(self):
+        """Worker event name -> handler, or (batch handler, batch key, coalesce)."""
+        by_port = lambda args, kwargs: kwargs.get("port", args[0] if args else None)  # noqa: E731
+        return {
+            "debug_line": self._show_debug_lines,
+            "log": (lambda _key, items: self._log_main_batch([args[0] for args, _kw in items]), lambda args, kwargs: None, False),
+            "set_port_status": (self.set_port_status, by_port, True),
+            "sniffer_data": (lambda _key, items: self._append_sniffer_chunks([args for args, _kw in items]), lambda args, kwargs: None, False),
+            "sniffer_stop": self._stop_sniffer,
+            "bridge_stop": self._stop_bridge,
+            "sniffer_search_progress": self._on_sniffer_search_progress,
+            "sniffer_search_done": self._on_sniffer_search_done,
+            "sniffer_export_progress": self._on_sniffer_export_progress,
+            "sniffer_export_done": self._on_sniffer_export_done,
+            "sniffer_replay_progress": self._on_sniffer_replay_progress,
+            "sniffer_replay_done": self._on_sniffer_replay_done,
+            "clear_live_run_view": self.clear_live_run_view,
+            "run_result": self._apply_run_result,
+            "results_import_done": self._on_results_import_done,
+            "finish_port_run": self._finish_port_run,
+            "show_error": messagebox.showerror,
+            "show_warning": messagebox.showwarning,
+            "show_info": messagebox.showinfo,
+            "update_available": self._on_update_available,
+            "update_up_to_date": self._on_update_up_to_date,
+            "update_check_error": self._on_update_check_error,
+            "update_check_finished": lambda: setattr(self, "_update_check_running", False),
+            "update_download_ready": self._on_update_download_ready,
+            "update_download_error": self._on_update_download_error,
+            "update_download_finished": lambda: setattr(self, "_update_download_running", False),
+        }
 
     def _process_ui_events(self):
-        drained = 0
-        while drained < 180:
-            try:
-                event, args, kwargs = self.ui_event_queue.get_nowait()
-            except queue.Empty:
-                break
-            if event == "debug_line":
-                self._append_debug_line(*args, **kwargs)
-            elif event == "log":
-                self._log_main(*args, **kwargs)
-            elif event == "set_port_status":
-                self.set_port_status(*args, **kwargs)
-            elif event == "clear_live_run_view":
-                self.clear_live_run_view(*args, **kwargs)
-            elif event == "append_live_run_sample":
-                self.append_live_run_sample(*args, **kwargs)
-            elif event == "run_result":
-                self._apply_run_result(*args, **kwargs)
-            elif event == "finish_port_run":
-                self._finish_port_run(*args, **kwargs)
-            elif event == "show_error":
-                messagebox.showerror(*args, **kwargs)
-            elif event == "show_warning":
-                messagebox.showwarning(*args, **kwargs)
-            elif event == "show_info":
-                messagebox.showinfo(*args, **kwargs)
-            elif event == "update_available":
-                self._on_update_available(*args, **kwargs)
-            elif event == "update_up_to_date":
-                self._on_update_up_to_date(*args, **kwargs)
-            elif event == "update_check_error":
-                self._on_update_check_error(*args, **kwargs)
-            elif event == "update_check_finished":
-                self._update_check_running = False
-            elif event == "update_download_ready":
-                self._on_update_download_ready(*args, **kwargs)
-            elif event == "update_download_error":
-                self._on_update_download_error(*args, **kwargs)
-            elif event == "update_download_finished":
-                self._update_download_running = False
-            drained += 1
-        if not self.shutdown_event.is_set():
-            self.root.after(60, self._process_ui_events)
+        try:
+            t0 = time.perf_counter()
+            self.ui_dispatcher.pump()
+            self._drain_live_samples()
+            self.ui_event_queue.mark_handled()
+            self._ui_tick_ms = (time.perf_counter() - t0) * 1000.0
+            if time.monotonic() >= self._ui_diag_next:
+                self._ui_diag_next = time.monotonic() + UI_DIAG_REFRESH_MS / 1000.0
+                self._refresh_ui_diagnostics()
+                if self.bridge_mode:
+                    self._refresh_bridge_latency()
+                if self.sniffer_trigger is not None:
+                    self._expire_sniffer_trigger()
+                if self.sniffer_transactions is not None:
+                    self._tick_sniffer_transactions()
+            if self.sniffer_mirror_ports:
+                self._poll_sniffer_mirrors()
+        finally:
+            if not self.shutdown_event.is_set():
+                self.root.after(UI_EVENT_TICK_MS, self._process_ui_events)
 
     def toggle_stream(self, port, enabled):
         self.stream_enabled[port] = bool(enabled)
@@ -3944,23 +4525,41 @@ exit /b 0
         if ev:
             ev.set()
 
+    def _open_manual_capture(self):
+        with self._console_store_lock:
+            old = self.manual_capture
+            self.manual_capture = CaptureWriter(self._work_path("console", f"capture_{self.session_id}"))
+        if old is not None:
+            old.close()
+
+    def _write_manual_capture(self, rows):
+        with self._console_store_lock:
+            if self.manual_capture is None:
+                self.manual_capture = CaptureWriter(self._work_path("console", f"capture_{self.session_id}"))
+            capture = self.manual_capture
+        try:
+            capture.write_rows(rows)
+        except OSError as exc:
+            self.log(f"Console capture write failed: {exc}")
+
     def export_manual_capture(self):
-        if not self.manual_capture_rows:
+        if self.manual_capture is None or not self.manual_capture.row_count:
             messagebox.showinfo("No Data", "No console TX/RX rows captured yet.")
             return
         path = filedialog.asksaveasfilename(
             title="Export Console Capture CSV",
             initialdir=self.session_dir,
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV", "*.csv.gz"), ("All files", "*.*")],
         )
         if not path:
             return
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=["timestamp", "port", "direction", "payload"])
-            writer.writeheader()
-            writer.writerows(self.manual_capture_rows)
-        self.log(f"Console capture exported: {path}")
+        try:
+            self.manual_capture.export(path)
+        except OSError as exc:
+            messagebox.showerror("Export Failed", str(exc))
+            return
+        self.log(f"Console capture exported: {path} ({self.manual_capture.row_count} rows)")
 
     def update_port_grid(self):
         # Only show currently connected ports to keep the station view compact.
@@ -4057,7 +4656,7 @@ exit /b 0
             return
         try:
             baud = int(self.baudrate_var.get())
-            ser = serial.Serial(port=port, baudrate=baud, bytesize=8, parity="N", stopbits=1, timeout=2)
+            ser = TappedSerial(port=port, baudrate=baud, bytesize=8, parity="N", stopbits=1, timeout=2)
             self.serial_pool[port] = ser
             self.log(f"Connected: {port} @ {baud}")
             self.set_port_status(port, "CONNECTED")
@@ -4092,7 +4691,7 @@ exit /b 0
             if port in self.serial_pool and self.serial_pool[port].is_open:
                 continue
             try:
-                self.serial_pool[port] = serial.Serial(
+                self.serial_pool[port] = TappedSerial(
                     port=port, baudrate=baud, bytesize=8, parity="N", stopbits=1, timeout=2
                 )
                 count += 1
@@ -4190,11 +4789,14 @@ exit /b 0
         ttk.Radiobutton(options, text="Hex Dump", variable=self.sniffer_display_mode_var, value="hexdump").pack(side=tk.LEFT, padx=(6, 4))
         ttk.Radiobutton(options, text="Raw HEX", variable=self.sniffer_display_mode_var, value="hex").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Radiobutton(options, text="ASCII", variable=self.sniffer_display_mode_var, value="ascii").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Radiobutton(options, text="Decimal", variable=self.sniffer_display_mode_var, value="dec").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Radiobutton(options, text="Binary", variable=self.sniffer_display_mode_var, value="bin").pack(side=tk.LEFT, padx=(0, 12))
 
         # Options
         ttk.Checkbutton(options, text="Timestamps", variable=self.sniffer_show_timestamp_var).pack(side=tk.LEFT, padx=(0, 8))
-        ttk.Checkbutton(options, text="Auto-scroll", variable=self.sniffer_autoscroll_var).pack(side=tk.LEFT, padx=(0, 12))
+        ttk.Checkbutton(options, text="Auto-scroll", variable=self.sniffer_autoscroll_var).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(options, text="Record pcapng", variable=self.sniffer_pcapng_var).pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Checkbutton(options, text="Precise timing", variable=self.sniffer_precise_timing_var).pack(side=tk.LEFT, padx=(0, 12))
 
         # Direction filter (for mirror mode)
         ttk.Label(options, text="Dir:", style="Small.TLabel").pack(side=tk.LEFT)
@@ -4202,10 +4804,21 @@ exit /b 0
         ttk.Radiobutton(options, text="RX", variable=self.sniffer_direction_var, value="rx").pack(side=tk.LEFT, padx=(0, 2))
         ttk.Radiobutton(options, text="TX", variable=self.sniffer_direction_var, value="tx").pack(side=tk.LEFT, padx=(0, 12))
 
+        # Port filter (multi-port captures)
+        ttk.Label(options, text="Port:", style="Small.TLabel").pack(side=tk.LEFT)
+        self.sniffer_port_filter_combo = ttk.Combobox(
+            options, textvariable=self.sniffer_port_filter_var, values=["All"], state="readonly", width=9
+        )
+        self.sniffer_port_filter_combo.pack(side=tk.LEFT, padx=(4, 12))
+
         # Actions
         ttk.Button(options, text="🗑 Clear", command=self._clear_sniffer, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
         ttk.Button(options, text="⬇ Export", command=self._export_sniffer, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
-        ttk.Button(options, text="📋 Copy", command=self._copy_sniffer, style="Toolbar.TButton").pack(side=tk.LEFT)
+        ttk.Button(options, text="📋 Copy", command=self._copy_sniffer, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(options, text="⇄ Transactions", command=self._show_sniffer_transactions, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(options, text="🎯 Trigger", command=self._show_sniffer_trigger, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(options, text="⏱ Gaps", command=self._show_sniffer_gaps, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(options, text="⏵ Replay", command=self._show_sniffer_replay, style="Toolbar.TButton").pack(side=tk.LEFT)
 
         # ─── com0com Bridge Mode ────────────────────────────────────────────
         bridge_frame = ttk.LabelFrame(sniffer, text="🔀 com0com Bridge Mode (Intercept External Apps)", padding=8)
@@ -4270,7 +4883,53 @@ exit /b 0
         output_frame = ttk.Frame(sniffer)
         output_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.sniffer_text = scrolledtext.ScrolledText(
+        nav = ttk.Frame(output_frame)
+        nav.pack(fill=tk.X, pady=(0, 4))
+        ttk.Label(nav, text="Go to (hex offset or HH:MM:SS):", style="Small.TLabel").pack(side=tk.LEFT)
+        self.sniffer_goto_var = tk.StringVar(value="")
+        goto_entry = ttk.Entry(nav, textvariable=self.sniffer_goto_var, width=16)
+        goto_entry.pack(side=tk.LEFT, padx=(4, 4))
+        goto_entry.bind("<Return>", lambda _e: self._sniffer_goto())
+        ttk.Button(nav, text="Go", command=self._sniffer_goto, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(nav, text="⤓ Live", command=self._sniffer_follow_tail, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 12))
+        self.sniffer_pos_var = tk.StringVar(value="")
+        ttk.Label(nav, textvariable=self.sniffer_pos_var, style="Muted.TLabel").pack(side=tk.LEFT)
+
+        search = ttk.Frame(output_frame)
+        search.pack(fill=tk.X, pady=(0, 4))
+        ttk.Label(search, text="Search:", style="Small.TLabel").pack(side=tk.LEFT)
+        self.sniffer_search_kind_var = tk.StringVar(value="hex")
+        ttk.Combobox(
+            search, textvariable=self.sniffer_search_kind_var, values=SEARCH_KINDS, state="readonly", width=6
+        ).pack(side=tk.LEFT, padx=(4, 4))
+        self.sniffer_search_var = tk.StringVar(value="")
+        search_entry = ttk.Entry(search, textvariable=self.sniffer_search_var, width=28)
+        search_entry.pack(side=tk.LEFT, padx=(0, 4))
+        search_entry.bind("<Return>", lambda _e: self._start_sniffer_search())
+        self.sniffer_search_nocase_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search, text="Ignore case", variable=self.sniffer_search_nocase_var).pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(search, text="Find", command=self._start_sniffer_search, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(search, text="Cancel", command=self._cancel_sniffer_search, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 12))
+        self.sniffer_search_status_var = tk.StringVar(value="")
+        ttk.Label(search, textvariable=self.sniffer_search_status_var, style="Muted.TLabel").pack(side=tk.LEFT)
+
+        results = ttk.Frame(output_frame)
+        results.pack(side=tk.BOTTOM, fill=tk.X, pady=(4, 0))
+        self.sniffer_results = ttk.Treeview(
+            results, columns=("offset", "time", "direction", "length"), show="headings", height=5
+        )
+        for col, width in (("offset", 110), ("time", 120), ("direction", 80), ("length", 80)):
+            self.sniffer_results.heading(col, text=col.title())
+            self.sniffer_results.column(col, width=width, anchor=tk.W)
+        results_scroll = ttk.Scrollbar(results, orient=tk.VERTICAL, command=self.sniffer_results.yview)
+        self.sniffer_results.configure(yscrollcommand=results_scroll.set)
+        results_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.sniffer_results.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.sniffer_results.bind("<<TreeviewSelect>>", lambda _e: self._on_sniffer_result_selected())
+
+        # The Text only holds the visible rows; the scrollbar spans the whole
+        # capture and rows are formatted from it on demand.
+        self.sniffer_text = tk.Text(
             output_frame,
             height=20,
             state=tk.DISABLED,
@@ -4281,7 +4940,22 @@ exit /b 0
             relief=tk.FLAT,
             wrap=tk.NONE,
         )
-        self.sniffer_text.pack(fill=tk.BOTH, expand=True)
+        self.sniffer_scroll = ttk.Scrollbar(output_frame, orient=tk.VERTICAL, command=self._on_sniffer_yview)
+        self.sniffer_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.sniffer_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.sniffer_text.bind("<Configure>", lambda _e: self._render_sniffer_view())
+        self.sniffer_text.bind("<MouseWheel>", self._on_sniffer_wheel)
+        self.sniffer_text.bind("<Button-4>", self._on_sniffer_wheel)
+        self.sniffer_text.bind("<Button-5>", self._on_sniffer_wheel)
+        self.sniffer_text.bind("<Prior>", lambda _e: self._on_sniffer_yview("scroll", -1, "pages") or "break")
+        self.sniffer_text.bind("<Next>", lambda _e: self._on_sniffer_yview("scroll", 1, "pages") or "break")
+        for var in (
+            self.sniffer_display_mode_var,
+            self.sniffer_direction_var,
+            self.sniffer_show_timestamp_var,
+            self.sniffer_port_filter_var,
+        ):
+            var.trace_add("write", lambda *_a: self._rebuild_sniffer_view())
 
         # Configure text tags for styling
         self.sniffer_text.tag_configure("offset", foreground=DARK_MUTED)
@@ -4292,6 +4966,9 @@ exit /b 0
         self.sniffer_text.tag_configure("rx", foreground="#4ade80")  # Green for received
         self.sniffer_text.tag_configure("tx", foreground="#f472b6")  # Pink for transmitted
         self.sniffer_text.tag_configure("direction", foreground=DARK_ACCENT_HI, font=("Consolas", 10, "bold"))
+        self.sniffer_text.tag_configure("target", background=DARK_PANEL)
+        for i, color in enumerate(LIVE_PORT_COLORS):
+            self.sniffer_text.tag_configure(f"port{i}", foreground=color, font=("Consolas", 10, "bold"))
 
         # Initialize port lists
         self._refresh_sniffer_ports()
@@ -4336,11 +5013,14 @@ exit /b 0
         return any(marker in marker_text for marker in markers)
 
     def _start_sniffer(self):
-        """Start sniffing the selected serial port."""
+        """Start sniffing the selected serial port, alongside any ports already being sniffed."""
         port = self.sniffer_port_var.get().strip().split(" ")[0]  # Strip "(connected)" suffix
         if not port:
             messagebox.showwarning("No Port", "Select a COM port first.")
             return
+        if port in self.sniffer_serials or port in self.sniffer_mirror_ports:
+            messagebox.showinfo("Already Sniffing", f"{port} is already part of this capture.")
+            return
 
         # Check if port is already in use by the main app - suggest mirror mode
         if port in self.serial_pool and self.serial_pool[port].is_open:
@@ -4354,7 +5034,7 @@ exit /b 0
 
         try:
             baud = int(self.sniffer_baud_var.get())
-            self.sniffer_serial = serial.Serial(
+            ser = serial.Serial(
                 port=port,
                 baudrate=baud,
                 bytesize=8,
@@ -4362,26 +5042,26 @@ exit /b 0
                 stopbits=1,
                 timeout=0.1,
             )
+            if hasattr(ser, "set_buffer_size"):
+                try:
+                    ser.set_buffer_size(rx_size=SNIFFER_RX_BUFFER_BYTES)
+                except Exception:
+                    pass
+            if not self.sniffer_running:
+                self._clear_sniffer()  # First port of a new capture
+            stop = threading.Event()
+            self.sniffer_serials[port] = ser
+            self.sniffer_stop_events[port] = stop
             self.sniffer_running = True
-            self.sniffer_mirror_mode = False
-            self.sniffer_mirror_port = None
-            self.sniffer_stop_event.clear()
-            self.sniffer_byte_offset = 0
-            self.sniffer_buffer.clear()
-
-            # Update UI state
-            self.sniffer_start_btn.configure(state=tk.DISABLED)
-            self.sniffer_mirror_btn.configure(state=tk.DISABLED)
-            self.sniffer_stop_btn.configure(state=tk.NORMAL)
-            self.sniffer_port_combo.configure(state=tk.DISABLED)
-            self.sniffer_status_var.set("● Sniffing")
-            self.sniffer_status_label.configure(style="OK.TLabel")
 
             # Start reader thread
-            self.sniffer_thread = threading.Thread(target=self._sniffer_read_loop, daemon=True)
-            self.sniffer_thread.start()
+            precise = self.sniffer_precise_timing_var.get()
+            thread = threading.Thread(target=self._sniffer_read_loop, args=(port, ser, stop, precise), daemon=True)
+            self.sniffer_threads[port] = thread
+            thread.start()
+            self._update_sniffer_status()
 
-            self.log(f"Sniffer started: {port} @ {baud}")
+            self.log(f"Sniffer started: {port} @ {baud}{' (precise timing)' if precise else ''}")
 
         except serial.SerialException as exc:
             # Port likely in use by another application
@@ -4398,19 +5078,24 @@ exit /b 0
                 )
             else:
                 messagebox.showerror("Sniffer Error", f"Failed to open {port}: {exc}")
-            self.sniffer_status_var.set("● Error")
-            self.sniffer_status_label.configure(style="Fail.TLabel")
+            if not self.sniffer_running:
+                self.sniffer_status_var.set("● Error")
+                self.sniffer_status_label.configure(style="Fail.TLabel")
         except Exception as exc:
             messagebox.showerror("Sniffer Error", f"Failed to open {port}: {exc}")
-            self.sniffer_status_var.set("● Error")
-            self.sniffer_status_label.configure(style="Fail.TLabel")
+            if not self.sniffer_running:
+                self.sniffer_status_var.set("● Error")
+                self.sniffer_status_label.configure(style="Fail.TLabel")
 
     def _start_mirror(self):
-        """Start mirroring traffic from a port already connected by the main app."""
+        """Mirror traffic from a port already connected by the main app into the capture."""
         port = self.sniffer_port_var.get().strip().split(" ")[0]  # Strip "(connected)" suffix
         if not port:
             messagebox.showwarning("No Port", "Select a COM port first.")
             return
+        if port in self.sniffer_serials or port in self.sniffer_mirror_ports:
+            messagebox.showinfo("Already Sniffing", f"{port} is already part of this capture.")
+            return
 
         # Check if port is connected by the main app
         if port not in self.serial_pool or not self.serial_pool[port].is_open:
@@ -4424,199 +5109,470 @@ exit /b 0
             return
 
         # Start mirror mode
+        if not self.sniffer_running:
+            self._clear_sniffer()
         self.sniffer_running = True
-        self.sniffer_mirror_mode = True
-        self.sniffer_mirror_port = port
-        self.sniffer_byte_offset = 0
-        self.sniffer_buffer.clear()
-        self._clear_sniffer()
-
-        # Update UI state
-        self.sniffer_start_btn.configure(state=tk.DISABLED)
-        self.sniffer_mirror_btn.configure(state=tk.DISABLED)
-        self.sniffer_stop_btn.configure(state=tk.NORMAL)
-        self.sniffer_port_combo.configure(state=tk.DISABLED)
-        self.sniffer_status_var.set(f"● Mirroring {port}")
-        self.sniffer_status_label.configure(style="Accent.TLabel")
+        # Raw bytes straight from the port's tap, timed at each read/write call.
+        self.sniffer_mirror_ports[port] = self.serial_pool[port].tap.reader()
+        self._update_sniffer_status()
 
         self.log(f"Sniffer mirroring: {port}")
 
-    def _stop_sniffer(self):
-        """Stop the sniffer."""
-        self.sniffer_stop_event.set()
-        self.sniffer_running = False
-        self.sniffer_mirror_mode = False
-        self.sniffer_mirror_port = None
+    def _poll_sniffer_mirrors(self):
+        """Move new tapped bytes of the mirrored ports into the capture."""
+        chunks = []
+        for port, reader in self.sniffer_mirror_ports.items():
+            lost = reader.lost
+            chunks.extend(reader.read_chunks(port))
+            if reader.lost != lost:
+                self.log(f"Sniffer mirror fell behind on {port}: {reader.lost - lost:,} read(s) lost")
+        self._append_sniffer_chunks(chunks)
+
+    def _stop_sniffer(self, port=None):
+        """Stop sniffing ``port`` (a reader that lost its port), or every port."""
+        ports = [port] if port is not None else list(self.sniffer_serials) + list(self.sniffer_mirror_ports)
+        for name in ports:
+            reader = self.sniffer_mirror_ports.pop(name, None)
+            if reader is not None:
+                reader.close()
+            stop = self.sniffer_stop_events.pop(name, None)
+            if stop is not None:
+                stop.set()
+            ser = self.sniffer_serials.pop(name, None)
+            if ser is not None:
+                try:
+                    ser.close()
+                except Exception:
+                    pass
+            self.sniffer_threads.pop(name, None)
+        self.sniffer_running = bool(self.sniffer_serials or self.sniffer_mirror_ports)
+        self._update_sniffer_status()
 
-        if self.sniffer_serial:
-            try:
-                self.sniffer_serial.close()
-            except Exception:
-                pass
-            self.sniffer_serial = None
+        if port is not None:
+            self.log(f"Sniffer lost {port}")
+        else:
+            self.log("Sniffer stopped")
 
-        # Update UI state
-        self.sniffer_start_btn.configure(state=tk.NORMAL)
-        self.sniffer_mirror_btn.configure(state=tk.NORMAL)
-        self.sniffer_stop_btn.configure(state=tk.DISABLED)
-        self.sniffer_port_combo.configure(state="readonly")
-        self.sniffer_status_var.set("● Stopped")
-        self.sniffer_status_label.configure(style="Muted.TLabel")
+    def _update_sniffer_status(self):
+        """Status line and buttons for the ports currently feeding the capture."""
+        sniffed = sorted(self.sniffer_serials)
+        mirrored = sorted(self.sniffer_mirror_ports)
+        parts = []
+        if sniffed:
+            parts.append("Sniffing " + ", ".join(sniffed))
+        if mirrored:
+            parts.append("Mirroring " + ", ".join(mirrored))
+        # More ports can be added while running; Stop ends them all.
+        self.sniffer_stop_btn.configure(state=tk.NORMAL if parts else tk.DISABLED)
+        if parts:
+            self.sniffer_status_var.set("● " + " · ".join(parts))
+            self.sniffer_status_label.configure(style="OK.TLabel" if sniffed else "Accent.TLabel")
+        else:
+            self.sniffer_status_var.set("● Stopped")
+            self.sniffer_status_label.configure(style="Muted.TLabel")
 
-        self.log("Sniffer stopped")
+    def _sniffer_read_loop(self, port, ser, stop, precise=False):
+        """Background thread that reads one sniffed serial port (timing every read if ``precise``)."""
+        try:
+            # Queued for the UI tick; never touch Tk from this thread.
+            if precise:
+                timed_read_loop(
+                    ser,
+                    stop,
+                    lambda data, epoch, marks: self._ui_post("sniffer_data", data, epoch, None, port, marks),
+                    self.sniffer_capture.clock_origin,
+                )
+            else:
+                read_loop(ser, stop, lambda data, epoch: self._ui_post("sniffer_data", data, epoch, None, port))
+        except Exception:
+            if not stop.is_set():
+                self._ui_post("sniffer_stop", port)
+
+    def _append_sniffer_chunks(self, chunks):
+        """Record ``(data, timestamp, direction[, port[, marks]])`` chunks and refresh the viewer once."""
+        if self.sniffer_trigger is not None:
+            # Armed: only traffic around trigger hits is kept.
+            chunks = self._apply_sniffer_trigger_actions(self.sniffer_trigger.feed(chunks))
+        if not chunks:
+            return
+        # Built before the append, so the new rows show up in refresh() below.
+        rows = self._sniffer_row_model()
+        old_total = len(rows)
+        try:
+            self.sniffer_capture.extend(chunks)
+        except OSError as exc:
+            self.log(f"Sniffer capture write failed: {exc}")
+        if self.sniffer_pcapng_var.get():
+            self._record_sniffer_pcapng(chunks)
+        if self.sniffer_transactions_window is not None:
+            self._refresh_sniffer_transactions()
+        self.sniffer_bytes_var.set(f"{self.sniffer_capture.total_bytes:,} bytes")
+        ports = ["All"] + self.sniffer_capture.port_names()
+        if len(ports) != len(self.sniffer_port_filter_combo["values"]):
+            self.sniffer_port_filter_combo["values"] = ports
+        if not rows.refresh():
+            return
+        # Redraw only when following the tail or the new rows land on screen.
+        if self._sniffer_following() or old_total < self.sniffer_view_top + self._sniffer_visible_rows():
+            self._render_sniffer_view()
+        else:
+            self._update_sniffer_scrollbar()
 
-    def _sniffer_read_loop(self):
-        """Background thread that reads from the serial port."""
-        while not self.sniffer_stop_event.is_set() and self.sniffer_running:
-            try:
-                if self.sniffer_serial and self.sniffer_serial.is_open:
-                    data = self.sniffer_serial.read(256)
-                    if data:
-                        timestamp = dt.datetime.now()
-                        self.sniffer_buffer.append((timestamp, data))
-                        # Schedule UI update on main thread
-                        self.root.after(0, lambda d=data, t=timestamp: self._append_sniffer_data(d, t))
-            except serial.SerialException:
-                self.root.after(0, self._stop_sniffer)
-                break
-            except Exception:
-                pass
+    def _sniffer_following(self):
+        return self.sniffer_follow and self.sniffer_autoscroll_var.get()
 
-    def _append_sniffer_data(self, data: bytes, timestamp: dt.datetime, direction: str = None):
-        """Append received data to the sniffer output.
-        
-        Args:
-            data: Raw bytes to display
-            timestamp: When the data was received
-            direction: Optional 'TX' or 'RX' for mirror mode
-        """
+    def _sniffer_row_model(self):
+        if self.sniffer_capture is None:
+            self._open_sniffer_capture()
+        if self.sniffer_rows is None or self.sniffer_rows.capture is not self.sniffer_capture:
+            dir_filter = self.sniffer_direction_var.get()
+            direction = dir_filter.upper() if dir_filter in ("rx", "tx") else None
+            mode = self.sniffer_display_mode_var.get()
+            port = self.sniffer_port_filter_var.get()
+            self.sniffer_rows = CaptureRows(
+                self.sniffer_capture,
+                ROW_BYTES.get(mode, ROW_BYTES["hexdump"]),
+                direction,
+                port=None if port in ("", "All") else port,
+            )
+        return self.sniffer_rows
+
+    def _rebuild_sniffer_view(self):
+        """Re-lay out the whole capture after a mode/filter change, keeping the top byte in view."""
+        anchor = None
+        if self.sniffer_rows is not None and not self._sniffer_following():
+            top = self.sniffer_rows.rows(self.sniffer_view_top, self.sniffer_view_top + 1)
+            anchor = top[0][0] if top else None
+        self.sniffer_rows = None
+        rows = self._sniffer_row_model()
+        if anchor is not None:
+            self.sniffer_view_top = rows.row_for_offset(anchor)
+        self._render_sniffer_view()
+
+    def _sniffer_visible_rows(self):
+        if self._sniffer_line_px is None:
+            self._sniffer_line_px = max(1, tkfont.Font(root=self.root, font=("Consolas", 10)).metrics("linespace"))
+        return max(1, int(self.sniffer_text.winfo_height()) // self._sniffer_line_px)
+
+    def _render_sniffer_view(self, target_row=None):
+        """Format and show only the rows that fit in the sniffer text widget."""
+        rows = self._sniffer_row_model()
+        rows.refresh()
+        visible = self._sniffer_visible_rows()
+        tail_top = max(len(rows) - visible, 0)
+        top = tail_top if self._sniffer_following() else min(max(self.sniffer_view_top, 0), tail_top)
+        self.sniffer_view_top = top
         mode = self.sniffer_display_mode_var.get()
         show_ts = self.sniffer_show_timestamp_var.get()
-
+        # Label rows with their port once more than one port feeds the capture.
+        capture = self.sniffer_capture
+        multi_port = len(capture.port_names()) > 1
+        runs = TagRuns()
+        for offset, data, epoch, direction, first, port in rows.rows(top, top + visible):
+            ts_text = dt.datetime.fromtimestamp(epoch).strftime("%H:%M:%S.%f")[:-3] if show_ts else None
+            format_row(
+                runs,
+                mode,
+                data,
+                offset,
+                ts_text,
+                direction,
+                continuation=not first,
+                port=port if multi_port else None,
+                port_tag=f"port{capture.port_id(port) % len(LIVE_PORT_COLORS)}",
+            )
         self.sniffer_text.configure(state=tk.NORMAL)
+        self.sniffer_text.delete("1.0", tk.END)
+        if runs.parts:
+            self.sniffer_text.insert("1.0", *runs.parts)
+        if target_row is not None and top <= target_row < top + visible:
+            line = target_row - top + 1
+            self.sniffer_text.tag_add("target", f"{line}.0", f"{line}.end")
+        self.sniffer_text.configure(state=tk.DISABLED)
+        self._update_sniffer_scrollbar()
+
+    def _update_sniffer_scrollbar(self):
+        total = len(self.sniffer_rows) if self.sniffer_rows is not None else 0
+        visible = self._sniffer_visible_rows()
+        span = max(total, 1)
+        lo = self.sniffer_view_top / span
+        self.sniffer_scroll.set(min(max(lo, 0.0), 1.0), min(lo + visible / span, 1.0))
+        if total:
+            last = min(self.sniffer_view_top + visible, total)
+            self.sniffer_pos_var.set(f"Rows {self.sniffer_view_top + 1:,}-{last:,} of {total:,}")
+        else:
+            self.sniffer_pos_var.set("")
 
-        # Show direction indicator for mirror mode
-        if direction and self.sniffer_mirror_mode:
-            dir_tag = "rx" if direction.upper() == "RX" else "tx"
-            self.sniffer_text.insert(tk.END, f"[{direction}] ", dir_tag)
+    def _on_sniffer_yview(self, op, *args):
+        rows = self._sniffer_row_model()
+        visible = self._sniffer_visible_rows()
+        if op == "moveto":
+            top = int(float(args[0]) * len(rows))
+        else:
+            step = visible if str(args[1]).startswith("page") else 1
+            top = self.sniffer_view_top + int(args[0]) * step
+        self.sniffer_view_top = top
+        self.sniffer_follow = top >= len(rows) - visible
+        self._render_sniffer_view()
+
+    def _on_sniffer_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._on_sniffer_yview("scroll", -CONSOLE_WHEEL_LINES, "units")
+        else:
+            self._on_sniffer_yview("scroll", CONSOLE_WHEEL_LINES, "units")
+        return "break"
 
-        if mode == "hexdump":
-            self._append_hexdump(data, timestamp if show_ts else None, direction)
-        elif mode == "hex":
-            self._append_raw_hex(data, timestamp if show_ts else None, direction)
-        elif mode == "ascii":
-            self._append_ascii(data, timestamp if show_ts else None, direction)
-        elif mode == "bin":
-            self._append_binary(data, timestamp if show_ts else None, direction)
+    def _sniffer_follow_tail(self):
+        self.sniffer_follow = True
+        self.sniffer_autoscroll_var.set(True)
+        self._render_sniffer_view()
 
-        self.sniffer_text.configure(state=tk.DISABLED)
+    def _sniffer_show_row(self, row):
+        """Scroll so ``row`` is near the top of the viewer and highlight it."""
+        rows = self._sniffer_row_model()
+        if not len(rows):
+            return
+        row = min(max(int(row), 0), len(rows) - 1)
+        self.sniffer_follow = False
+        self.sniffer_view_top = max(row - 2, 0)
+        self._render_sniffer_view(target_row=row)
+
+    def _start_sniffer_search(self):
+        """Search the whole capture in a background thread; results land in the table."""
+        capture = self.sniffer_capture
+        if capture is None or not capture.total_bytes:
+            self.sniffer_search_status_var.set("Nothing captured yet")
+            return
+        try:
+            pattern = compile_pattern(
+                self.sniffer_search_var.get(), self.sniffer_search_kind_var.get(), self.sniffer_search_nocase_var.get()
+            )
+        except ValueError as exc:
+            messagebox.showwarning("Search", str(exc))
+            return
+        self._cancel_sniffer_search()
+        dir_filter = self.sniffer_direction_var.get()
+        direction = dir_filter.upper() if dir_filter in ("rx", "tx") else None
+        cancel = threading.Event()
+        self._sniffer_search_cancel = cancel
+        self.sniffer_search_status_var.set("Searching...")
 
-        # Update byte counter
-        total_bytes = sum(len(d) for _, d in self.sniffer_buffer)
-        self.sniffer_bytes_var.set(f"{total_bytes:,} bytes")
-
-        # Auto-scroll
-        if self.sniffer_autoscroll_var.get():
-            self.sniffer_text.see(tk.END)
-
-    def _append_hexdump(self, data: bytes, timestamp=None, direction=None):
-        """Append data in classic hex dump format: offset | hex bytes | ASCII."""
-        bytes_per_line = 16
-        hex_tag = "rx" if direction and direction.upper() == "RX" else ("tx" if direction else "hex")
-
-        for i in range(0, len(data), bytes_per_line):
-            chunk = data[i:i + bytes_per_line]
-
-            # Timestamp (optional)
-            if timestamp and i == 0:
-                ts_str = timestamp.strftime("%H:%M:%S.%f")[:-3] + " "
-                self.sniffer_text.insert(tk.END, ts_str, "timestamp")
-
-            # Offset
-            offset_str = f"{self.sniffer_byte_offset:08X}  "
-            self.sniffer_text.insert(tk.END, offset_str, "offset")
-
-            # Hex bytes
-            hex_parts = []
-            for j, b in enumerate(chunk):
-                hex_parts.append(f"{b:02X}")
-                if j == 7:
-                    hex_parts.append("")  # Extra space in middle
-            hex_str = " ".join(hex_parts).ljust(50)
-            self.sniffer_text.insert(tk.END, hex_str, hex_tag)
-
-            # ASCII representation
-            self.sniffer_text.insert(tk.END, " │ ", "offset")
-            for b in chunk:
-                if 32 <= b <= 126:
-                    self.sniffer_text.insert(tk.END, chr(b), "ascii")
-                else:
-                    self.sniffer_text.insert(tk.END, ".", "nonprint")
-
-            self.sniffer_text.insert(tk.END, "\n")
-            self.sniffer_byte_offset += len(chunk)
-
-    def _append_raw_hex(self, data: bytes, timestamp=None, direction=None):
-        """Append data as raw hex bytes."""
-        if timestamp:
-            ts_str = timestamp.strftime("[%H:%M:%S.%f]")[:-4] + "] "
-            self.sniffer_text.insert(tk.END, ts_str, "timestamp")
-
-        hex_tag = "rx" if direction and direction.upper() == "RX" else ("tx" if direction else "hex")
-        hex_str = " ".join(f"{b:02X}" for b in data) + " "
-        self.sniffer_text.insert(tk.END, hex_str, hex_tag)
-
-    def _append_ascii(self, data: bytes, timestamp=None, direction=None):
-        """Append data as ASCII with non-printables shown."""
-        if timestamp:
-            ts_str = timestamp.strftime("[%H:%M:%S.%f]")[:-4] + "] "
-            self.sniffer_text.insert(tk.END, ts_str, "timestamp")
-
-        text_tag = "rx" if direction and direction.upper() == "RX" else ("tx" if direction else "ascii")
-        nonprint_tag = "nonprint"
-        for b in data:
-            if b == 13:  # CR
-                self.sniffer_text.insert(tk.END, "<CR>", "nonprint")
-            elif b == 10:  # LF
-                self.sniffer_text.insert(tk.END, "<LF>\n", "nonprint")
-            elif b == 9:  # TAB
-                self.sniffer_text.insert(tk.END, "<TAB>", "nonprint")
-            elif 32 <= b <= 126:
-                self.sniffer_text.insert(tk.END, chr(b), text_tag)
+        def worker():
+            try:
+                found = search_capture(
+                    capture,
+                    pattern,
+                    cancel=cancel,
+                    progress=lambda done, total: self._ui_post("sniffer_search_progress", cancel, done, total),
+                    direction=direction,
+                )
+            except Exception as exc:
+                self._ui_post("sniffer_search_done", cancel, capture, None, str(exc))
+                return
+            self._ui_post("sniffer_search_done", cancel, capture, found, None)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _cancel_sniffer_search(self):
+        if self._sniffer_search_cancel is not None:
+            self._sniffer_search_cancel.set()
+            self._sniffer_search_cancel = None
+            self.sniffer_search_status_var.set("Search cancelled")
+
+    def _on_sniffer_search_progress(self, cancel, done, total):
+        if cancel is self._sniffer_search_cancel:
+            self.sniffer_search_status_var.set(f"Searching... {done * 100 // max(total, 1)}%")
+
+    def _on_sniffer_search_done(self, cancel, capture, found, error):
+        if cancel is not self._sniffer_search_cancel:
+            return  # Superseded or cancelled
+        self._sniffer_search_cancel = None
+        if error is not None:
+            self.sniffer_search_status_var.set(f"Search failed: {error}")
+            return
+        if capture is not self.sniffer_capture:
+            self.sniffer_search_status_var.set("Capture was cleared during the search")
+            return
+        offsets, lengths, times, directions, truncated = found
+        self.sniffer_results.delete(*self.sniffer_results.get_children())
+        self._sniffer_search_offsets = offsets.tolist()
+        for i, (offset, length, epoch, direction) in enumerate(zip(self._sniffer_search_offsets, lengths.tolist(), times.tolist(), directions)):
+            ts = dt.datetime.fromtimestamp(epoch).strftime("%H:%M:%S.%f")[:-3]
+            self.sniffer_results.insert("", tk.END, iid=str(i), values=(f"{offset:08X}", ts, direction or "", length))
+        more = f" (first {SEARCH_MAX_RESULTS:,})" if truncated else ""
+        self.sniffer_search_status_var.set(f"{len(self._sniffer_search_offsets):,} match(es){more}")
+        if self._sniffer_search_offsets:
+            self.sniffer_results.selection_set("0")
+
+    def _on_sniffer_result_selected(self):
+        selected = self.sniffer_results.selection()
+        if not selected or self.sniffer_capture is None:
+            return
+        offset = self._sniffer_search_offsets[int(selected[0])]
+        self._sniffer_show_row(self._sniffer_row_model().row_for_offset(offset))
+
+    def _sniffer_goto(self):
+        """Jump to a stream offset (hex, as in the dump column) or a time of day."""
+        text = self.sniffer_goto_var.get().strip()
+        capture = self.sniffer_capture
+        if not text or capture is None or not len(capture):
+            return
+        rows = self._sniffer_row_model()
+        try:
+            if ":" in text:
+                row = rows.row_for_time(self._sniffer_time_of_day(text))
             else:
-                self.sniffer_text.insert(tk.END, f"<{b:02X}>", nonprint_tag)
+                row = rows.row_for_offset(int(text, 16))
+        except ValueError:
+            messagebox.showwarning("Go To", "Enter a hex byte offset (e.g. 1A0) or a time (HH:MM:SS[.mmm]).")
+            return
+        self._sniffer_show_row(row)
 
-    def _append_binary(self, data: bytes, timestamp=None, direction=None):
-        """Append data as binary."""
-        if timestamp:
-            ts_str = timestamp.strftime("[%H:%M:%S.%f]")[:-4] + "] "
-            self.sniffer_text.insert(tk.END, ts_str, "timestamp")
+    def _sniffer_time_of_day(self, text):
+        """Epoch seconds for ``HH:MM[:SS[.mmm]]`` on the day the capture started.
 
-        hex_tag = "rx" if direction and direction.upper() == "RX" else ("tx" if direction else "hex")
-        bin_str = " ".join(f"{b:08b}" for b in data) + " "
-        self.sniffer_text.insert(tk.END, bin_str, hex_tag)
+        Raises ``ValueError`` for anything else.
+        """
+        first = dt.datetime.fromtimestamp(self.sniffer_capture.start_time())
+        parts = [float(p) for p in text.split(":")]
+        if not 2 <= len(parts) <= 3:
+            raise ValueError(text)
+        hh, mm, ss = (parts + [0.0])[:3]
+        target = first.replace(hour=int(hh), minute=int(mm), second=0, microsecond=0) + dt.timedelta(seconds=ss)
+        if target < first - dt.timedelta(hours=12):
+            target += dt.timedelta(days=1)  # Capture crossed midnight
+        return target.timestamp()
 
     def _clear_sniffer(self):
         """Clear the sniffer output."""
         self.sniffer_text.configure(state=tk.NORMAL)
         self.sniffer_text.delete("1.0", tk.END)
         self.sniffer_text.configure(state=tk.DISABLED)
-        self.sniffer_buffer.clear()
-        self.sniffer_byte_offset = 0
+        self._open_sniffer_capture()
+        if self._sniffer_search_cancel is not None:
+            self._sniffer_search_cancel.set()
+            self._sniffer_search_cancel = None
+        self.sniffer_results.delete(*self.sniffer_results.get_children())
+        self._sniffer_search_offsets = []
+        self.sniffer_search_status_var.set("")
+        self.sniffer_rows = None
+        self.sniffer_view_top = 0
+        self.sniffer_follow = True
         self.sniffer_bytes_var.set("0 bytes")
+        self.sniffer_port_filter_combo["values"] = ["All"]
+        if self.sniffer_port_filter_var.get() != "All":
+            self.sniffer_port_filter_var.set("All")
+        self._update_sniffer_scrollbar()
+
+    def _sniffer_source_port(self):
+        """Port name the sniffer capture is labelled with (pcapng interface names)."""
+        if self.bridge_real_serial is not None:
+            return self.bridge_real_port_var.get().strip() or "bridge"
+        return self.sniffer_port_var.get().strip().split(" ")[0] or "serial"
+
+    def _record_sniffer_pcapng(self, chunks):
+        """Append chunks to the live pcapng recording of the current capture."""
+        try:
+            if self.sniffer_pcapng is None:
+                name = os.path.splitext(os.path.basename(self.sniffer_capture.path))[0] + ".pcapng"
+                path = os.path.join(self._session_subdir("sniffer"), name)
+                self.sniffer_pcapng = PcapngWriter(path)
+                self.log(f"Sniffer pcapng recording: {path}")
+            self.sniffer_pcapng.write_chunks(chunks, self._sniffer_source_port())
+            self.sniffer_pcapng.flush()
+        except OSError as exc:
+            self.log(f"Sniffer pcapng write failed: {exc}")
+            self.sniffer_pcapng_var.set(False)
+
+    def _close_sniffer_pcapng(self):
+        if self.sniffer_pcapng is not None:
+            try:
+                self.sniffer_pcapng.close()
+            except OSError:
+                pass
+            self.sniffer_pcapng = None
+
+    def _open_sniffer_capture(self):
+        """Discard the current sniffer capture and start an empty one on disk."""
+        # A live pcapng recording is kept; the next capture starts a new one.
+        self._close_sniffer_pcapng()
+        if self.sniffer_capture is not None:
+            self.sniffer_capture.close(remove=True)
+        self._sniffer_capture_seq += 1
+        path = self._work_path("sniffer", f"sniffer_{self.session_id}_{self._sniffer_capture_seq:03d}.bin")
+        self.sniffer_capture = SnifferCapture(path)
 
     def _export_sniffer(self):
-        """Export sniffer data to a file."""
-        if not self.sniffer_buffer:
+        """Export the sniffer capture (optionally a time range / direction) in the background."""
+        capture = self.sniffer_capture
+        if capture is None or not capture.total_bytes:
             messagebox.showinfo("Export", "No data to export.")
             return
+        if self.sniffer_export_window is not None:
+            self.sniffer_export_window.lift()
+            return
 
+        win = tk.Toplevel(self.root)
+        self.sniffer_export_window = win
+        win.title("Export Sniffer Data")
+        win.resizable(False, False)
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=12)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        from_var = tk.StringVar()
+        to_var = tk.StringVar()
+        dir_filter = self.sniffer_direction_var.get()
+        direction_var = tk.StringVar(value=dir_filter if dir_filter in ("rx", "tx") else "both")
+        self.sniffer_export_status_var = tk.StringVar(value="Times are HH:MM:SS[.mmm]; leave blank for the whole capture.")
+
+        ttk.Label(frame, text="From:").grid(row=0, column=0, sticky="e", padx=(0, 6))
+        ttk.Entry(frame, textvariable=from_var, width=14).grid(row=0, column=1, sticky="w")
+        ttk.Label(frame, text="To:").grid(row=0, column=2, sticky="e", padx=(12, 6))
+        ttk.Entry(frame, textvariable=to_var, width=14).grid(row=0, column=3, sticky="w")
+        ttk.Label(frame, text="Direction:").grid(row=1, column=0, sticky="e", padx=(0, 6), pady=(6, 0))
+        ttk.Combobox(
+            frame, textvariable=direction_var, values=("both", "rx", "tx"), state="readonly", width=8
+        ).grid(row=1, column=1, sticky="w", pady=(6, 0))
+        port_var = tk.StringVar(value=self.sniffer_port_filter_var.get() or "All")
+        ttk.Label(frame, text="Port:").grid(row=1, column=2, sticky="e", padx=(12, 6), pady=(6, 0))
+        ttk.Combobox(
+            frame, textvariable=port_var, values=["All"] + capture.port_names(), state="readonly", width=10
+        ).grid(row=1, column=3, sticky="w", pady=(6, 0))
+        self.sniffer_export_progress = ttk.Progressbar(frame, mode="determinate", maximum=100, length=320)
+        self.sniffer_export_progress.grid(row=2, column=0, columnspan=4, sticky="ew", pady=(10, 4))
+        ttk.Label(frame, textvariable=self.sniffer_export_status_var, style="Muted.TLabel").grid(
+            row=3, column=0, columnspan=4, sticky="w"
+        )
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=4, column=0, columnspan=4, sticky="e", pady=(10, 0))
+        self.sniffer_export_button = ttk.Button(
+            buttons,
+            text="Export...",
+            command=lambda: self._start_sniffer_export(from_var.get(), to_var.get(), direction_var.get(), port_var.get()),
+        )
+        self.sniffer_export_button.pack(side=tk.LEFT, padx=(0, 6))
+        ttk.Button(buttons, text="Close", command=self._close_sniffer_export, style="Secondary.TButton").pack(side=tk.LEFT)
+        win.protocol("WM_DELETE_WINDOW", self._close_sniffer_export)
+
+    def _start_sniffer_export(self, from_text, to_text, direction, port_filter="All"):
+        capture = self.sniffer_capture
+        if capture is None or not capture.total_bytes:
+            return
+        try:
+            start = self._sniffer_time_of_day(from_text.strip()) if from_text.strip() else None
+            end = self._sniffer_time_of_day(to_text.strip()) if to_text.strip() else None
+        except ValueError:
+            messagebox.showwarning("Export", "Enter times as HH:MM:SS[.mmm], or leave them blank.", parent=self.sniffer_export_window)
+            return
         path = filedialog.asksaveasfilename(
+            parent=self.sniffer_export_window,
             defaultextension=".bin",
             filetypes=[
                 ("Binary file", "*.bin"),
                 ("Hex text", "*.hex"),
                 ("Text file", "*.txt"),
+                ("pcapng capture", "*.pcapng"),
                 ("All files", "*.*"),
             ],
             title="Export Sniffer Data",
@@ -4624,41 +5580,788 @@ exit /b 0
         if not path:
             return
 
-        try:
-            ext = os.path.splitext(path)[1].lower()
-            if ext == ".bin":
-                # Export raw binary
-                with open(path, "wb") as f:
-                    for _, data in self.sniffer_buffer:
-                        f.write(data)
-            elif ext == ".hex":
-                # Export as hex string
-                with open(path, "w", encoding="utf-8") as f:
-                    for ts, data in self.sniffer_buffer:
-                        hex_str = " ".join(f"{b:02X}" for b in data)
-                        f.write(f"[{ts.strftime('%H:%M:%S.%f')[:-3]}] {hex_str}\n")
+        direction = direction.upper() if direction in ("rx", "tx") else None
+        port_filter = None if port_filter in ("", "All") else port_filter
+        fmt = export_format_for_path(path)
+        port = self._sniffer_source_port()
+        cancel = threading.Event()
+        self._sniffer_export_cancel = cancel
+        self.sniffer_export_button.configure(state=tk.DISABLED)
+        self.sniffer_export_progress.configure(value=0)
+        self.sniffer_export_status_var.set(f"Exporting {fmt}...")
+
+        def worker():
+            try:
+                result = export_capture(
+                    capture,
+                    path,
+                    fmt,
+                    start=start,
+                    end=end,
+                    direction=direction,
+                    cancel=cancel,
+                    progress=lambda done, total: self._ui_post("sniffer_export_progress", cancel, done, total),
+                    port=port,
+                    port_filter=port_filter,
+                )
+            except ExportCancelled:
+                self._ui_post("sniffer_export_done", cancel, path, None, "cancelled")
+                return
+            except Exception as exc:
+                self._ui_post("sniffer_export_done", cancel, path, None, str(exc))
+                return
+            self._ui_post("sniffer_export_done", cancel, path, result, None)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _close_sniffer_export(self):
+        """Close the export dialog; an export still running is cancelled."""
+        if self._sniffer_export_cancel is not None:
+            self._sniffer_export_cancel.set()
+            self._sniffer_export_cancel = None
+        if self.sniffer_export_window is not None:
+            self.sniffer_export_window.destroy()
+            self.sniffer_export_window = None
+
+    def _on_sniffer_export_progress(self, cancel, done, total):
+        if cancel is self._sniffer_export_cancel and self.sniffer_export_window is not None:
+            self.sniffer_export_progress.configure(value=done * 100 / max(total, 1))
+            self.sniffer_export_status_var.set(f"Exporting... {done / 1e6:,.1f} / {total / 1e6:,.1f} MB")
+
+    def _on_sniffer_export_done(self, cancel, path, result, error):
+        if cancel is self._sniffer_export_cancel:
+            self._sniffer_export_cancel = None
+        if error == "cancelled":
+            self.log(f"Sniffer export cancelled: {path}")
+            return
+        if self.sniffer_export_window is not None:
+            self.sniffer_export_button.configure(state=tk.NORMAL)
+        if error is not None:
+            self.log(f"Sniffer export failed: {error}")
+            if self.sniffer_export_window is not None:
+                self.sniffer_export_status_var.set(f"Export failed: {error}")
             else:
-                # Export as text (hex dump format)
-                with open(path, "w", encoding="utf-8") as f:
-                    offset = 0
-                    for ts, data in self.sniffer_buffer:
-                        f.write(f"--- {ts.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} ---\n")
-                        for i in range(0, len(data), 16):
-                            chunk = data[i:i + 16]
-                            hex_str = " ".join(f"{b:02X}" for b in chunk).ljust(48)
-                            ascii_str = "".join(chr(b) if 32 <= b <= 126 else "." for b in chunk)
-                            f.write(f"{offset:08X}  {hex_str}  │{ascii_str}│\n")
-                            offset += len(chunk)
-
-            self.log(f"Sniffer data exported: {path}")
-            messagebox.showinfo("Export", f"Data exported to:\n{path}")
+                messagebox.showerror("Export Error", error)
+            return
+        chunks, nbytes = result
+        self.log(f"Sniffer data exported: {path} ({chunks:,} chunks, {nbytes:,} bytes)")
+        if self.sniffer_export_window is not None:
+            self.sniffer_export_progress.configure(value=100)
+            self.sniffer_export_status_var.set(f"Exported {nbytes:,} bytes to {os.path.basename(path)}")
+
+    def _show_sniffer_transactions(self):
+        """TX command -> RX response pairs with latency, decoded from the capture as it grows."""
+        if self.sniffer_transactions_window is not None:
+            self.sniffer_transactions_window.lift()
+            return
+        colors = self._theme_colors()
+        win = tk.Toplevel(self.root)
+        self.sniffer_transactions_window = win
+        win.title("Sniffer Transactions")
+        win.geometry("900x600")
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
 
-        except Exception as exc:
-            messagebox.showerror("Export Error", str(exc))
+        self.sniffer_transactions_status_var = tk.StringVar(value="")
+        ttk.Label(
+            frame,
+            text="Pairs each TX command with the RX lines up to the next command on its port (bridge and mirror modes).",
+            style="Muted.TLabel",
+        ).pack(anchor="w")
+        ttk.Label(frame, textvariable=self.sniffer_transactions_status_var, style="Accent.TLabel").pack(anchor="w", pady=(2, 6))
+
+        table = ttk.Frame(frame)
+        table.pack(fill=tk.BOTH, expand=True)
+        columns = (
+            ("time", 110),
+            ("port", 70),
+            ("command", 170),
+            ("latency", 90),
+            ("bytes", 70),
+            ("status", 80),
+            ("response", 300),
+        )
+        self.sniffer_transactions_tree = ttk.Treeview(table, columns=[c for c, _w in columns], show="headings", height=12)
+        for col, width in columns:
+            self.sniffer_transactions_tree.heading(col, text="Latency (ms)" if col == "latency" else col.title())
+            self.sniffer_transactions_tree.column(col, width=width, anchor=tk.W, stretch=col == "response")
+        tree_scroll = ttk.Scrollbar(table, orient=tk.VERTICAL, command=self.sniffer_transactions_tree.yview)
+        self.sniffer_transactions_tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.sniffer_transactions_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.sniffer_transactions_tree.bind("<Double-1>", lambda _e: self._on_sniffer_transaction_selected())
+
+        bottom = ttk.Frame(frame)
+        bottom.pack(fill=tk.X, pady=(8, 0))
+        summary_cols = (("command", 110), ("count", 60), ("p50", 70), ("p95", 70), ("max", 70), ("bytes", 70), ("errors", 60), ("timeouts", 70))
+        self.sniffer_transactions_summary = ttk.Treeview(
+            bottom, columns=[c for c, _w in summary_cols], show="headings", height=6
+        )
+        for col, width in summary_cols:
+            label = f"{col} ms" if col in ("p50", "p95", "max") else col.title()
+            self.sniffer_transactions_summary.heading(col, text=label)
+            self.sniffer_transactions_summary.column(col, width=width, anchor=tk.W)
+        self.sniffer_transactions_summary.pack(side=tk.LEFT, fill=tk.Y)
+        self.sniffer_transactions_hist = tk.Canvas(
+            bottom, height=150, bg=colors["canvas"], highlightthickness=1, highlightbackground=colors["border"]
+        )
+        self.sniffer_transactions_hist.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(8, 0))
+        self.sniffer_transactions_hist.bind("<Configure>", lambda _e: self._draw_sniffer_latency_histogram())
+
+        self.sniffer_transactions = None
+        self._sniffer_transactions_shown = 0
+        win.protocol("WM_DELETE_WINDOW", self._close_sniffer_transactions)
+        self._refresh_sniffer_transactions()
+        self._refresh_sniffer_transaction_summary()
+
+    def _close_sniffer_transactions(self):
+        if self.sniffer_transactions_window is not None:
+            self.sniffer_transactions_window.destroy()
+        self.sniffer_transactions_window = None
+        self.sniffer_transactions = None
+
+    def _refresh_sniffer_transactions(self):
+        """Decode new capture chunks and update the rows that changed.
+
+        The per-command summary and latency histogram go over every
+        transaction, so they are redrawn on the diagnostics tick instead.
+        """
+        capture = self.sniffer_capture
+        if capture is None:
+            return
+        if self.sniffer_transactions is None or self.sniffer_transactions.capture is not capture:
+            self.sniffer_transactions = TransactionDecoder(capture)
+            self.sniffer_transactions_tree.delete(*self.sniffer_transactions_tree.get_children())
+            self._sniffer_transactions_shown = 0
+        first = self.sniffer_transactions.refresh()
+        if first is None and self._sniffer_transactions_shown:
+            return
+        self._show_sniffer_transaction_rows(first)
+
+    def _tick_sniffer_transactions(self):
+        """Time out unanswered commands while the capture is quiet; redraw the summary if anything changed."""
+        first = self.sniffer_transactions.expire(time.time())
+        if first is not None:
+            self._show_sniffer_transaction_rows(first)
+        if self._sniffer_transactions_dirty:
+            self._refresh_sniffer_transaction_summary()
+
+    def _show_sniffer_transaction_rows(self, first):
+        """Update transaction rows from index ``first`` on, and the status line."""
+        decoder = self.sniffer_transactions
+        tree = self.sniffer_transactions_tree
+        transactions = decoder.transactions
+        for i in range(min(first if first is not None else 0, self._sniffer_transactions_shown), len(transactions)):
+            t = transactions[i]
+            latency = t.latency_s
+            values = (
+                dt.datetime.fromtimestamp(t.time).strftime("%H:%M:%S.%f")[:-3],
+                t.port or "",
+                t.command,
+                "" if latency is None else f"{latency * 1000:.1f}",
+                t.response_bytes,
+                t.status,
+                t.response_text()[:200],
+            )
+            if i < self._sniffer_transactions_shown:
+                tree.item(str(i), values=values)
+            else:
+                tree.insert("", tk.END, iid=str(i), values=values)
+        self._sniffer_transactions_shown = len(transactions)
+        if transactions and self._sniffer_following():
+            tree.see(str(len(transactions) - 1))
+        self.sniffer_transactions_status_var.set(
+            f"{len(transactions):,} command(s), {decoder.answered:,} answered, {decoder.unsolicited:,} unsolicited RX message(s)"
+        )
+        self._sniffer_transactions_dirty = True
+
+    def _refresh_sniffer_transaction_summary(self):
+        self._sniffer_transactions_dirty = False
+        if self.sniffer_transactions is None:
+            return
+        transactions = self.sniffer_transactions.transactions
+        summary = self.sniffer_transactions_summary
+        summary.delete(*summary.get_children())
+        fmt_ms = lambda v: "" if v is None else f"{v:.1f}"  # noqa: E731
+        for row in transaction_summary(transactions):
+            summary.insert(
+                "",
+                tk.END,
+                values=(
+                    row["command"],
+                    row["count"],
+                    fmt_ms(row["p50_ms"]),
+                    fmt_ms(row["p95_ms"]),
+                    fmt_ms(row["max_ms"]),
+                    f"{row['mean_bytes']:.0f}",
+                    row["errors"],
+                    row["timeouts"],
+                ),
+            )
+        self._draw_sniffer_latency_histogram()
+
+    def _draw_sniffer_latency_histogram(self):
+        canvas = getattr(self, "sniffer_transactions_hist", None)
+        if canvas is None or self.sniffer_transactions is None:
+            return
+        self._draw_sniffer_histogram(canvas, latency_histogram(self.sniffer_transactions.transactions), "Latency (ms)")
+
+    def _draw_sniffer_histogram(self, canvas, bins, title):
+        """Bar chart of ``(bin edge ms, count)`` pairs; the last bin is open-ended."""
+        colors = self._theme_colors()
+        canvas.delete("all")
+        w = max(canvas.winfo_width(), 1)
+        h = max(canvas.winfo_height(), 1)
+        peak = max((count for _edge, count in bins), default=0) or 1
+        slot = (w - 16) / len(bins)
+        for i, (edge, count) in enumerate(bins):
+            x0 = 8 + i * slot
+            bar_h = (h - 40) * count / peak
+            canvas.create_rectangle(x0 + 2, h - 22 - bar_h, x0 + slot - 2, h - 22, fill=colors["accent"], outline="")
+            if count:
+                canvas.create_text(x0 + slot / 2, h - 26 - bar_h, text=str(count), fill=colors["fg"], anchor="s", font=("Segoe UI", 8))
+            label = f"{edge / 1000:g}s" if edge >= 1000 else f"{edge:g}"
+            if i == len(bins) - 1:
+                label = "≥" + label
+            canvas.create_text(x0 + slot / 2, h - 4, text=label, fill=colors["muted"], anchor="s", font=("Segoe UI", 8))
+        canvas.create_text(8, 4, text=title, fill=colors["muted"], anchor="nw", font=("Segoe UI", 8))
+
+    def _on_sniffer_transaction_selected(self):
+        selected = self.sniffer_transactions_tree.selection()
+        if not selected or self.sniffer_transactions is None:
+            return
+        t = self.sniffer_transactions.transactions[int(selected[0])]
+        self._sniffer_show_row(self._sniffer_row_model().row_for_offset(t.offset))
+
+    def _show_sniffer_trigger(self):
+        """Trigger conditions for keeping only the traffic around events."""
+        if self.sniffer_trigger_window is not None:
+            self.sniffer_trigger_window.lift()
+            return
+        win = tk.Toplevel(self.root)
+        self.sniffer_trigger_window = win
+        win.title("Sniffer Trigger")
+        win.resizable(False, False)
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=12)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            frame,
+            text="While armed, only traffic around trigger hits is kept; each hit is saved as its own .pcapng segment.",
+            style="Muted.TLabel",
+        ).grid(row=0, column=0, columnspan=6, sticky="w")
+        columns = (("kind", 80), ("condition", 220), ("dir", 60))
+        tree = ttk.Treeview(frame, columns=[c for c, _w in columns], show="headings", height=5)
+        for col, width in columns:
+            tree.heading(col, text=col.title())
+            tree.column(col, width=width, anchor=tk.W, stretch=col == "condition")
+        tree.grid(row=1, column=0, columnspan=6, sticky="ew", pady=(6, 6))
+
+        def show_conditions():
+            tree.delete(*tree.get_children())
+            for i, trigger in enumerate(self.sniffer_trigger_conditions):
+                what = f"{trigger.idle_s:g} s" if trigger.kind == "idle" else ("" if trigger.kind == "error" else trigger.text)
+                tree.insert("", tk.END, iid=str(i), values=(trigger.kind, what, trigger.direction or "Any"))
+
+        kind_var = tk.StringVar(value="ascii")
+        text_var = tk.StringVar(value="")
+        direction_var = tk.StringVar(value="Any")
+        idle_var = tk.StringVar(value=f"{TRIGGER_IDLE_S:g}")
+        ttk.Combobox(frame, textvariable=kind_var, values=TRIGGER_KINDS, state="readonly", width=7).grid(row=2, column=0, sticky="w")
+        ttk.Entry(frame, textvariable=text_var, width=24).grid(row=2, column=1, sticky="ew", padx=4)
+        ttk.Combobox(frame, textvariable=direction_var, values=("Any", "RX", "TX"), state="readonly", width=5).grid(
+            row=2, column=2, sticky="w"
+        )
+        ttk.Label(frame, text="Idle s:").grid(row=2, column=3, sticky="e", padx=(6, 0))
+        ttk.Entry(frame, textvariable=idle_var, width=5).grid(row=2, column=4, sticky="w", padx=4)
+
+        def add():
+            try:
+                trigger = Trigger(
+                    kind_var.get(),
+                    text_var.get(),
+                    None if direction_var.get() == "Any" else direction_var.get(),
+                    idle_s=float(idle_var.get()),
+                )
+            except ValueError as exc:
+                messagebox.showwarning("Trigger", str(exc), parent=win)
+                return
+            self.sniffer_trigger_conditions.append(trigger)
+            show_conditions()
+
+        def remove():
+            for iid in sorted((int(i) for i in tree.selection()), reverse=True):
+                del self.sniffer_trigger_conditions[iid]
+            show_conditions()
+
+        add_buttons = ttk.Frame(frame)
+        add_buttons.grid(row=2, column=5, sticky="e")
+        ttk.Button(add_buttons, text="Add", command=add, style="Toolbar.TButton").pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(add_buttons, text="Remove", command=remove, style="Toolbar.TButton").pack(side=tk.LEFT)
+
+        pre_var = tk.StringVar(value=f"{TRIGGER_PRE_BYTES // 1024}")
+        post_var = tk.StringVar(value=f"{TRIGGER_POST_S:g}")
+        ttk.Label(frame, text="Pre-trigger KB:").grid(row=3, column=0, sticky="e", pady=(8, 0))
+        ttk.Entry(frame, textvariable=pre_var, width=8).grid(row=3, column=1, sticky="w", padx=4, pady=(8, 0))
+        ttk.Label(frame, text="Post-trigger s:").grid(row=3, column=2, columnspan=2, sticky="e", pady=(8, 0))
+        ttk.Entry(frame, textvariable=post_var, width=5).grid(row=3, column=4, sticky="w", padx=4, pady=(8, 0))
+
+        self.sniffer_trigger_status_var = tk.StringVar(value="")
+        ttk.Label(frame, textvariable=self.sniffer_trigger_status_var, style="Accent.TLabel").grid(
+            row=4, column=0, columnspan=6, sticky="w", pady=(10, 0)
+        )
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=5, column=0, columnspan=6, sticky="e", pady=(10, 0))
+        ttk.Button(buttons, text="Arm", command=lambda: self._arm_sniffer_trigger(pre_var.get(), post_var.get())).pack(
+            side=tk.LEFT, padx=(0, 6)
+        )
+        ttk.Button(buttons, text="Disarm", command=self._disarm_sniffer_trigger, style="Secondary.TButton").pack(
+            side=tk.LEFT, padx=(0, 6)
+        )
+        ttk.Button(buttons, text="Close", command=self._close_sniffer_trigger, style="Secondary.TButton").pack(side=tk.LEFT)
+        win.protocol("WM_DELETE_WINDOW", self._close_sniffer_trigger)
+        show_conditions()
+        self._update_sniffer_trigger_status()
+
+    def _close_sniffer_trigger(self):
+        """Close the dialog; an armed trigger keeps running."""
+        if self.sniffer_trigger_window is not None:
+            self.sniffer_trigger_window.destroy()
+        self.sniffer_trigger_window = None
+
+    def _arm_sniffer_trigger(self, pre_kb, post_s):
+        parent = self.sniffer_trigger_window
+        if not self.sniffer_trigger_conditions:
+            messagebox.showwarning("Trigger", "Add at least one trigger condition.", parent=parent)
+            return
+        try:
+            pre_bytes = int(float(pre_kb) * 1024)
+            post_s = float(post_s)
+            if pre_bytes < 0 or post_s < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Trigger", "Enter the pre-trigger size in KB and the post-trigger time in seconds.", parent=parent)
+            return
+        capture = self.sniffer_capture
+        if capture is not None and capture.total_bytes and self.sniffer_trigger is None:
+            if not messagebox.askyesno("Trigger", "Arming clears the current capture. Continue?", parent=parent):
+                return
+        self._disarm_sniffer_trigger()
+        self._clear_sniffer()
+        self.sniffer_trigger = TriggerEngine(self.sniffer_trigger_conditions, pre_bytes=pre_bytes, post_s=post_s)
+        self.log(
+            "Sniffer trigger armed: "
+            + ", ".join(t.describe() for t in self.sniffer_trigger_conditions)
+            + f" (pre {pre_bytes // 1024} KB, post {post_s:g} s)"
+        )
+        self._update_sniffer_trigger_status()
+
+    def _disarm_sniffer_trigger(self):
+        if self.sniffer_trigger is None:
+            return
+        if self.sniffer_trigger.open:
+            self._apply_sniffer_trigger_actions([("close", self.sniffer_trigger.segments)])
+        self.log(f"Sniffer trigger disarmed: {self.sniffer_trigger.hits:,} hit(s), {self.sniffer_trigger.segments:,} segment(s)")
+        self.sniffer_trigger = None
+        self._update_sniffer_trigger_status()
+
+    def _apply_sniffer_trigger_actions(self, actions):
+        """Open/write/close trigger segment files; returns the chunks that were recorded."""
+        recorded = []
+        for action in actions:
+            if action[0] == "open":
+                _kind, number, reason = action
+                name = f"trigger_{self.session_id}_{number:03d}_{dt.datetime.now().strftime('%H%M%S')}.pcapng"
+                try:
+                    path = os.path.join(self._session_subdir("sniffer"), name)
+                    self.sniffer_trigger_writer = PcapngWriter(path)
+                    self.log(f"Trigger #{number} ({reason}): recording {path}")
+                except OSError as exc:
+                    self.sniffer_trigger_writer = None
+                    self.log(f"Trigger segment open failed: {exc}")
+            elif action[0] == "chunks":
+                recorded.extend(action[1])
+                if self.sniffer_trigger_writer is not None:
+                    try:
+                        self.sniffer_trigger_writer.write_chunks(action[1], self._sniffer_source_port())
+                        self.sniffer_trigger_writer.flush()
+                    except OSError as exc:
+                        self.log(f"Trigger segment write failed: {exc}")
+            elif action[0] == "close" and self.sniffer_trigger_writer is not None:
+                writer = self.sniffer_trigger_writer
+                self.sniffer_trigger_writer = None
+                try:
+                    writer.close()
+                except OSError:
+                    pass
+                self.log(f"Trigger segment #{action[1]} saved ({writer.packet_count:,} packets)")
+        if actions:
+            self._update_sniffer_trigger_status()
+        return recorded
+
+    def _expire_sniffer_trigger(self):
+        self._apply_sniffer_trigger_actions(self.sniffer_trigger.expire(time.time()))
+
+    def _update_sniffer_trigger_status(self):
+        if self.sniffer_trigger_window is None:
+            return
+        engine = self.sniffer_trigger
+        if engine is None:
+            self.sniffer_trigger_status_var.set("Disarmed")
+            return
+        state = f"recording segment #{engine.segments}" if engine.open else "waiting"
+        self.sniffer_trigger_status_var.set(f"Armed, {state}: {engine.hits:,} hit(s), {engine.segments:,} segment(s)")
+
+    def _show_sniffer_gaps(self):
+        """Inter-byte gap analysis of a capture recorded with precise timing."""
+        if self.sniffer_gaps_window is not None:
+            self.sniffer_gaps_window.lift()
+            return
+        colors = self._theme_colors()
+        win = tk.Toplevel(self.root)
+        self.sniffer_gaps_window = win
+        win.title("Sniffer Timing Gaps")
+        win.geometry("820x600")
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            frame,
+            text="Needs ports sniffed with 'Precise timing' on. Gaps are measured between reads, less the time the bytes took on the wire.",
+            style="Muted.TLabel",
+        ).pack(anchor="w")
+        params = ttk.Frame(frame)
+        params.pack(fill=tk.X, pady=(6, 6))
+        baud_var = tk.StringVar(value=str(self.sniffer_baud_var.get()))
+        bits_var = tk.StringVar(value=str(CHAR_GAP_BITS))
+        idle_var = tk.StringVar(value=f"{IDLE_GAP_S * 1000:g}")
+        self.sniffer_gaps_kind_var = tk.StringVar(value="char")
+        ttk.Label(params, text="Baud:").pack(side=tk.LEFT)
+        ttk.Combobox(params, textvariable=baud_var, values=BAUD_OPTIONS, width=8).pack(side=tk.LEFT, padx=(4, 10))
+        ttk.Label(params, text="Char gap > bit-times:").pack(side=tk.LEFT)
+        ttk.Entry(params, textvariable=bits_var, width=5).pack(side=tk.LEFT, padx=(4, 10))
+        ttk.Label(params, text="Idle ≥ ms:").pack(side=tk.LEFT)
+        ttk.Entry(params, textvariable=idle_var, width=6).pack(side=tk.LEFT, padx=(4, 10))
+        ttk.Button(
+            params,
+            text="Analyze",
+            command=lambda: self._refresh_sniffer_gaps(baud_var.get(), bits_var.get(), idle_var.get()),
+        ).pack(side=tk.LEFT)
+        self.sniffer_gaps_status_var = tk.StringVar(value="")
+        ttk.Label(frame, textvariable=self.sniffer_gaps_status_var, style="Accent.TLabel").pack(anchor="w", pady=(0, 6))
+
+        table = ttk.Frame(frame)
+        table.pack(fill=tk.BOTH, expand=True)
+        columns = (("time", 110), ("port", 80), ("dir", 50), ("kind", 90), ("gap", 90), ("bits", 90))
+        self.sniffer_gaps_tree = ttk.Treeview(table, columns=[c for c, _w in columns], show="headings", height=10)
+        for col, width in columns:
+            label = {"gap": "Gap (ms)", "bits": "Bit-times", "dir": "Dir"}.get(col, col.title())
+            self.sniffer_gaps_tree.heading(col, text=label)
+            self.sniffer_gaps_tree.column(col, width=width, anchor=tk.W)
+        tree_scroll = ttk.Scrollbar(table, orient=tk.VERTICAL, command=self.sniffer_gaps_tree.yview)
+        self.sniffer_gaps_tree.configure(yscrollcommand=tree_scroll.set)
+        tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.sniffer_gaps_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.sniffer_gaps_tree.bind("<Double-1>", lambda _e: self._on_sniffer_gap_selected())
+
+        bottom = ttk.Frame(frame)
+        bottom.pack(fill=tk.X, pady=(8, 0))
+        summary_cols = (("kind", 90), ("count", 70), ("p50", 70), ("p95", 70), ("max", 80))
+        self.sniffer_gaps_summary = ttk.Treeview(bottom, columns=[c for c, _w in summary_cols], show="headings", height=4)
+        for col, width in summary_cols:
+            self.sniffer_gaps_summary.heading(col, text=f"{col} ms" if col in ("p50", "p95", "max") else col.title())
+            self.sniffer_gaps_summary.column(col, width=width, anchor=tk.W)
+        self.sniffer_gaps_summary.pack(side=tk.LEFT, fill=tk.Y)
+        hist_frame = ttk.Frame(bottom)
+        hist_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(8, 0))
+        kind_combo = ttk.Combobox(
+            hist_frame,
+            textvariable=self.sniffer_gaps_kind_var,
+            values=["all"] + list(GAP_KIND_NAMES.values()),
+            state="readonly",
+            width=11,
+        )
+        kind_combo.pack(anchor="e")
+        kind_combo.bind("<<ComboboxSelected>>", lambda _e: self._draw_sniffer_gap_histogram())
+        self.sniffer_gaps_hist = tk.Canvas(
+            hist_frame, height=140, bg=colors["canvas"], highlightthickness=1, highlightbackground=colors["border"]
+        )
+        self.sniffer_gaps_hist.pack(fill=tk.BOTH, expand=True)
+        self.sniffer_gaps_hist.bind("<Configure>", lambda _e: self._draw_sniffer_gap_histogram())
+
+        self.sniffer_gaps = None
+        win.protocol("WM_DELETE_WINDOW", self._close_sniffer_gaps)
+        self._refresh_sniffer_gaps(baud_var.get(), bits_var.get(), idle_var.get())
+
+    def _close_sniffer_gaps(self):
+        if self.sniffer_gaps_window is not None:
+            self.sniffer_gaps_window.destroy()
+        self.sniffer_gaps_window = None
+        self.sniffer_gaps = None
+
+    def _refresh_sniffer_gaps(self, baud, char_bits, idle_ms):
+        """Find the gaps in the current capture and fill the table, summary and histogram."""
+        try:
+            baud = int(baud)
+            char_bits = float(char_bits)
+            idle_s = float(idle_ms) / 1000.0
+            if baud <= 0:
+                raise ValueError(baud)
+        except ValueError:
+            messagebox.showwarning("Timing Gaps", "Enter a baud rate, a bit-time limit and an idle time in ms.", parent=self.sniffer_gaps_window)
+            return
+        capture = self.sniffer_capture
+        tree = self.sniffer_gaps_tree
+        tree.delete(*tree.get_children())
+        summary = self.sniffer_gaps_summary
+        summary.delete(*summary.get_children())
+        if capture is None or not len(capture.timing_rows()):
+            self.sniffer_gaps = None
+            self.sniffer_gaps_status_var.set("No precise timing in this capture.")
+            self._draw_sniffer_gap_histogram()
+            return
+        gaps = find_gaps(capture, baud, char_gap_bits=char_bits, idle_s=idle_s)
+        self.sniffer_gaps = gaps
+        # Longest first; the rest are still counted in the summary and histogram.
+        shown = np.argsort(gaps["gap_s"], kind="stable")[::-1][:SNIFFER_GAPS_SHOWN]
+        for i in shown.tolist():
+            gap = gaps[i]
+            port, direction, kind = describe_gap(gap, capture.ports)
+            tree.insert(
+                "",
+                tk.END,
+                iid=str(i),
+                values=(
+                    dt.datetime.fromtimestamp(float(gap["time"])).strftime("%H:%M:%S.%f")[:-3],
+                    port,
+                    direction,
+                    kind,
+                    f"{gap['gap_s'] * 1000:.3f}",
+                    f"{gap['bits']:.0f}",
+                ),
+            )
+        fmt_ms = lambda v: "" if v is None else f"{v:.3f}"  # noqa: E731
+        for row in gap_summary(gaps):
+            summary.insert(
+                "", tk.END, values=(row["kind"], row["count"], fmt_ms(row["p50_ms"]), fmt_ms(row["p95_ms"]), fmt_ms(row["max_ms"]))
+            )
+        self.sniffer_gaps_status_var.set(
+            f"{len(capture.timing_rows()):,} timed read(s), {len(gaps):,} gap(s)"
+            + (f"; longest {len(shown):,} listed" if len(gaps) > len(shown) else "")
+        )
+        self._draw_sniffer_gap_histogram()
+
+    def _draw_sniffer_gap_histogram(self):
+        canvas = getattr(self, "sniffer_gaps_hist", None)
+        if canvas is None or self.sniffer_gaps_window is None:
+            return
+        if self.sniffer_gaps is None:
+            canvas.delete("all")
+            return
+        name = self.sniffer_gaps_kind_var.get()
+        kind = next((code for code, kind_name in GAP_KIND_NAMES.items() if kind_name == name), None)
+        self._draw_sniffer_histogram(canvas, gap_histogram(self.sniffer_gaps, kind), "Gap (ms)")
+
+    def _on_sniffer_gap_selected(self):
+        selected = self.sniffer_gaps_tree.selection()
+        if not selected or self.sniffer_gaps is None:
+            return
+        offset = int(self.sniffer_gaps[int(selected[0])]["offset"])
+        self._sniffer_show_row(self._sniffer_row_model().row_for_offset(offset))
+
+    def _show_sniffer_replay(self):
+        """Replay the capture (or a saved .pcapng) into a serial or virtual port."""
+        if self.sniffer_replay_window is not None:
+            self.sniffer_replay_window.lift()
+            return
+        win = tk.Toplevel(self.root)
+        self.sniffer_replay_window = win
+        win.title("Replay Capture")
+        win.resizable(False, False)
+        win.transient(self.root)
+        frame = ttk.Frame(win, padding=12)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        source_var = tk.StringVar(value="capture")
+        file_var = tk.StringVar(value="")
+        port_var = tk.StringVar(value=self.bridge_virtual_port_var.get().strip().split(" ")[0])
+        baud_var = tk.StringVar(value=str(self.sniffer_baud_var.get()))
+        direction_var = tk.StringVar(value="RX")
+        speed_var = tk.StringVar(value="1")
+        answer_var = tk.BooleanVar(value=False)
+        self.sniffer_replay_status_var = tk.StringVar(
+            value="Speed multiplies the recorded timing; 'max' sends back to back."
+        )
+
+        ttk.Radiobutton(frame, text="Current capture", variable=source_var, value="capture").grid(
+            row=0, column=0, columnspan=2, sticky="w"
+        )
+        ttk.Radiobutton(frame, text="pcapng file:", variable=source_var, value="file").grid(row=1, column=0, sticky="w")
+        ttk.Entry(frame, textvariable=file_var, width=32).grid(row=1, column=1, columnspan=2, sticky="ew", padx=4)
+
+        def browse():
+            path = filedialog.askopenfilename(
+                parent=win, filetypes=[("pcapng capture", "*.pcapng"), ("All files", "*.*")], title="Replay Capture"
+            )
+            if path:
+                file_var.set(path)
+                source_var.set("file")
+
+        ttk.Button(frame, text="Browse...", command=browse, style="Toolbar.TButton").grid(row=1, column=3, sticky="w")
+        ttk.Label(frame, text="Replay into:").grid(row=2, column=0, sticky="e", pady=(8, 0))
+        ttk.Combobox(frame, textvariable=port_var, values=[p.device for p in list_ports.comports()], width=16).grid(
+            row=2, column=1, sticky="w", padx=(4, 0), pady=(8, 0)
+        )
+        ttk.Label(frame, text="Baud:").grid(row=2, column=2, sticky="e", pady=(8, 0))
+        ttk.Combobox(frame, textvariable=baud_var, values=BAUD_OPTIONS, width=8).grid(
+            row=2, column=3, sticky="w", pady=(8, 0)
+        )
+        ttk.Label(frame, text="Send:").grid(row=3, column=0, sticky="e", pady=(6, 0))
+        ttk.Combobox(frame, textvariable=direction_var, values=("RX", "TX", "All"), state="readonly", width=6).grid(
+            row=3, column=1, sticky="w", padx=(4, 0), pady=(6, 0)
+        )
+        ttk.Label(frame, text="Speed:").grid(row=3, column=2, sticky="e", pady=(6, 0))
+        ttk.Combobox(frame, textvariable=speed_var, values=("1", "2", "10", "100", "max"), width=8).grid(
+            row=3, column=3, sticky="w", pady=(6, 0)
+        )
+        ttk.Checkbutton(
+            frame, text="Answer commands (wait for each host command, then send the recorded reply)", variable=answer_var
+        ).grid(row=4, column=0, columnspan=4, sticky="w", pady=(6, 0))
+        self.sniffer_replay_progress = ttk.Progressbar(frame, mode="determinate", maximum=100, length=360)
+        self.sniffer_replay_progress.grid(row=5, column=0, columnspan=4, sticky="ew", pady=(10, 4))
+        ttk.Label(frame, textvariable=self.sniffer_replay_status_var, style="Muted.TLabel").grid(
+            row=6, column=0, columnspan=4, sticky="w"
+        )
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=7, column=0, columnspan=4, sticky="e", pady=(10, 0))
+        self.sniffer_replay_button = ttk.Button(
+            buttons,
+            text="Start",
+            command=lambda: self._start_sniffer_replay(
+                source_var.get(),
+                file_var.get().strip(),
+                port_var.get().strip().split(" ")[0],
+                baud_var.get(),
+                direction_var.get(),
+                speed_var.get(),
+                answer_var.get(),
+            ),
+        )
+        self.sniffer_replay_button.pack(side=tk.LEFT, padx=(0, 6))
+        ttk.Button(buttons, text="Stop", command=self._stop_sniffer_replay, style="Secondary.TButton").pack(
+            side=tk.LEFT, padx=(0, 6)
+        )
+        ttk.Button(buttons, text="Close", command=self._close_sniffer_replay, style="Secondary.TButton").pack(side=tk.LEFT)
+        win.protocol("WM_DELETE_WINDOW", self._close_sniffer_replay)
+
+    def _start_sniffer_replay(self, source, path, port, baud, direction, speed, answer):
+        if self._sniffer_replay_stop is not None:
+            return
+        parent = self.sniffer_replay_window
+        try:
+            baud = int(baud)
+            speed = 0.0 if speed.strip().lower() in ("max", "0") else float(speed.strip().rstrip("x×"))
+            if speed < 0:
+                raise ValueError(speed)
+        except ValueError:
+            messagebox.showwarning("Replay", "Enter a baud rate and a speed (e.g. 1, 10 or max).", parent=parent)
+            return
+        if not port:
+            messagebox.showwarning("Replay", "Choose the port to replay into.", parent=parent)
+            return
+        capture = self.sniffer_capture
+        if source == "capture" and (capture is None or not capture.total_bytes):
+            messagebox.showinfo("Replay", "The capture is empty.", parent=parent)
+            return
+        if source == "file" and not os.path.isfile(path):
+            messagebox.showwarning("Replay", "Choose a .pcapng file to replay.", parent=parent)
+            return
+        capture_port = self.sniffer_port_filter_var.get()
+        capture_port = None if capture_port in ("", "All") else capture_port
+        direction = None if direction == "All" else direction
+        stop = threading.Event()
+        self._sniffer_replay_stop = stop
+        self.sniffer_replay_button.configure(state=tk.DISABLED)
+        self.sniffer_replay_progress.configure(value=0)
+        self.sniffer_replay_status_var.set(f"Replaying into {port}...")
+
+        def worker():
+            ser = None
+            try:
+                if source == "capture":
+                    chunks = capture_chunks(capture, capture_port)
+                else:
+                    chunks = read_pcapng(path)
+                    if capture_port is not None:
+                        chunks = [c for c in chunks if c[3] == capture_port]
+                ser = serial.Serial(port=port, baudrate=baud, timeout=0.1, write_timeout=5.0)
+                stats = replay(
+                    chunks,
+                    ser,
+                    stop,
+                    direction=direction,
+                    speed=speed,
+                    answer=answer,
+                    progress=lambda st: self._ui_post(
+                        "sniffer_replay_progress", stop, st.chunks, st.total_chunks, st.commands
+                    ),
+                )
+            except Exception as exc:
+                self._ui_post("sniffer_replay_done", stop, port, None, str(exc))
+                return
+            finally:
+                if ser is not None:
+                    try:
+                        ser.close()
+                    except Exception:
+                        pass
+            self._ui_post("sniffer_replay_done", stop, port, stats, None)
+
+        threading.Thread(target=worker, daemon=True).start()
+        rate = "max speed" if not speed else f"{speed:g}x"
+        self.log(f"Replay into {port} started ({rate}{', answering commands' if answer else ''})")
+
+    def _stop_sniffer_replay(self):
+        if self._sniffer_replay_stop is not None:
+            self._sniffer_replay_stop.set()
+
+    def _close_sniffer_replay(self):
+        self._stop_sniffer_replay()
+        if self.sniffer_replay_window is not None:
+            self.sniffer_replay_window.destroy()
+            self.sniffer_replay_window = None
+
+    def _on_sniffer_replay_progress(self, stop, chunks, total, commands):
+        if stop is not self._sniffer_replay_stop or self.sniffer_replay_window is None:
+            return
+        self.sniffer_replay_progress.configure(value=chunks * 100 / max(total, 1))
+        answered = f", {commands:,} command(s) answered" if commands else ""
+        self.sniffer_replay_status_var.set(f"Sent {chunks:,} / {total:,} chunks{answered}")
+
+    def _on_sniffer_replay_done(self, stop, port, stats, error):
+        if stop is self._sniffer_replay_stop:
+            self._sniffer_replay_stop = None
+        if error is not None:
+            text = f"Replay failed: {error}"
+        else:
+            text = (
+                f"Replay {'stopped' if stop.is_set() else 'finished'}: {stats.chunks:,} chunks, "
+                f"{stats.bytes:,} bytes, worst lag {stats.max_late_s * 1000:.1f} ms"
+            )
+        self.log(f"{text} ({port})")
+        if self.sniffer_replay_window is not None:
+            self.sniffer_replay_button.configure(state=tk.NORMAL)
+            self.sniffer_replay_status_var.set(text)
 
     def _copy_sniffer(self):
-        """Copy sniffer output to clipboard."""
-        content = self.sniffer_text.get("1.0", tk.END).strip()
+        """Copy the selected (or else the visible) sniffer rows to the clipboard."""
+        try:
+            content = self.sniffer_text.get(tk.SEL_FIRST, tk.SEL_LAST).strip()
+        except tk.TclError:
+            content = self.sniffer_text.get("1.0", tk.END).strip()
         if not content:
             return
         self.root.clipboard_clear()
@@ -4764,19 +6467,20 @@ exit /b 0
             
             self.bridge_mode = True
             self.bridge_stop_event.clear()
-            self.sniffer_byte_offset = 0
-            self.sniffer_buffer.clear()
-            self._clear_sniffer()
+            for latency in self.bridge_latency.values():
+                latency.reset()
+            if not self.sniffer_running:
+                self._clear_sniffer()
             
             # Start bidirectional forwarding threads
             self.bridge_thread_rx = threading.Thread(
                 target=self._bridge_forward_loop,
-                args=(self.bridge_real_serial, self.bridge_virtual_serial, "RX"),
+                args=(self.bridge_real_serial, self.bridge_virtual_serial, "RX", real_port),
                 daemon=True
             )
             self.bridge_thread_tx = threading.Thread(
                 target=self._bridge_forward_loop,
-                args=(self.bridge_virtual_serial, self.bridge_real_serial, "TX"),
+                args=(self.bridge_virtual_serial, self.bridge_real_serial, "TX", real_port),
                 daemon=True
             )
             self.bridge_thread_rx.start()
@@ -4829,43 +6533,45 @@ exit /b 0
         self.bridge_virtual_combo.configure(state="normal")
         self.sniffer_start_btn.configure(state=tk.NORMAL)
         self.sniffer_mirror_btn.configure(state=tk.NORMAL)
-        self.sniffer_status_var.set("● Stopped")
-        self.sniffer_status_label.configure(style="Muted.TLabel")
+        self._update_sniffer_status()
         self.bridge_status_var.set("")
         
         self.log("Bridge stopped")
 
-    def _bridge_forward_loop(self, source: serial.Serial, dest: serial.Serial, direction: str):
+    def _bridge_forward_loop(self, source: serial.Serial, dest: serial.Serial, direction: str, port: str):
         """Forward data from source to dest while logging to sniffer.
         
         Args:
             source: Serial port to read from
             dest: Serial port to write to
             direction: 'RX' (real→virtual, device responses) or 'TX' (virtual→real, app commands)
+            port: Real device port, labelling the traffic in the capture
         """
-        while not self.bridge_stop_event.is_set() and self.bridge_mode:
-            try:
-                if source and source.is_open:
-                    data = source.read(256)
-                    if data:
-                        # Forward to destination
-                        if dest and dest.is_open:
-                            dest.write(data)
-                        
-                        # Log to sniffer display
-                        timestamp = dt.datetime.now()
-                        self.sniffer_buffer.append((timestamp, data, direction))
-                        
-                        # Check direction filter
-                        dir_filter = self.sniffer_direction_var.get()
-                        if dir_filter == "both" or dir_filter == direction.lower():
-                            self.root.after(0, lambda d=data, t=timestamp, dr=direction: 
-                                self._append_sniffer_data(d, t, direction=dr))
-            except serial.SerialException:
-                self.root.after(0, self._stop_bridge)
-                break
-            except Exception:
-                pass
+        try:
+            # The sniffer only sees the data after it has been written on.
+            forward_loop(
+                source,
+                dest,
+                self.bridge_stop_event,
+                on_data=lambda data, epoch: self._ui_post("sniffer_data", data, epoch, direction, port),
+                latency=self.bridge_latency[direction],
+            )
+        except Exception:
+            # Closing the ports on stop also ends up here.
+            if not self.bridge_stop_event.is_set():
+                self._ui_post("bridge_stop")
+
+    def _refresh_bridge_latency(self):
+        """Show the time each direction spends inside the bridge (read returned -> write returned)."""
+        parts = []
+        for direction in ("TX", "RX"):
+            st = self.bridge_latency[direction].summary()
+            if st["count"]:
+                parts.append(f"{direction} {st['p50_us']:.0f}/{st['p99_us']:.0f}/{st['max_us']:.0f} µs")
+        text = "Bridging active"
+        if parts:
+            text += "  |  added p50/p99/max: " + ", ".join(parts)
+        self.bridge_status_var.set(text)
 
     def _show_bridge_help(self):
         """Show help dialog for com0com bridge mode."""
@@ -4910,27 +6616,7 @@ or use the Setup GUI to create custom port pairs."""
 
     def _format_console_payload(self, payload):
         raw = payload if isinstance(payload, (bytes, bytearray)) else str(payload).encode("utf-8", errors="replace")
-        mode = self.console_display_mode_var.get()
-        if mode == "hex":
-            return " ".join(f"{b:02X}" for b in raw)
-        if mode == "dec":
-            return " ".join(str(b) for b in raw)
-        if mode == "bin":
-            return " ".join(f"{b:08b}" for b in raw)
-
-        out = []
-        for b in raw:
-            if 32 <= b <= 126:
-                out.append(chr(b))
-            elif b == 13:
-                out.append("<CR>")
-            elif b == 10:
-                out.append("<LF>")
-            elif b == 9:
-                out.append("<TAB>")
-            else:
-                out.append(f"<0x{b:02X}>")
-        return "".join(out)
+        return format_bytes(raw, self.console_display_mode)
 
     def _read_debug_line(self, ser, port=None):
         raw = ser.readline()
@@ -4992,7 +6678,7 @@ or use the Setup GUI to create custom port pairs."""
             return
         if not port:
             return
-        self.live_run_series_by_port[port] = {field: [] for field in self.live_plot_fields.values()}
+        self.live_run_series_by_port[port] = self._new_live_series()
         self.live_run_total_samples_by_port[port] = int(total_samples)
         self.live_run_serial_by_port[port] = serial_number or self.live_run_serial_by_port.get(port, "")
         self._ensure_live_port_color(port)
@@ -5000,36 +6686,48 @@ or use the Setup GUI to create custom port pairs."""
         self._update_live_samples_label()
         self.refresh_live_plot()
 
-    def append_live_run_sample(self, sample_idx, sample, port=None):
-        if threading.current_thread() is not threading.main_thread():
-            self._ui_post("append_live_run_sample", sample_idx, sample, port=port)
-            return
-        if not port:
+    def _drain_live_samples(self):
+        """Feed the live view from its sample bus queue (once per UI tick, after queued UI events)."""
+        sub = self._live_sample_sub
+        batch = []
+        for message in sub.drain():
+            if batch and (isinstance(message, RunStarted) or message.port != batch[-1].port):
+                self._append_live_run_samples(batch[-1].port, batch)
+                batch = []
+            if isinstance(message, RunStarted):
+                self.clear_live_run_view(message.total, port=message.port, serial_number=message.serial)
+            else:
+                batch.append(message)
+        if batch:
+            self._append_live_run_samples(batch[-1].port, batch)
+        if sub.dropped != self._live_samples_dropped:
+            self.log(f"Live view fell behind: {sub.dropped - self._live_samples_dropped:,} sample(s) not shown")
+            self._live_samples_dropped = sub.dropped
+
+    def _append_live_run_samples(self, port, samples):
+        """Append :class:`Sample` messages for one port; redraw is deferred to the plot tick."""
+        if not port or not samples:
             return
         if port not in self.live_run_series_by_port:
-            self.live_run_series_by_port[port] = {field: [] for field in self.live_plot_fields.values()}
+            self.live_run_series_by_port[port] = self._new_live_series()
         self._ensure_live_port_color(port)
-        parsed = sample["parsed"]
-        for field in self.live_run_series_by_port[port]:
-            self.live_run_series_by_port[port][field].append(parsed.get(field, np.nan))
-        self.update_live_std_label()
-
-        serial_label = f"[{port}]" if port else "[NO-PORT]"
-        preview_items = []
-        for key in list(self.live_plot_fields.values())[:6]:
-            preview_items.append(f"{key}={self.fmt(parsed.get(key, np.nan))}")
-        preview = " ".join(preview_items) if preview_items else "(no live fields selected)"
-        line = (
-            f"{serial_label} sample {sample_idx}/{self.live_run_total_samples_by_port.get(port, 0)} "
-            f"{preview} "
-            f"raw={sample['raw']}\n"
-        )
+        port_series = self.live_run_series_by_port[port]
+        preview_keys = list(self.live_plot_fields.values())[:6]
+        total = self.live_run_total_samples_by_port.get(port, 0)
+        lines = []
+        for sample in samples:
+            parsed = sample.parsed
+            for field in port_series:
+                port_series[field].append(parsed.get(field, np.nan))
+            preview_items = [f"{key}={self.fmt(parsed.get(key, np.nan))}" for key in preview_keys]
+            preview = " ".join(preview_items) if preview_items else "(no live fields selected)"
+            lines.append(f"[{port}] sample {sample.idx}/{total} {preview} raw={sample.raw}\n")
         self.live_text.configure(state=tk.NORMAL)
-        self.live_text.insert(tk.END, line)
+        self.live_text.insert(tk.END, "".join(lines))
         self.live_text.see(tk.END)
         self.live_text.configure(state=tk.DISABLED)
         self._update_live_samples_label()
-        self.refresh_live_plot()
+        self._schedule_live_plot_refresh()
 
     def _on_live_field_changed(self, _event=None):
         self.update_live_std_label()
@@ -5037,17 +6735,20 @@ or use the Setup GUI to create custom port pairs."""
 
     def update_live_std_label(self):
         current_field = self.live_plot_fields.get(self.live_field_var.get(), next(iter(self.live_plot_fields.values())))
+        series_by_port = {
+            port: fields[current_field]
+            for port, fields in sorted(self.live_run_series_by_port.items())
+            if current_field in fields
+        }
+        # Only recompute when the field or the sample counts changed.
+        key = (self.live_field_var.get(), tuple((port, id(series), len(series)) for port, series in series_by_port.items()))
+        if key == self._live_std_key:
+            return
+        self._live_std_key = key
         parts = []
-        for port in sorted(self.live_run_series_by_port.keys()):
-            vals = np.array(
-                [v for v in self.live_run_series_by_port[port].get(current_field, []) if np.isfinite(v)],
-                dtype=float,
-            )
-            if len(vals) >= 2:
-                std_val = float(np.std(vals, ddof=1))
-            elif len(vals) == 1:
-                std_val = 0.0
-            else:
+        for port, series in series_by_port.items():
+            std_val = series.std(0, len(series))
+            if not np.isfinite(std_val):
                 continue
             parts.append(f"{port}={self.fmt(std_val)}")
         if parts:
@@ -5055,58 +6756,156 @@ or use the Setup GUI to create custom port pairs."""
         else:
             self.live_std_var.set(f"Std Dev ({self.live_field_var.get()}): n/a")
 
+    def _new_live_series(self):
+        return {field: MinMaxPyramid() for field in self.live_plot_fields.values()}
+
+    def _live_view_bounds(self, max_n):
+        """Visible sample-index range (0-based, inclusive) for the live plot."""
+        if self.live_view_range is not None:
+            return self.live_view_range
+        x_start = self._to_int_or_none(self.live_x_start_var.get())
+        x_end_cfg = self._to_int_or_none(self.live_x_end_var.get())
+        x_start = max(1, x_start if x_start is not None else 1)
+        x_end_cfg = x_end_cfg if x_end_cfg is not None else 0
+        x1 = max_n - 1
+        if x_end_cfg > 0:
+            x1 = min(x1, x_end_cfg - 1)
+        return float(x_start - 1), float(x1)
+
+    def _schedule_live_plot_refresh(self):
+        """Coalesce redraw requests from streaming samples into one per tick."""
+        if self._live_refresh_after_id is not None:
+            return
+        self._live_refresh_after_id = self.root.after(LIVE_PLOT_REFRESH_MS, self._run_scheduled_live_refresh)
+
+    def _run_scheduled_live_refresh(self):
+        self._live_refresh_after_id = None
+        self.update_live_std_label()
+        self.refresh_live_plot()
+
+    def _live_grid_field_items(self):
+        """(label, key) pairs shown as small multiples, in live_plot_fields order."""
+        items = list(self.live_plot_fields.items())
+        if self.live_grid_fields:
+            chosen = [(label, key) for label, key in items if key in self.live_grid_fields]
+            if chosen:
+                return chosen
+        return items
+
     def refresh_live_plot(self):
         if not hasattr(self, "live_canvas"):
             return
         c = self.live_canvas
         c.delete("all")
+        self._live_plot_panels = []
         width = max(int(c.winfo_width()), 240)
         height = max(int(c.winfo_height()), 160)
 
-        left = 52
-        right = width - 16
-        top = 20
-        bottom = height - 34
-        c.create_rectangle(left, top, right, bottom, outline=DARK_BORDER)
-
-        field_label = self.live_field_var.get()
-        field = self.live_plot_fields.get(field_label, next(iter(self.live_plot_fields.values())))
-        x_start = self._to_int_or_none(self.live_x_start_var.get())
-        x_end_cfg = self._to_int_or_none(self.live_x_end_var.get())
-        x_start = max(1, x_start if x_start is not None else 1)
-        x_end_cfg = x_end_cfg if x_end_cfg is not None else 0
-        series_by_port = {}
+        port_series = {}
         for port, d in self.live_run_series_by_port.items():
             if self.live_visible_only_var.get() and self.live_visible_ports and port not in self.live_visible_ports:
                 continue
-            vals = np.array([v if np.isfinite(v) else np.nan for v in d.get(field, [])], dtype=float)
-            if len(vals) >= x_start:
-                vals = vals[x_start - 1 :]
-            else:
-                vals = np.array([], dtype=float)
-            if x_end_cfg > 0:
-                vals = vals[: max(0, x_end_cfg - x_start + 1)]
-            finite_idx = np.where(np.isfinite(vals))[0]
-            series_by_port[port] = (vals, finite_idx)
+            port_series[port] = d
+        max_n = max((len(s) for d in port_series.values() for s in d.values()), default=0)
+        x0, x1 = self._live_view_bounds(max_n)
+        raster = RasterImage(width, height, DARK_CANVAS) if self.live_raster_var.get() else None
+        zoom_note = "  [zoomed]" if self.live_view_range is not None else ""
+
+        if self.live_grid_var.get():
+            self._draw_live_grid(c, raster, width, height, port_series, x0, x1, max_n, zoom_note)
+        else:
+            field_label = self.live_field_var.get()
+            field = self.live_plot_fields.get(field_label, next(iter(self.live_plot_fields.values())))
+            left, right, top, bottom = 52, width - 16, 20, height - 34
+            c.create_text((left + right) // 2, 8, text=f"{field_label} vs Sample Count{zoom_note}", fill=DARK_TEXT)
+            c.create_text((left + right) // 2, height - 10, text="Sample Count", fill=DARK_TEXT)
+            c.create_text(14, (top + bottom) // 2, text=self._field_label_with_unit(field, "Value"), angle=90, fill=DARK_TEXT)
+            # One bucket per horizontal pixel: the pyramid keeps this bounded at any zoom level.
+            geom, legend_items = self._draw_live_panel(
+                c, raster, (left, top, right, bottom), field, port_series, x0, x1, max_n, budget=right - left
+            )
+            if geom is not None:
+                c.create_text(left, bottom + 14, text=f"{x0 + 1:.0f}", anchor="w", fill=DARK_MUTED)
+                c.create_text(right, bottom + 14, text=f"{x1 + 1:.0f}", anchor="e", fill=DARK_MUTED)
+                self._draw_live_legend(c, right, top, legend_items)
+
+        if raster is not None:
+            self._blit_raster(c, raster, 0, 0)
+        if self._live_hover_xy is not None:
+            self._draw_live_hover(*self._live_hover_xy)
+
+    def _draw_live_grid(self, c, raster, width, height, port_series, x0, x1, max_n, zoom_note):
+        """Small multiples: one panel per live field, every visible port overlaid."""
+        fields = self._live_grid_field_items()
+        n = len(fields)
+        cols = max(1, int(np.ceil(np.sqrt(n))))
+        rows = max(1, int(np.ceil(n / cols)))
+        header_h = 18
+        footer_h = 18
+        gap_x = 48
+        gap_y = 8
+        cell_w = (width - 8) / cols
+        cell_h = (height - header_h - footer_h) / rows
+
+        c.create_text(8, 9, text=f"All fields vs Sample Count{zoom_note}", anchor="w", fill=DARK_TEXT)
+        lx = width - 8
+        for port in sorted(port_series.keys(), reverse=True):
+            item = c.create_text(lx, 9, text=port, anchor="e", fill=self._ensure_live_port_color(port))
+            bbox = c.bbox(item)
+            lx = (bbox[0] if bbox else lx - 8 * len(port)) - 10
+        c.create_text(gap_x, height - 9, text=f"{x0 + 1:.0f}", anchor="w", fill=DARK_MUTED)
+        c.create_text(width - 8, height - 9, text=f"{x1 + 1:.0f}", anchor="e", fill=DARK_MUTED)
+
+        for i, (label, key) in enumerate(fields):
+            row, col = divmod(i, cols)
+            left = int(8 + col * cell_w + gap_x)
+            right = int(8 + (col + 1) * cell_w - 8)
+            top = int(header_h + row * cell_h + gap_y)
+            bottom = int(header_h + (row + 1) * cell_h - gap_y)
+            if right - left < 24 or bottom - top < 24:
+                continue
+            # Split the single-view bucket budget across rows so the grid costs
+            # about the same per frame as one full-width plot.
+            budget = max((right - left) // rows, LIVE_GRID_MIN_BUCKETS)
+            self._draw_live_panel(c, raster, (left, top, right, bottom), key, port_series, x0, x1, max_n, budget, title=label)
+
+    def _draw_live_panel(self, c, raster, box, field, port_series, x0, x1, max_n, budget, title=None):
+        """Draw one field's traces into ``box``; returns (hover geometry, legend items)."""
+        left, top, right, bottom = box
+        c.create_rectangle(left, top, right, bottom, outline=DARK_BORDER)
+        if title:
+            c.create_text(left + 6, top + 4, text=self._field_label_with_unit(field, title), anchor="nw", fill=DARK_TEXT_SUB)
+        series_by_port = {}
+        for port, d in port_series.items():
+            series = d.get(field)
+            if series is not None:
+                series_by_port[port] = series
         scale_factor = self._field_scale_factor(field)
-        c.create_text((left + right) // 2, 8, text=f"{field_label} vs Sample Count", fill=DARK_TEXT)
-        c.create_text((left + right) // 2, height - 10, text="Sample Count", fill=DARK_TEXT)
-        c.create_text(14, (top + bottom) // 2, text=self._field_label_with_unit(field, "Value"), angle=90, fill=DARK_TEXT)
-
-        all_y = []
-        max_n = 0
-        for vals, finite_idx in series_by_port.values():
-            if len(vals) > max_n:
-                max_n = len(vals)
-            if len(finite_idx) > 0:
-                all_y.extend((vals[finite_idx] * scale_factor).tolist())
-        if len(all_y) == 0:
+
+        summaries = {}
+        y_lo = []
+        y_hi = []
+        if max_n > 0 and x1 >= x0:
+            for port, series in series_by_port.items():
+                xs, mins, maxs, level = series.query(x0, x1 + 1, max(int(budget), 1))
+                if len(xs) == 0:
+                    continue
+                mins = mins * scale_factor
+                maxs = maxs * scale_factor
+                finite = np.isfinite(mins) & np.isfinite(maxs)
+                if not finite.any():
+                    continue
+                summaries[port] = (xs[finite], mins[finite], maxs[finite], level)
+                y_lo.append(float(np.min(mins[finite])))
+                y_hi.append(float(np.max(maxs[finite])))
+        if not summaries:
             c.create_text((left + right) // 2, (top + bottom) // 2, text="Collecting samples...", fill=DARK_MUTED)
-            return
+            return None, []
 
-        y_min = float(np.min(np.array(all_y, dtype=float)))
-        y_max = float(np.max(np.array(all_y, dtype=float)))
-        if self.live_autoscale_var.get():
+        y_min = min(y_lo)
+        y_max = max(y_hi)
+        # Manual Y limits are per-field, so small multiples always autoscale.
+        if self.live_autoscale_var.get() or title:
             if y_min == y_max:
                 pad = abs(y_min) * 0.01 if y_min != 0 else 0.01
                 y_min -= pad
@@ -5121,54 +6920,184 @@ or use the Setup GUI to create custom port pairs."""
             if y_min_cfg is not None and y_max_cfg is not None and y_max_cfg > y_min_cfg:
                 y_min, y_max = y_min_cfg, y_max_cfg
 
-        n = max(max_n, 1)
-        x_den = max(n - 1, 1)
+        x_den = max(x1 - x0, 1.0)
         y_den = max(y_max - y_min, 1e-12)
+        region = raster.region(left, top, right - left + 1, bottom - top + 1) if raster is not None else None
         legend_items = []
-        for port in sorted(series_by_port.keys()):
-            vals, finite_idx = series_by_port[port]
-            if len(finite_idx) == 0:
-                continue
+        for port in sorted(summaries.keys()):
+            xs, mins, maxs, level = summaries[port]
             color = self._ensure_live_port_color(port)
-            points = []
-            for idx in finite_idx:
-                x = left + (idx / x_den) * (right - left)
-                yv = vals[idx] * scale_factor
-                y = bottom - ((yv - y_min) / y_den) * (bottom - top)
-                points.extend((x, y))
-            if len(points) >= 4:
-                c.create_line(*points, fill=color, width=2.0, smooth=False)
-            if self.live_show_points_var.get():
-                for i in range(0, len(points), 2):
-                    c.create_oval(points[i] - 2, points[i + 1] - 2, points[i] + 2, points[i + 1] + 2, fill=color, outline="")
-
-            finite_vals = np.array([v for v in vals[finite_idx] if np.isfinite(v)], dtype=float)
-            if len(finite_vals) >= 2:
-                std_text = self.fmt(float(np.std(finite_vals, ddof=1)))
-            elif len(finite_vals) == 1:
-                std_text = self.fmt(0.0)
+            px = np.clip(left + ((xs - x0) / x_den) * (right - left), left, right)
+            py_min = bottom - ((mins - y_min) / y_den) * (bottom - top)
+            if level == 0:
+                line_x, line_y = px, py_min
+            else:
+                # Decimated: zig-zag through each bucket's min/max so spikes stay visible.
+                py_max = bottom - ((maxs - y_min) / y_den) * (bottom - top)
+                line_x = np.repeat(px, 2)
+                line_y = np.column_stack((py_min, py_max)).ravel()
+            show_points = self.live_show_points_var.get() and level == 0
+            if region is not None:
+                region.polyline(line_x - left, line_y - top, color, width=2 if level == 0 else 1)
+                if show_points:
+                    region.markers(px - left, py_min - top, color, radius=2)
             else:
-                std_text = "n/a"
-            legend_items.append((port, color, std_text))
+                points = np.column_stack((line_x, line_y)).ravel().tolist()
+                if len(points) >= 4:
+                    c.create_line(*points, fill=color, width=2.0 if level == 0 else 1.0, smooth=False)
+                if show_points:
+                    for i in range(0, len(points), 2):
+                        c.create_oval(points[i] - 2, points[i + 1] - 2, points[i] + 2, points[i + 1] + 2, fill=color, outline="")
+
+            if not title:
+                std_val = series_by_port[port].std(int(x0), int(x1) + 1)
+                legend_items.append((port, color, self.fmt(std_val) if np.isfinite(std_val) else "n/a"))
 
         c.create_text(left - 4, top, text=f"{y_max:.4f}", anchor="e", fill=DARK_MUTED)
         c.create_text(left - 4, bottom, text=f"{y_min:.4f}", anchor="e", fill=DARK_MUTED)
-        x_end_label = x_start + n - 1
-        c.create_text(left, bottom + 14, text=str(x_start), anchor="w", fill=DARK_MUTED)
-        c.create_text(right, bottom + 14, text=str(x_end_label), anchor="e", fill=DARK_MUTED)
-
-        if legend_items:
-            legend_pad = 6
-            row_h = 14
-            legend_w = 190
-            legend_h = legend_pad * 2 + row_h * len(legend_items)
-            legend_x0 = right - legend_w - 4
-            legend_y0 = top + 4
-            c.create_rectangle(legend_x0, legend_y0, legend_x0 + legend_w, legend_y0 + legend_h, fill="#0f172a", outline=DARK_BORDER)
-            for i, (port, color, std_text) in enumerate(legend_items):
-                y = legend_y0 + legend_pad + i * row_h + 7
-                c.create_line(legend_x0 + 8, y, legend_x0 + 22, y, fill=color, width=2)
-                c.create_text(legend_x0 + 28, y, text=f"{port}  s={std_text}", anchor="w", fill=DARK_TEXT)
+
+        geom = {
+            "left": left,
+            "right": right,
+            "top": top,
+            "bottom": bottom,
+            "x0": x0,
+            "x1": x1,
+            "max_n": max_n,
+            "y_min": y_min,
+            "y_den": y_den,
+            "field": field,
+            "scale": scale_factor,
+            "ports": sorted(summaries.keys()),
+        }
+        self._live_plot_panels.append(geom)
+        return geom, legend_items
+
+    def _draw_live_legend(self, c, right, top, legend_items):
+        if not legend_items:
+            return
+        legend_pad = 6
+        row_h = 14
+        legend_w = 190
+        legend_h = legend_pad * 2 + row_h * len(legend_items)
+        legend_x0 = right - legend_w - 4
+        legend_y0 = top + 4
+        c.create_rectangle(legend_x0, legend_y0, legend_x0 + legend_w, legend_y0 + legend_h, fill="#0f172a", outline=DARK_BORDER)
+        for i, (port, color, std_text) in enumerate(legend_items):
+            y = legend_y0 + legend_pad + i * row_h + 7
+            c.create_line(legend_x0 + 8, y, legend_x0 + 22, y, fill=color, width=2)
+            c.create_text(legend_x0 + 28, y, text=f"{port}  s={std_text}", anchor="w", fill=DARK_TEXT)
+
+    def _live_panel_at(self, x, y):
+        for geom in self._live_plot_panels:
+            if geom["left"] <= x <= geom["right"] and geom["top"] <= y <= geom["bottom"]:
+                return geom
+        return None
+
+    def _on_live_renderer_changed(self):
+        self._save_app_config()
+        self.refresh_live_plot()
+
+    @staticmethod
+    def _blit_raster(canvas, raster, x, y):
+        """Show a RasterImage as one image item beneath the canvas' other items."""
+        photo = tk.PhotoImage(master=canvas, data=raster.to_ppm(), format="PPM")
+        # Tk drops the image once the Python reference goes, so pin it to the canvas.
+        canvas._raster_photo = photo
+        item = canvas.create_image(x, y, image=photo, anchor="nw")
+        canvas.tag_lower(item)
+        return item
+
+    def reset_live_view(self):
+        self.live_view_range = None
+        self.refresh_live_plot()
+
+    def _set_live_view_range(self, x0, span, max_n):
+        limit = max(float(max_n - 1), 1.0)
+        if span >= limit:
+            self.live_view_range = None
+        else:
+            x0 = min(max(x0, 0.0), limit - span)
+            self.live_view_range = (x0, x0 + span)
+        self.refresh_live_plot()
+
+    def _on_live_plot_wheel(self, event):
+        geom = self._live_panel_at(event.x, event.y) or next(iter(self._live_plot_panels), None)
+        if not geom:
+            return "break"
+        zoom_out = getattr(event, "num", None) == 5 or getattr(event, "delta", 0) < 0
+        factor = LIVE_ZOOM_STEP if zoom_out else 1.0 / LIVE_ZOOM_STEP
+        pw = max(geom["right"] - geom["left"], 1)
+        frac = min(max((event.x - geom["left"]) / pw, 0.0), 1.0)
+        x0, x1 = geom["x0"], geom["x1"]
+        anchor = x0 + frac * (x1 - x0)
+        span = max((x1 - x0) * factor, float(LIVE_ZOOM_MIN_SPAN))
+        self._set_live_view_range(anchor - frac * span, span, geom["max_n"])
+        return "break"
+
+    def _on_live_plot_press(self, event):
+        geom = self._live_panel_at(event.x, event.y)
+        if not geom:
+            return
+        self._live_pan_anchor = (event.x, geom["x0"], geom["x1"], geom["right"] - geom["left"], geom["max_n"])
+
+    def _on_live_plot_drag(self, event):
+        anchor = self._live_pan_anchor
+        if anchor is None:
+            return
+        start_x, x0, x1, pw, max_n = anchor
+        pw = max(pw, 1)
+        shift = -(event.x - start_x) / pw * (x1 - x0)
+        self._live_hover_xy = None
+        self._set_live_view_range(x0 + shift, x1 - x0, max_n)
+
+    def _on_live_plot_release(self, event):
+        self._live_pan_anchor = None
+        self._live_hover_xy = (event.x, event.y)
+        self._draw_live_hover(event.x, event.y)
+
+    def _on_live_plot_motion(self, event):
+        self._live_hover_xy = (event.x, event.y)
+        self._draw_live_hover(event.x, event.y)
+
+    def _on_live_plot_leave(self, _event=None):
+        self._live_hover_xy = None
+        self.live_canvas.delete("live_hover")
+
+    def _draw_live_hover(self, x, y):
+        c = self.live_canvas
+        c.delete("live_hover")
+        geom = self._live_panel_at(x, y)
+        if not geom:
+            return
+        pw = max(geom["right"] - geom["left"], 1)
+        ph = geom["bottom"] - geom["top"]
+        x_den = max(geom["x1"] - geom["x0"], 1.0)
+        x_idx = geom["x0"] + (x - geom["left"]) / pw * x_den
+        rows = []
+        for port in geom["ports"]:
+            series = self.live_run_series_by_port.get(port, {}).get(geom["field"])
+            if series is None:
+                continue
+            idx = series.nearest(x_idx)
+            if idx is None:
+                continue
+            val = series.value_at(idx) * geom["scale"]
+            px = geom["left"] + (idx - geom["x0"]) / x_den * pw
+            py = geom["bottom"] - ((val - geom["y_min"]) / geom["y_den"]) * ph
+            color = self._ensure_live_port_color(port)
+            if geom["left"] <= px <= geom["right"] and geom["top"] <= py <= geom["bottom"]:
+                c.create_oval(px - 4, py - 4, px + 4, py + 4, outline=color, width=2, tags="live_hover")
+            rows.append(f"{port} #{idx + 1}: {self.fmt(val)}")
+        if not rows:
+            return
+        c.create_line(x, geom["top"], x, geom["bottom"], fill=DARK_MUTED, dash=(2, 3), tags="live_hover")
+        anchor = "sw" if x < (geom["left"] + geom["right"]) / 2 else "se"
+        tx = x + 10 if anchor == "sw" else x - 10
+        text_id = c.create_text(tx, geom["bottom"] - 6, text="\n".join(rows), anchor=anchor, fill=DARK_TEXT, tags="live_hover")
+        x0, y0, x1, y1 = c.bbox(text_id)
+        c.create_rectangle(x0 - 4, y0 - 2, x1 + 4, y1 + 2, fill="#0f172a", outline=DARK_BORDER, tags="live_hover")
+        c.tag_raise(text_id)
 
     def _ensure_live_port_color(self, port):
         if port not in self.live_port_colors:
@@ -5197,6 +7126,26 @@ or use the Setup GUI to create custom port pairs."""
 
         ttk.Button(win, text="Apply", command=apply_and_close, style="Primary.TButton").grid(row=len(ports), column=0, sticky="e", padx=8, pady=8)
 
+    def select_live_grid_fields(self):
+        win = tk.Toplevel(self.root)
+        win.title("Grid Live Fields")
+        vars_by_key = {}
+        default_selected = self.live_grid_fields or set(self.live_plot_fields.values())
+        for i, (label, key) in enumerate(self.live_plot_fields.items()):
+            v = tk.BooleanVar(value=key in default_selected)
+            ttk.Checkbutton(win, text=label, variable=v).grid(row=i, column=0, sticky="w", padx=8, pady=2)
+            vars_by_key[key] = v
+
+        def apply_and_close():
+            self.live_grid_fields = {k for k, v in vars_by_key.items() if v.get()}
+            self.live_grid_var.set(True)
+            self.refresh_live_plot()
+            win.destroy()
+
+        ttk.Button(win, text="Apply", command=apply_and_close, style="Primary.TButton").grid(
+            row=len(vars_by_key), column=0, sticky="e", padx=8, pady=8
+        )
+
     def _update_live_samples_label(self):
         if not self.live_run_total_samples_by_port:
             self.live_samples_var.set("Samples: 0 / 0")
@@ -5214,8 +7163,9 @@ or use the Setup GUI to create custom port pairs."""
         self.live_run_total_samples_by_port = {}
         self.live_run_serial_by_port = {}
         self.live_port_colors = {}
+        self.live_view_range = None
         for port in ports:
-            self.live_run_series_by_port[port] = {field: [] for field in self.live_plot_fields.values()}
+            self.live_run_series_by_port[port] = self._new_live_series()
             self.live_run_total_samples_by_port[port] = int(total_samples)
             self._ensure_live_port_color(port)
         self.live_text.configure(state=tk.NORMAL)
@@ -5388,15 +7338,52 @@ or use the Setup GUI to create custom port pairs."""
                 return candidate
             i += 1
 
+    def _session_fieldnames(self):
+        fields = list(SESSION_CSV_FIELDS)
+        for d in self.sample_field_defs:
+            fields += [f"{d['key']}_std", f"{d['key']}_avg"]
+        return fields
+
+    def _session_fsync_policy(self):
+        policy = str(self.app_config.get("session_fsync", "row")).strip().lower()
+        return policy if policy in SESSION_FSYNC_POLICIES else "row"
+
     def append_session_row(self, row):
-        is_new = not os.path.exists(self.session_csv)
-        with open(self.session_csv, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=list(row.keys()))
-            if is_new:
-                writer.writeheader()
-            writer.writerow(row)
-
-    def collect_samples(self, ser, n_samples, port=None):
+        writer = self.session_writer
+        try:
+            if writer is None or writer.path != self.session_csv:
+                self._close_session_writer()
+                writer = SessionWriter(self.session_csv, self._session_fieldnames(), fsync=self._session_fsync_policy())
+                self.session_writer = writer
+                if self.session_rows and not writer.row_count:
+                    # Results root moved mid-session: the new file gets the whole session.
+                    writer.extend(self.session_rows)
+            writer.append(row)
+        except OSError as exc:
+            self._close_session_writer()
+            self.log(f"Session CSV write failed ({self.session_csv}): {exc}")
+
+    def _close_session_writer(self):
+        writer = self.session_writer
+        self.session_writer = None
+        if writer is not None:
+            try:
+                writer.close()
+            except OSError as exc:
+                self.log(f"Session journal close failed: {exc}")
+
+    def _recover_sessions(self):
+        """Rebuild CSV/JSON files of earlier sessions on this PC that ended without closing their journal."""
+        try:
+            recovered = recover_sessions(self.session_dir, self._session_fieldnames())
+        except OSError as exc:
+            self.log(f"Session recovery skipped: {exc}")
+            return
+        for path, count in recovered:
+            self.log(f"Recovered unfinished session from its journal: {path} ({count} row(s))")
+
+    def collect_samples(self, ser, n_samples, port=None, serial_number=""):
+        """Take ``n_samples`` samples, publishing each on the sample bus as it arrives."""
         samples = []
         for i in range(1, n_samples + 1):
             if self.shutdown_event.is_set():
@@ -5405,7 +7392,7 @@ or use the Setup GUI to create custom port pairs."""
             s["idx"] = i
             s["captured_at"] = dt.datetime.now().isoformat(timespec="milliseconds")
             samples.append(s)
-            self.append_live_run_sample(i, s, port=port)
+            self.sample_bus.publish(Sample(port, serial_number, i, n_samples, s["captured_at"], s["raw"], s["parsed"]))
             if i % 10 == 0 or i == n_samples:
                 self.log(f"Collected sample {i}/{n_samples}")
         return samples
@@ -5627,8 +7614,8 @@ or use the Setup GUI to create custom port pairs."""
                 cal_age_days = (dt.datetime.now() - caldate).days if caldate else None
 
                 self.log(f"[{selected_port}] Collecting {n_samples} samples from TSR stream...")
-                self.clear_live_run_view(n_samples, port=selected_port, serial_number=serial_number)
-                samples = self.collect_samples(ser, n_samples, port=selected_port)
+                self.sample_bus.publish(RunStarted(selected_port, serial_number, n_samples))
+                samples = self.collect_samples(ser, n_samples, port=selected_port, serial_number=serial_number)
                 metrics = self.compute_metrics(samples)
 
                 run_ts = dt.datetime.now().replace(microsecond=0)
@@ -5713,6 +7700,7 @@ or use the Setup GUI to create custom port pairs."""
 
                 with open(unit_json, "w", encoding="utf-8") as f:
                     json.dump(summary, f, indent=2)
+                self._record_run(summary, samples)
 
                 self._ui_post("run_result", summary, metrics, selected_port, serial_number, sample_csv)
 
@@ -5803,12 +7791,59 @@ or use the Setup GUI to create custom port pairs."""
             messagebox.showinfo("No Data", "No unit results in this session yet.")
             return
 
+        rows = self.session_rows
+        if self.session_writer is not None:
+            try:
+                rows = self.session_writer.rows()
+            except OSError as exc:
+                self.log(f"Session journal read failed, saving in-memory rows: {exc}")
         out_path = os.path.join(self.session_dir, f"sbe83_session_{self.session_id}.json")
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(self.session_rows, f, indent=2)
+            json.dump(rows, f, indent=2)
         self.log(f"Wrote session JSON: {out_path}")
+        self._save_console_files()
         messagebox.showinfo("Saved", f"Session JSON saved:\n{out_path}")
 
+    def _work_path(self, kind, name):
+        """Local working file ``name`` of this session (``kind`` is ``console`` or ``sniffer``)."""
+        return os.path.join(self.work_root, self.session_id, kind, name)
+
+    def _session_subdir(self, kind):
+        folder = os.path.join(self.session_dir, kind)
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def _prune_work_dirs(self):
+        """Remove local working folders of sessions older than ``WORK_DIR_KEEP_DAYS``."""
+        cutoff = time.time() - WORK_DIR_KEEP_DAYS * 86400
+        try:
+            entries = list(os.scandir(self.work_root))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if entry.is_dir() and entry.name != self.session_id and entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                pass
+
+    def _save_console_files(self):
+        """Copy the console logs and the TX/RX capture from the local work folder to the session folder."""
+        with self._console_store_lock:
+            logs = list(self.console_logs.values())
+            capture = self.manual_capture
+        try:
+            folder = self._session_subdir("console")
+            for log in logs:
+                if log.path:
+                    log.copy_to(os.path.join(folder, os.path.basename(log.path)))
+            if capture is not None and capture.row_count:
+                capture.export(os.path.join(folder, f"capture_{self.session_id}.csv.gz"))
+        except OSError as exc:
+            self.log(f"Console files not copied to the session folder: {exc}")
+            return
+        self.log(f"Console logs copied to: {folder}")
+
     def reset_session(self):
         if self.run_in_progress:
             messagebox.showwarning("Run In Progress", "Wait for the active test run to finish before resetting session.")
@@ -5822,11 +7857,14 @@ or use the Setup GUI to create custom port pairs."""
         for row in self.tree.get_children():
             self.tree.delete(row)
 
+        self._close_session_writer()
         self.session_start = dt.datetime.now()
         self.session_id = self.session_start.strftime("%Y%m%d_%H%M%S")
         self.session_rows = []
         self.session_serials = set()
         self.session_csv = os.path.join(self.session_dir, f"sbe83_session_{self.session_id}.csv")
+        self._rotate_console_logs()
+        self._open_manual_capture()
         self.limit_var.set(f"Units tested: 0 / {MAX_UNITS_PER_SESSION}")
         self.batch_runs_remaining_by_port = {}
         self._update_runs_left_label()
@@ -5836,6 +7874,7 @@ or use the Setup GUI to create custom port pairs."""
 
     def shutdown(self):
         self.shutdown_event.set()
+        self.ui_event_queue.close()
         if self._layout_save_after_id is not None:
             try:
                 self.root.after_cancel(self._layout_save_after_id)
@@ -5845,6 +7884,21 @@ or use the Setup GUI to create custom port pairs."""
 
         for ev in self.stream_stop_events.values():
             ev.set()
+        with self._console_store_lock:
+            console_logs = list(self.console_logs.values())
+        for log in console_logs:
+            log.close()
+        self._close_session_writer()
+        if self.manual_capture is not None:
+            self.manual_capture.close()
+        if self._sniffer_export_cancel is not None:
+            self._sniffer_export_cancel.set()
+        self._close_sniffer_pcapng()
+        self._disarm_sniffer_trigger()
+        if self._sniffer_replay_stop is not None:
+            self._sniffer_replay_stop.set()
+        if self.sniffer_capture is not None:
+            self.sniffer_capture.close()
 
         run_threads = []
         with self.run_state_lock:
@@ -5859,13 +7913,14 @@ or use the Setup GUI to create custom port pairs."""
         self.serial_pool.clear()
 
         # Stop sniffer if running
-        self.sniffer_stop_event.set()
-        if self.sniffer_serial:
+        for stop in self.sniffer_stop_events.values():
+            stop.set()
+        for ser in self.sniffer_serials.values():
             try:
-                self.sniffer_serial.close()
+                ser.close()
             except Exception:
                 pass
-            self.sniffer_serial = None
+        self.sniffer_serials.clear()
 
         # Stop bridge if running
         self.bridge_stop_event.set()
@@ -5890,6 +7945,8 @@ or use the Setup GUI to create custom port pairs."""
             self.active_run_ports.clear()
             self.run_threads = {}
         self.run_in_progress = False
+        if self.results_db is not None:
+            self.results_db.close()
         try:
             self._save_app_config()
         except Exception:
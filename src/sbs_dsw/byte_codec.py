@@ -0,0 +1,88 @@
+"""Byte formatting shared by the console, sniffer viewer and exports.
+
+Every mode is a 256-entry lookup table mapped over the data and joined once
+(``bytes.hex`` and ``bytes.translate`` where C already does the job), instead
+of formatting byte by byte in Python.
+"""
+
+import re
+
+HEXDUMP_BYTES_PER_LINE = 16
+BYTE_MODES = ("ascii", "hex", "dec", "bin", "hexdump")
+
+DEC_TABLE = tuple(str(b) for b in range(256))
+BIN_TABLE = tuple(f"{b:08b}" for b in range(256))
+PRINTABLE = bytes(range(32, 127))
+_NON_PRINTABLE = re.compile(rb"[^\x20-\x7e]")
+# Hex dump ASCII column: printable bytes as-is, everything else ".".
+DUMP_ASCII = bytes(b if 32 <= b <= 126 else ord(".") for b in range(256))
+
+
+def escape_table(lf="<LF>", other="<{:02X}>"):
+    """Printable ASCII as-is, CR/LF/TAB as ``<CR>``/``lf``/``<TAB>`` and other bytes as ``other``."""
+    names = {13: "<CR>", 10: lf, 9: "<TAB>"}
+    return tuple(names.get(b, chr(b) if 32 <= b <= 126 else other.format(b)) for b in range(256))
+
+
+# Sniffer stream view breaks lines after LF; fixed-row views keep LF on the row.
+ESCAPE_TABLE = escape_table(lf="<LF>\n")
+ROW_ESCAPE_TABLE = escape_table()
+CONSOLE_ESCAPE_TABLE = escape_table(other="<0x{:02X}>")
+
+
+def to_hex(data, sep=" "):
+    return bytes(data).hex(sep).upper() if sep else bytes(data).hex().upper()
+
+
+def to_dec(data, sep=" "):
+    return sep.join(map(DEC_TABLE.__getitem__, data))
+
+
+def to_bin(data, sep=" "):
+    return sep.join(map(BIN_TABLE.__getitem__, data))
+
+
+def to_ascii(data, table=CONSOLE_ESCAPE_TABLE):
+    """Printable ASCII with the other bytes escaped through ``table``.
+
+    Mostly-text data only substitutes its few escapes; mostly-binary data maps
+    every byte through the table, which is faster once escapes are common.
+    """
+    data = bytes(data)
+    escapes = len(data.translate(None, PRINTABLE))
+    if not escapes:
+        return data.decode("ascii")
+    if escapes * 8 < len(data):
+        return _NON_PRINTABLE.sub(lambda m: table[m.group()[0]].encode("latin-1"), data).decode("latin-1")
+    return "".join(map(table.__getitem__, data))
+
+
+def dump_ascii(data):
+    """Hex dump ASCII column: non-printable bytes as ``.``."""
+    return bytes(data).translate(DUMP_ASCII).decode("ascii")
+
+
+def hexdump(data, offset=0):
+    """``OOOOOOOO  HH HH ... │ ASCII`` lines, 16 bytes each, starting at stream ``offset``."""
+    data = bytes(data)
+    lines = []
+    for i in range(0, len(data), HEXDUMP_BYTES_PER_LINE):
+        chunk = data[i:i + HEXDUMP_BYTES_PER_LINE]
+        left = chunk[:8].hex(" ").upper()
+        if len(chunk) > 8:
+            left += "  " + chunk[8:].hex(" ").upper()
+        lines.append(f"{offset + i:08X}  {left:<50} │ {chunk.translate(DUMP_ASCII).decode('ascii')}")
+    return "\n".join(lines)
+
+
+def format_bytes(data, mode="ascii", table=CONSOLE_ESCAPE_TABLE):
+    """``data`` as text in one of :data:`BYTE_MODES` (``table`` escapes the ascii mode)."""
+    if mode == "hex":
+        return to_hex(data)
+    if mode == "dec":
+        return to_dec(data)
+    if mode == "bin":
+        return to_bin(data)
+    if mode == "hexdump":
+        return hexdump(data)
+    return to_ascii(data, table)
@@ -0,0 +1,246 @@
+import collections
+import csv
+import gzip
+import io
+import os
+import shutil
+import threading
+import time
+
+CONSOLE_RING_LINES = 5000
+# Byte offset of every Nth line is kept, so seeking costs at most N-1 readline calls.
+CONSOLE_INDEX_STRIDE = 256
+
+
+class ConsoleLog:
+    """Append-only line store for one console: in-memory ring plus on-disk log.
+
+    The newest ``ring_lines`` lines are served from memory; older lines are
+    read back from the log file through a sparse offset index, so the whole
+    session stays scrollable while memory use stays bounded. Without a
+    ``path`` only the ring is kept. Serial workers append while the UI reads,
+    so every method takes the log's lock.
+    """
+
+    def __init__(self, path=None, ring_lines=CONSOLE_RING_LINES):
+        self.path = path
+        self._lock = threading.RLock()
+        self._ring = collections.deque(maxlen=max(1, int(ring_lines)))
+        self._count = 0
+        self._view_start = 0
+        self._index = []
+        self._bytes = 0
+        self._writer = None
+        self._reader = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._writer = open(path, "ab")
+                self._bytes = self._writer.tell()
+            except OSError:
+                self._writer = None
+        if self._writer is not None and self._bytes:
+            # Appending to an existing log: index what is already there.
+            with open(path, "rb") as f:
+                offset = 0
+                for raw in f:
+                    if self._count % CONSOLE_INDEX_STRIDE == 0:
+                        self._index.append(offset)
+                    offset += len(raw)
+                    self._count += 1
+            self._view_start = self._count
+
+    def __len__(self):
+        """Lines visible in the view (everything since the last clear)."""
+        with self._lock:
+            return self._count - self._view_start
+
+    @property
+    def first_available(self):
+        """Oldest view-relative line that can still be read back."""
+        with self._lock:
+            if self._writer is not None:
+                return 0
+            return max(0, self._count - len(self._ring) - self._view_start)
+
+    def append(self, lines):
+        """Append text lines (without trailing newlines)."""
+        if not lines:
+            return
+        with self._lock:
+            if self._writer is not None:
+                chunks = []
+                for line in lines:
+                    if self._count % CONSOLE_INDEX_STRIDE == 0:
+                        self._index.append(self._bytes)
+                    raw = line.encode("utf-8", errors="replace") + b"\n"
+                    chunks.append(raw)
+                    self._bytes += len(raw)
+                    self._count += 1
+                try:
+                    self._writer.write(b"".join(chunks))
+                    self._writer.flush()
+                except OSError:
+                    self._close_files()
+            else:
+                self._count += len(lines)
+            self._ring.extend(lines)
+
+    def get(self, start, stop):
+        """View-relative lines ``[start, stop)``."""
+        with self._lock:
+            start = max(start, self.first_available, 0) + self._view_start
+            stop = min(stop + self._view_start, self._count)
+            if stop <= start:
+                return []
+            ring_first = self._count - len(self._ring)
+            if start >= ring_first:
+                return [self._ring[i - ring_first] for i in range(start, stop)]
+            older = self._read_disk(start, min(stop, ring_first))
+            if stop > ring_first:
+                older.extend(self._ring[i - ring_first] for i in range(ring_first, stop))
+            return older
+
+    def _read_disk(self, start, stop):
+        if self._writer is None:
+            return []
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        block = start // CONSOLE_INDEX_STRIDE
+        self._reader.seek(self._index[block])
+        for _ in range(start - block * CONSOLE_INDEX_STRIDE):
+            self._reader.readline()
+        out = []
+        for _ in range(stop - start):
+            raw = self._reader.readline()
+            if not raw:
+                break
+            out.append(raw.rstrip(b"\n").decode("utf-8", errors="replace"))
+        return out
+
+    def copy_to(self, dest_path):
+        """Copy the on-disk log (everything appended so far) to ``dest_path``."""
+        with self._lock:
+            if self._writer is not None:
+                shutil.copyfile(self.path, dest_path)
+
+    def clear_view(self):
+        """Hide everything logged so far from the view; the file keeps it."""
+        with self._lock:
+            self._view_start = self._count
+            self._ring.clear()
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+    def _close_files(self):
+        for f in (self._writer, self._reader):
+            if f is not None:
+                try:
+                    f.close()
+                except OSError:
+                    pass
+        self._writer = None
+        self._reader = None
+
+
+CAPTURE_FIELDS = ("timestamp", "port", "direction", "payload")
+CAPTURE_SEGMENT_BYTES = 32 * 1024 * 1024
+CAPTURE_FLUSH_INTERVAL_S = 2.0
+
+
+class CaptureWriter:
+    """Streams console TX/RX rows to rotating gzip CSV segments.
+
+    Segments are named ``<base>_001.csv.gz``, ``<base>_002.csv.gz``, ... and
+    rotate after ``segment_bytes`` of uncompressed CSV. Only the first segment
+    carries the header, so the gzip members concatenate into one valid
+    ``.csv.gz`` and :meth:`export` is a byte copy (or a streamed decompress
+    for plain ``.csv``). Memory use does not grow with session length.
+    Rows may be written from several serial workers at once; rows written
+    after :meth:`close` are ignored.
+    """
+
+    def __init__(self, base_path, segment_bytes=CAPTURE_SEGMENT_BYTES, flush_interval_s=CAPTURE_FLUSH_INTERVAL_S):
+        self.base_path = base_path
+        self.segment_bytes = max(1024, int(segment_bytes))
+        self.flush_interval_s = float(flush_interval_s)
+        self.row_count = 0
+        self.segments = []
+        self._gz = None
+        self._segment_size = 0
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def _open_segment(self):
+        os.makedirs(os.path.dirname(self.base_path) or ".", exist_ok=True)
+        path = f"{self.base_path}_{len(self.segments) + 1:03d}.csv.gz"
+        self._gz = gzip.open(path, "wb")
+        self._segment_size = 0
+        self.segments.append(path)
+        if len(self.segments) == 1:
+            self._write(",".join(CAPTURE_FIELDS) + "\r\n")
+
+    def _write(self, text):
+        raw = text.encode("utf-8", errors="replace")
+        self._gz.write(raw)
+        self._segment_size += len(raw)
+
+    def write_rows(self, rows):
+        """Append ``(timestamp, port, direction, payload)`` rows."""
+        if not rows:
+            return
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        with self._lock:
+            if self.closed:
+                return
+            if self._gz is None:
+                self._open_segment()
+            self._write(buf.getvalue())
+            self.row_count += len(rows)
+            now = time.monotonic()
+            if self._segment_size >= self.segment_bytes:
+                self._rotate()
+            elif now - self._last_flush >= self.flush_interval_s:
+                # Periodic sync flush bounds what a crash can lose without
+                # flushing (and hurting compression) on every batch.
+                self._gz.flush()
+                self._last_flush = now
+
+    def rotate(self):
+        """Close the current segment; the next row starts a new one."""
+        with self._lock:
+            self._rotate()
+
+    def _rotate(self):
+        if self._gz is not None:
+            self._gz.close()
+            self._gz = None
+
+    def export(self, dest_path):
+        """Write every captured row to ``dest_path`` (``.csv`` or ``.csv.gz``)."""
+        with self._lock:
+            self._rotate()
+            self._export(dest_path)
+
+    def _export(self, dest_path):
+        with open(dest_path, "wb") as out:
+            if not self.segments:
+                header = (",".join(CAPTURE_FIELDS) + "\r\n").encode("ascii")
+                out.write(gzip.compress(header) if dest_path.lower().endswith(".gz") else header)
+                return
+            for path in self.segments:
+                if dest_path.lower().endswith(".gz"):
+                    with open(path, "rb") as src:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+                else:
+                    with gzip.open(path, "rb") as src:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._rotate()
@@ -0,0 +1,223 @@
+import numpy as np
+
+# Each pyramid level summarises LOD_FANOUT blocks of the level below it.
+LOD_FANOUT = 8
+LOD_INITIAL_CAPACITY = 1024
+
+
+def _grow(arr, needed, fill=np.nan):
+    """Return ``arr`` or a copy with capacity for at least ``needed`` items."""
+    if needed <= len(arr):
+        return arr
+    capacity = max(needed, len(arr) * 2)
+    out = np.full(capacity, fill, dtype=arr.dtype)
+    out[: len(arr)] = arr
+    return out
+
+
+class MinMaxPyramid:
+    """Append-only numeric series with a min/max level-of-detail pyramid.
+
+    Level 0 is the raw sample array. Level ``k`` stores the NaN-ignoring
+    minimum and maximum of consecutive blocks of ``fanout ** k`` samples, so a
+    plot can summarise any index range into a bounded number of buckets by
+    reading the coarsest level that still has enough buckets for its pixel
+    width. Appends are O(number of levels); queries never touch more than
+    ``max_buckets * fanout`` entries regardless of series length.
+
+    Each block also keeps the count, sum and sum of squares of its finite
+    samples (offset by the first finite sample, for precision), so
+    :meth:`std` of any index range reads O(levels * fanout) entries.
+    """
+
+    def __init__(self, fanout=LOD_FANOUT):
+        self.fanout = max(2, int(fanout))
+        self._n = 0
+        self._values = np.full(LOD_INITIAL_CAPACITY, np.nan, dtype=float)
+        self._finite_idx = np.zeros(LOD_INITIAL_CAPACITY, dtype=np.int64)
+        self._n_finite = 0
+        self._mins = []  # level k (k >= 1) stored at position k - 1
+        self._maxs = []
+        self._counts = []
+        self._sums = []
+        self._squares = []
+        self._level_len = []
+        self._shift = None
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def levels(self):
+        return len(self._mins) + 1
+
+    def values(self):
+        """Raw samples as a read-only view (NaN for missing samples)."""
+        view = self._values[: self._n]
+        view.flags.writeable = False
+        return view
+
+    def value_at(self, idx):
+        if 0 <= idx < self._n:
+            return float(self._values[idx])
+        return np.nan
+
+    def append(self, value):
+        try:
+            v = float(value)
+        except (TypeError, ValueError):
+            v = np.nan
+        finite = bool(np.isfinite(v))
+        if not finite:
+            v = np.nan
+        idx = self._n
+        self._values = _grow(self._values, idx + 1)
+        self._values[idx] = v
+        self._n = idx + 1
+        d = 0.0
+        if finite:
+            self._finite_idx = _grow(self._finite_idx, self._n_finite + 1, fill=0)
+            self._finite_idx[self._n_finite] = idx
+            self._n_finite += 1
+            if self._shift is None:
+                self._shift = v
+            d = v - self._shift
+
+        block = idx
+        for level in range(len(self._mins)):
+            block //= self.fanout
+            if finite:
+                self._counts[level] = _grow(self._counts[level], block + 1, fill=0)
+                self._sums[level] = _grow(self._sums[level], block + 1, fill=0.0)
+                self._squares[level] = _grow(self._squares[level], block + 1, fill=0.0)
+                self._counts[level][block] += 1
+                self._sums[level][block] += d
+                self._squares[level][block] += d * d
+            if block >= self._level_len[level]:
+                self._mins[level] = _grow(self._mins[level], block + 1)
+                self._maxs[level] = _grow(self._maxs[level], block + 1)
+                self._mins[level][block] = v
+                self._maxs[level][block] = v
+                self._level_len[level] = block + 1
+            elif finite:
+                # Stored NaN compares False, so the first finite sample wins.
+                if not self._mins[level][block] <= v:
+                    self._mins[level][block] = v
+                if not self._maxs[level][block] >= v:
+                    self._maxs[level][block] = v
+
+        top_len = self._level_len[-1] if self._level_len else self._n
+        if top_len > self.fanout:
+            self._add_level()
+
+    def extend(self, values):
+        for v in values:
+            self.append(v)
+
+    def _add_level(self):
+        if self._mins:
+            n = self._level_len[-1]
+            src_min = self._mins[-1][:n]
+            src_max = self._maxs[-1][:n]
+            src_count, src_sum, src_square = self._counts[-1][:n], self._sums[-1][:n], self._squares[-1][:n]
+        else:
+            n = self._n
+            src_min = src_max = self._values[:n]
+            src_count, src_sum, src_square = self._raw_moments(0, n)
+        starts = np.arange(0, n, self.fanout)
+        mins = np.fmin.reduceat(src_min, starts)
+        maxs = np.fmax.reduceat(src_max, starts)
+        capacity = max(LOD_INITIAL_CAPACITY // self.fanout, len(mins) * 2)
+        self._mins.append(_grow(mins, capacity))
+        self._maxs.append(_grow(maxs, capacity))
+        self._counts.append(_grow(np.add.reduceat(src_count, starts), capacity, fill=0))
+        self._sums.append(_grow(np.add.reduceat(src_sum, starts), capacity, fill=0.0))
+        self._squares.append(_grow(np.add.reduceat(src_square, starts), capacity, fill=0.0))
+        self._level_len.append(len(mins))
+
+    def _raw_moments(self, start, stop):
+        """Per-sample (count, offset value, offset square) of level 0, zero for missing samples."""
+        vals = self._values[start:stop]
+        finite = np.isfinite(vals)
+        d = np.where(finite, vals - (self._shift if self._shift is not None else 0.0), 0.0)
+        return finite.astype(np.int64), d, d * d
+
+    def std(self, start, stop):
+        """Sample standard deviation (ddof=1) of the finite samples in ``[start, stop)``.
+
+        0.0 for a single sample and NaN for none. Whole blocks come from the
+        pyramid, so only the ragged ends of each level are summed.
+        """
+        start = max(0, int(start))
+        stop = min(self._n, int(stop))
+        count = 0
+        total = 0.0
+        square = 0.0
+        lo, hi = start, stop
+        f = self.fanout
+        for level in range(len(self._mins) + 1):
+            if lo >= hi:
+                break
+            if level == len(self._mins):
+                head_end = tail_start = hi
+            else:
+                head_end = min(hi, -(-lo // f) * f)
+                tail_start = max(head_end, hi // f * f)
+            for a, b in ((lo, head_end), (tail_start, hi)):
+                if a >= b:
+                    continue
+                if level == 0:
+                    c, s, q = self._raw_moments(a, b)
+                else:
+                    c, s, q = self._counts[level - 1][a:b], self._sums[level - 1][a:b], self._squares[level - 1][a:b]
+                count += int(c.sum())
+                total += float(s.sum())
+                square += float(q.sum())
+            lo, hi = head_end // f, tail_start // f
+        if count == 0:
+            return np.nan
+        if count == 1:
+            return 0.0
+        return float(np.sqrt(max(0.0, (square - total * total / count) / (count - 1))))
+
+    def query(self, start, stop, max_buckets):
+        """Summarise samples ``[start, stop)`` into at most ~``max_buckets`` buckets.
+
+        Returns ``(x, ymin, ymax, level)`` where ``x`` is the bucket centre in
+        sample-index units. At level 0 ``ymin`` and ``ymax`` are the raw samples.
+        """
+        start = max(0, int(np.floor(start)))
+        stop = min(self._n, int(np.ceil(stop)))
+        if stop <= start:
+            empty = np.array([], dtype=float)
+            return empty, empty, empty, 0
+        span = stop - start
+        max_buckets = max(1, int(max_buckets))
+        level = 0
+        block = 1
+        while level < len(self._mins) and span / block > max_buckets:
+            level += 1
+            block *= self.fanout
+        if level == 0:
+            vals = self._values[start:stop]
+            return np.arange(start, stop, dtype=float), vals, vals, 0
+        lo = start // block
+        hi = (stop - 1) // block + 1
+        x = np.arange(lo, hi, dtype=float) * block + (block - 1) / 2.0
+        np.clip(x, start, stop - 1, out=x)
+        return x, self._mins[level - 1][lo:hi], self._maxs[level - 1][lo:hi], level
+
+    def nearest(self, x):
+        """Index of the finite sample closest to ``x`` (binary search), or None."""
+        n = self._n_finite
+        if n == 0:
+            return None
+        idx = self._finite_idx[:n]
+        pos = int(np.searchsorted(idx, x))
+        if pos <= 0:
+            return int(idx[0])
+        if pos >= n:
+            return int(idx[-1])
+        before = int(idx[pos - 1])
+        after = int(idx[pos])
+        return before if (x - before) <= (after - x) else after
@@ -0,0 +1,203 @@
+import numpy as np
+
+def parse_color(color):
+    """Parse ``#rgb``/``#rrggbb`` into an ``(r, g, b)`` tuple of ints."""
+    text = str(color).strip().lstrip("#")
+    if len(text) == 3:
+        text = "".join(ch * 2 for ch in text)
+    if len(text) != 6:
+        raise ValueError(f"Unsupported color: {color!r}")
+    return tuple(int(text[i : i + 2], 16) for i in (0, 2, 4))
+
+
+def _segment_points(xs, ys):
+    """Sample every segment of a polyline at (at most) one-pixel steps."""
+    dx = np.diff(xs)
+    dy = np.diff(ys)
+    steps = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))), 1).astype(np.int64)
+    seg = np.repeat(np.arange(len(steps)), steps)
+    offsets = np.arange(int(steps.sum())) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = offsets / steps[seg]
+    px = np.concatenate((xs[:-1][seg] + dx[seg] * t, xs[-1:]))
+    py = np.concatenate((ys[:-1][seg] + dy[seg] * t, ys[-1:]))
+    steep = np.abs(dy) > np.abs(dx)
+    return px, py, np.concatenate((steep[seg], steep[-1:]))
+
+
+def _column_spans(xs, ys):
+    """Split an x-sorted polyline into one vertical pixel span per column.
+
+    Returns ``(columns, y_low, y_high)``; a segment crossing several columns
+    contributes the part of its height that falls inside each column, so the
+    span count grows with segments plus plot width, not with line length.
+    """
+    xa, xb = xs[:-1], xs[1:]
+    ya, yb = ys[:-1], ys[1:]
+    ca = np.rint(xa).astype(np.int64)
+    cb = np.rint(xb).astype(np.int64)
+    counts = cb - ca + 1
+    seg = np.repeat(np.arange(len(counts)), counts)
+    cols = ca[seg] + np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    dx = xb - xa
+    slope = np.divide(yb - ya, dx, out=np.zeros_like(dx), where=dx > 0)
+    x_lo = np.maximum(cols - 0.5, xa[seg])
+    x_hi = np.minimum(cols + 0.5, xb[seg])
+    y1 = np.where(dx[seg] > 0, ya[seg] + slope[seg] * (x_lo - xa[seg]), ya[seg])
+    y2 = np.where(dx[seg] > 0, ya[seg] + slope[seg] * (x_hi - xa[seg]), yb[seg])
+    return cols, np.minimum(y1, y2), np.maximum(y1, y2)
+
+
+class RasterImage:
+    """RGB framebuffer for drawing plot data with numpy instead of canvas items.
+
+    Lines, spans and markers are written straight into a ``(height, width, 3)``
+    uint8 array; :meth:`to_ppm` returns bytes a Tk ``PhotoImage`` accepts, so a
+    whole plot costs one canvas item regardless of how many points it holds.
+    """
+
+    def __init__(self, width, height, background="#000000"):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.background = parse_color(background)
+        self.pixels = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.clear()
+
+    def region(self, x, y, width, height):
+        """A RasterImage drawing into a clipped sub-rectangle of this buffer."""
+        x0, y0 = max(0, int(x)), max(0, int(y))
+        x1, y1 = min(self.width, int(x) + int(width)), min(self.height, int(y) + int(height))
+        sub = RasterImage.__new__(RasterImage)
+        sub.width = max(0, x1 - x0)
+        sub.height = max(0, y1 - y0)
+        sub.background = self.background
+        sub.pixels = self.pixels[y0:y0 + sub.height, x0:x0 + sub.width]
+        return sub
+
+    def clear(self):
+        self.pixels[:] = self.background
+
+    def _stamp(self, px, py, rgb, size=1, alpha=None):
+        px = np.asarray(px, dtype=np.int64)
+        py = np.asarray(py, dtype=np.int64)
+        if size > 1:
+            offs = np.arange(size) - (size - 1) // 2
+            ox, oy = np.meshgrid(offs, offs)
+            px = (px[:, None] + ox.ravel()[None, :]).ravel()
+            py = (py[:, None] + oy.ravel()[None, :]).ravel()
+            if alpha is not None:
+                alpha = np.repeat(alpha, size * size)
+        keep = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        px = px[keep]
+        py = py[keep]
+        if alpha is None:
+            self.pixels[py, px] = rgb
+            return
+        alpha = alpha[keep]
+        # Overlapping samples keep the strongest coverage rather than summing.
+        cover = np.zeros((self.height, self.width), dtype=np.float32)
+        np.maximum.at(cover, (py, px), alpha)
+        ys, xs = np.nonzero(cover)
+        a = cover[ys, xs][:, None]
+        base = self.pixels[ys, xs].astype(np.float32)
+        self.pixels[ys, xs] = (base * (1.0 - a) + np.asarray(rgb, dtype=np.float32) * a + 0.5).astype(np.uint8)
+
+    def _fill_spans(self, cols, lo, hi, rgb, width=1):
+        """Fill vertical pixel runs given per-column ``lo``/``hi`` rows."""
+        pad = (width - 1) // 2
+        cols = np.repeat(cols, width) + np.tile(np.arange(width) - pad, len(cols))
+        lo = np.repeat(np.rint(lo).astype(np.int64), width) - pad
+        hi = np.repeat(np.rint(hi).astype(np.int64), width) - pad + width - 1
+        keep = (cols >= 0) & (cols < self.width) & (hi >= 0) & (lo < self.height)
+        if not keep.any():
+            return
+        # A connected x-sorted line passes through each column once, so all
+        # of a column's spans touch and merge into a single run.
+        col_lo = np.full(self.width, self.height, dtype=np.int64)
+        col_hi = np.full(self.width, -1, dtype=np.int64)
+        np.minimum.at(col_lo, cols[keep], np.maximum(lo[keep], 0))
+        np.maximum.at(col_hi, cols[keep], np.minimum(hi[keep], self.height - 1))
+        used = np.flatnonzero(col_hi >= col_lo)
+        counts = col_hi[used] - col_lo[used] + 1
+        px = np.repeat(used, counts)
+        py = np.repeat(col_lo[used] - np.cumsum(counts) + counts, counts) + np.arange(int(counts.sum()))
+        self.pixels[py, px] = rgb
+
+    def polyline(self, xs, ys, color, width=1, antialias=False):
+        """Draw a connected line through ``(xs, ys)`` in pixel coordinates."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        finite = np.isfinite(xs) & np.isfinite(ys)
+        xs = xs[finite]
+        ys = ys[finite]
+        if len(xs) == 0:
+            return
+        rgb = parse_color(color)
+        width = max(1, int(round(width)))
+        if len(xs) == 1:
+            self._stamp(np.rint(xs), np.rint(ys), rgb, width)
+            return
+        if not antialias and np.all(np.diff(xs) >= 0):
+            # Time series: fill per-column spans instead of walking every pixel.
+            self._fill_spans(*_column_spans(xs, ys), rgb, width)
+            return
+        px, py, steep = _segment_points(xs, ys)
+        if not antialias:
+            self._stamp(np.rint(px), np.rint(py), rgb, width)
+            return
+        # Split each sample between its two neighbours across the minor axis.
+        minor = np.where(steep, px, py)
+        base = np.floor(minor)
+        frac = (minor - base).astype(np.float32)
+        major = np.rint(np.where(steep, py, px))
+        sx = np.concatenate((np.where(steep, base, major), np.where(steep, base + 1, major)))
+        sy = np.concatenate((np.where(steep, major, base), np.where(steep, major, base + 1)))
+        self._stamp(sx, sy, rgb, width, alpha=np.concatenate((1.0 - frac, frac)))
+
+    def markers(self, xs, ys, color, radius=2):
+        """Draw filled circular markers centred on ``(xs, ys)``."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        finite = np.isfinite(xs) & np.isfinite(ys)
+        if not finite.any():
+            return
+        r = max(0, int(round(radius)))
+        cx = np.rint(xs[finite]).astype(np.int64) + r
+        cy = np.rint(ys[finite]).astype(np.int64) + r
+        # Mark centres on a padded grid, then dilate by the disk with shifted
+        # ORs: cost depends on image size, not on how many markers overlap.
+        keep = (cx >= 0) & (cx < self.width + 2 * r) & (cy >= 0) & (cy < self.height + 2 * r)
+        centres = np.zeros((self.height + 2 * r, self.width + 2 * r), dtype=bool)
+        centres[cy[keep], cx[keep]] = True
+        mask = np.zeros((self.height, self.width), dtype=bool)
+        for oy in range(-r, r + 1):
+            for ox in range(-r, r + 1):
+                if ox * ox + oy * oy <= r * r + r:
+                    mask |= centres[r + oy : r + oy + self.height, r + ox : r + ox + self.width]
+        self.pixels[mask] = parse_color(color)
+
+    def fill_rect(self, x0, y0, x1, y1, color):
+        xa, xb = sorted((int(round(x0)), int(round(x1))))
+        ya, yb = sorted((int(round(y0)), int(round(y1))))
+        xa, ya = max(xa, 0), max(ya, 0)
+        xb, yb = min(xb, self.width), min(yb, self.height)
+        if xb > xa and yb > ya:
+            self.pixels[ya:yb, xa:xb] = parse_color(color)
+
+    def hline(self, y, x0, x1, color):
+        self.fill_rect(x0, y, x1, int(round(y)) + 1, color)
+
+    def vline(self, x, y0, y1, color, dash=None):
+        xi = int(round(x))
+        if not 0 <= xi < self.width:
+            return
+        ya, yb = sorted((max(int(round(y0)), 0), min(int(round(y1)), self.height - 1)))
+        rows = np.arange(ya, yb + 1)
+        if dash:
+            on, off = dash
+            rows = rows[(rows - ya) % (on + off) < on]
+        self.pixels[rows, xi] = parse_color(color)
+
+    def to_ppm(self):
+        """Binary PPM (P6) bytes for ``tk.PhotoImage(data=..., format="PPM")``."""
+        header = f"P6 {self.width} {self.height} 255\n".encode("ascii")
+        return header + self.pixels.tobytes()
@@ -0,0 +1,212 @@
+import json
+import os
+import sqlite3
+import threading
+
+try:
+    from .session_store import read_journal
+except ImportError:
+    from session_store import read_journal
+
+RESULTS_DB_NAME = "sbs_dsw_results.sqlite3"
+RESULTS_QUERY_LIMIT = 5000
+# Run columns kept outside the summary JSON so they can be indexed and filtered.
+RESULTS_FILTER_COLUMNS = ("serial", "port", "operator", "severity", "session_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    session_id TEXT NOT NULL DEFAULT '',
+    port TEXT NOT NULL DEFAULT '',
+    serial TEXT NOT NULL DEFAULT '',
+    operator TEXT NOT NULL DEFAULT '',
+    severity TEXT NOT NULL DEFAULT '',
+    run_index INTEGER NOT NULL DEFAULT 1,
+    summary TEXT NOT NULL,
+    UNIQUE (session_id, port, serial, timestamp, run_index)
+);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+CREATE INDEX IF NOT EXISTS runs_serial ON runs (serial, timestamp);
+CREATE INDEX IF NOT EXISTS runs_port ON runs (port, timestamp);
+CREATE INDEX IF NOT EXISTS runs_operator ON runs (operator, timestamp);
+CREATE INDEX IF NOT EXISTS runs_severity ON runs (severity, timestamp);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    captured_at TEXT NOT NULL DEFAULT '',
+    raw TEXT NOT NULL DEFAULT '',
+    parsed TEXT NOT NULL,
+    PRIMARY KEY (run_id, idx)
+) WITHOUT ROWID;
+"""
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _run_index(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 1
+
+
+class ResultsDB:
+    """Local SQLite index of every run summary, optionally with its samples.
+
+    The summary dict is stored whole as JSON; timestamp, serial, port,
+    operator, severity and session are also columns with indexes, so history
+    queries touch only the matching rows. A run is identified by session,
+    port, serial, timestamp and run index, so importing the same session
+    file twice adds nothing. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+
+    def add_run(self, summary, samples=None):
+        """Insert one run summary (and its samples); returns the run id, or ``None`` if already stored."""
+        with self._lock, self._conn:
+            run_id = self._insert(summary)
+            if run_id is not None and samples:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO samples (run_id, idx, captured_at, raw, parsed) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            run_id,
+                            int(s.get("idx", i + 1)),
+                            _text(s.get("captured_at")),
+                            _text(s.get("raw")),
+                            json.dumps(s.get("parsed") or {}),
+                        )
+                        for i, s in enumerate(samples)
+                    ],
+                )
+        return run_id
+
+    def add_runs(self, summaries):
+        """Insert many run summaries in one transaction; returns how many were new."""
+        added = 0
+        with self._lock, self._conn:
+            for summary in summaries:
+                if isinstance(summary, dict) and self._insert(summary) is not None:
+                    added += 1
+        return added
+
+    def _insert(self, summary):
+        cur = self._conn.execute(
+            "INSERT OR IGNORE INTO runs (timestamp, session_id, port, serial, operator, severity, run_index, summary)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                _text(summary.get("timestamp")),
+                _text(summary.get("session_id")),
+                _text(summary.get("port")),
+                _text(summary.get("serial")),
+                _text(summary.get("operator")),
+                _text(summary.get("severity")),
+                _run_index(summary.get("run_index")),
+                json.dumps(summary, default=str),
+            ),
+        )
+        return cur.lastrowid if cur.rowcount else None
+
+    def query_runs(self, since=None, until=None, exclude_session=None, limit=RESULTS_QUERY_LIMIT, **filters):
+        """Run summaries, oldest first, each with its ``run_id``.
+
+        ``filters`` are exact matches on :data:`RESULTS_FILTER_COLUMNS` (a
+        list/tuple/set matches any of its values); ``since``/``until`` are ISO
+        timestamps. With ``limit``, the newest ``limit`` matching runs are
+        returned.
+        """
+        where = []
+        params = []
+        for column, value in filters.items():
+            if column not in RESULTS_FILTER_COLUMNS:
+                raise ValueError(f"Unknown results filter: {column}")
+            if value is None or value == "":
+                continue
+            if isinstance(value, (list, tuple, set, frozenset)):
+                values = [_text(v) for v in value]
+                if not values:
+                    return []
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                where.append(f"{column} = ?")
+                params.append(_text(value))
+        if since:
+            where.append("timestamp >= ?")
+            params.append(_text(since))
+        if until:
+            where.append("timestamp <= ?")
+            params.append(_text(until))
+        if exclude_session:
+            where.append("session_id != ?")
+            params.append(_text(exclude_session))
+        sql = "SELECT id, summary FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            found = self._conn.execute(sql, params).fetchall()
+        rows = []
+        for run_id, summary in reversed(found):
+            row = json.loads(summary)
+            row["run_id"] = run_id
+            rows.append(row)
+        return rows
+
+    def distinct(self, column):
+        """Sorted distinct non-empty values of one of :data:`RESULTS_FILTER_COLUMNS`."""
+        if column not in RESULTS_FILTER_COLUMNS:
+            raise ValueError(f"Unknown results column: {column}")
+        with self._lock:
+            found = self._conn.execute(f"SELECT DISTINCT {column} FROM runs WHERE {column} != '' ORDER BY {column}").fetchall()
+        return [value for (value,) in found]
+
+    def run_samples(self, run_id):
+        """Stored samples of one run as dicts (``idx``, ``captured_at``, ``raw`` plus parsed fields)."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT idx, captured_at, raw, parsed FROM samples WHERE run_id = ? ORDER BY idx", (int(run_id),)
+            ).fetchall()
+        out = []
+        for idx, captured_at, raw, parsed in found:
+            sample = {"idx": idx, "captured_at": captured_at, "raw": raw}
+            sample.update(json.loads(parsed))
+            out.append(sample)
+        return out
+
+    def run_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def session_file_rows(path):
+    """Run summaries from a saved session ``.json`` or a session ``.journal.jsonl``."""
+    if path.endswith(".jsonl"):
+        rows, _closed = read_journal(path)
+        return rows
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("rows", [data])
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
@@ -0,0 +1,153 @@
+import collections
+import threading
+import time
+
+SAMPLE_QUEUE_MAX = 10000
+
+
+class RunStarted:
+    """A unit run on ``port`` begins; ``total`` samples are expected."""
+
+    __slots__ = ("port", "serial", "total")
+
+    def __init__(self, port, serial, total):
+        self.port = port
+        self.serial = serial
+        self.total = total
+
+
+class Sample:
+    """One parsed sample: ``parsed`` maps field keys to values, ``raw`` is the instrument line."""
+
+    __slots__ = ("port", "serial", "idx", "total", "captured_at", "raw", "parsed")
+
+    def __init__(self, port, serial, idx, total, captured_at, raw, parsed):
+        self.port = port
+        self.serial = serial
+        self.idx = idx
+        self.total = total
+        self.captured_at = captured_at
+        self.raw = raw
+        self.parsed = parsed
+
+
+class SampleSubscription:
+    """One consumer's private, bounded queue on a :class:`SampleBus`.
+
+    When the consumer falls ``maxsize`` samples behind, the oldest
+    :class:`Sample` is dropped (and counted in :attr:`dropped`) rather than
+    slowing the publisher. Control messages such as :class:`RunStarted` are
+    never dropped and do not count toward ``maxsize``. Consume with
+    :meth:`drain` from your own loop or tick, or hand a handler to
+    :meth:`run` for a dedicated thread.
+    """
+
+    def __init__(self, bus, name, maxsize=SAMPLE_QUEUE_MAX):
+        self.bus = bus
+        self.name = name
+        self.maxsize = max(1, int(maxsize))
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.closed = False
+        # Samples and control messages queue separately so dropping the oldest
+        # sample is a popleft; drain merges them back by publish sequence.
+        self._samples = collections.deque()
+        self._control = collections.deque()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def offer(self, message):
+        with self._lock:
+            self._seq += 1
+            if isinstance(message, Sample):
+                if len(self._samples) >= self.maxsize:
+                    self._samples.popleft()
+                    self.dropped += 1
+                self._samples.append((self._seq, message))
+            else:
+                self._control.append((self._seq, message))
+        self._ready.set()
+
+    def drain(self, max_items=None):
+        """Pending messages, oldest first (at most ``max_items``)."""
+        with self._lock:
+            samples, control = self._samples, self._control
+            pending = len(samples) + len(control)
+            count = pending if max_items is None else min(pending, max(0, int(max_items)))
+            items = []
+            for _ in range(count):
+                if not control or (samples and samples[0][0] < control[0][0]):
+                    items.append(samples.popleft()[1])
+                else:
+                    items.append(control.popleft()[1])
+            if not samples and not control:
+                self._ready.clear()
+        return items
+
+    def run(self, handler, interval_s=0.0):
+        """Call ``handler(messages)`` on a daemon thread whenever messages are pending.
+
+        ``interval_s`` batches deliveries to at most one per interval. Handler
+        exceptions are counted in :attr:`errors` and do not stop the thread.
+        """
+
+        def loop():
+            while not self.closed:
+                if not self._ready.wait(0.5):
+                    continue
+                if interval_s and not self.closed:
+                    self._ready.clear()
+                    time.sleep(interval_s)
+                batch = self.drain()
+                if not batch:
+                    continue
+                try:
+                    handler(batch)
+                except Exception as exc:
+                    self.errors += 1
+                    self.last_error = exc
+
+        thread = threading.Thread(target=loop, name=f"sample-bus-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.closed = True
+        self.bus.unsubscribe(self)
+        self._ready.set()
+
+
+class SampleBus:
+    """In-process publish/subscribe for :class:`RunStarted` and :class:`Sample` messages.
+
+    Acquisition publishes each message once; every subscription gets it in
+    publish order in its own queue. Publishing never blocks on a consumer,
+    and consumers can be added without touching the publisher.
+    """
+
+    def __init__(self):
+        self._subscriptions = ()
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, name, maxsize=SAMPLE_QUEUE_MAX):
+        sub = SampleSubscription(self, name, maxsize)
+        with self._lock:
+            self._subscriptions = self._subscriptions + (sub,)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not sub)
+
+    def publish(self, message):
+        with self._lock:
+            self.published += 1
+            subscriptions = self._subscriptions
+        for sub in subscriptions:
+            sub.offer(message)
+
+    def subscriptions(self):
+        return list(self._subscriptions)
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import numpy as np
+
+# Only bounds how long a stop request waits; data is forwarded as soon as the
+# first byte arrives.
+BRIDGE_IDLE_TIMEOUT_S = 0.1
+BRIDGE_LATENCY_SAMPLES = 4096
+# Driver receive buffer requested for sniffer ports (Windows only), so a busy
+# interpreter delaying the reader does not overrun the port at high baud.
+SNIFFER_RX_BUFFER_BYTES = 1024 * 1024
+# Precise timing reads: a short timeout so a partly filled chunk is handed
+# over promptly, and chunks of at most this long / this many bytes.
+TIMED_READ_TIMEOUT_S = 0.01
+TIMED_CHUNK_S = 0.05
+TIMED_CHUNK_BYTES = 4096
+
+
+class ForwardLatency:
+    """Time each bridge forward spends between the read returning and the write returning.
+
+    Written by one forwarding thread and read by the UI; the latest
+    :data:`BRIDGE_LATENCY_SAMPLES` are kept in a ring for percentiles, plus
+    running totals.
+    """
+
+    def __init__(self, samples=BRIDGE_LATENCY_SAMPLES):
+        self._ring = np.zeros(samples, dtype=np.int64)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._ring[:] = 0
+            self.count = 0
+            self.bytes = 0
+            self.max_ns = 0
+            self.total_ns = 0
+
+    def add(self, elapsed_ns, nbytes):
+        with self._lock:
+            self._ring[self.count % len(self._ring)] = elapsed_ns
+            self.count += 1
+            self.bytes += nbytes
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+
+    def summary(self):
+        """``count``, ``bytes``, ``mean_us``, ``p50_us``, ``p99_us`` (recent forwards) and ``max_us``."""
+        with self._lock:
+            n = min(self.count, len(self._ring))
+            recent = self._ring[:n].copy()
+            count, nbytes, total, peak = self.count, self.bytes, self.total_ns, self.max_ns
+        if not n:
+            return {"count": 0, "bytes": 0, "mean_us": None, "p50_us": None, "p99_us": None, "max_us": None}
+        p50, p99 = np.percentile(recent, (50, 99))
+        return {
+            "count": count,
+            "bytes": nbytes,
+            "mean_us": total / count / 1000.0,
+            "p50_us": float(p50) / 1000.0,
+            "p99_us": float(p99) / 1000.0,
+            "max_us": peak / 1000.0,
+        }
+
+
+def forward_loop(source, dest, stop_event, on_data=None, latency=None):
+    """Copy ``source`` to ``dest`` until ``stop_event`` is set.
+
+    Blocks for the first byte, drains whatever else is already waiting, and
+    writes it straight away, so a burst goes out in one write and a single
+    byte is not held back by a read timeout. ``on_data(data, epoch)`` gets the
+    arrival time of the first byte; it runs only after the write and must be
+    cheap (e.g. posting to a queue).
+    ``latency`` (a :class:`ForwardLatency`) records the read-to-written time.
+    Serial errors propagate to the caller.
+    """
+    source.timeout = BRIDGE_IDLE_TIMEOUT_S
+    read = source.read
+    write = dest.write
+    clock = time.perf_counter_ns
+    while not stop_event.is_set():
+        data = read(1)
+        if not data:
+            continue
+        t0 = clock()
+        arrived = time.time()
+        waiting = source.in_waiting
+        if waiting:
+            data += read(waiting)
+        write(data)
+        t1 = clock()
+        if latency is not None:
+            latency.add(t1 - t0, len(data))
+        if on_data is not None:
+            on_data(data, arrived)
+
+
+def read_loop(source, stop_event, on_data):
+    """Read ``source`` until ``stop_event`` is set, handing each burst to ``on_data(data, epoch)``.
+
+    Same read pattern as :func:`forward_loop` (first byte, then everything
+    waiting), so a reader keeps up with high baud rates in few large reads.
+    """
+    source.timeout = BRIDGE_IDLE_TIMEOUT_S
+    read = source.read
+    while not stop_event.is_set():
+        data = read(1)
+        if not data:
+            continue
+        arrived = time.time()
+        waiting = source.in_waiting
+        if waiting:
+            data += read(waiting)
+        on_data(data, arrived)
+
+
+def timed_read_loop(source, stop_event, on_data, clock_origin):
+    """:func:`read_loop` that also times every read with ``time.perf_counter_ns()``.
+
+    Each read is one byte (blocking) plus whatever is already waiting, and
+    its timestamp is when the read returned, so a stall between bytes shows
+    up as a gap between reads rather than disappearing inside a large read.
+    Reads are gathered into chunks of up to :data:`TIMED_CHUNK_S` /
+    :data:`TIMED_CHUNK_BYTES` for ``on_data(data, epoch, marks)``, where
+    ``marks`` are ``(offset in data, ns)`` per read and ``epoch`` is the
+    first read's time converted with ``clock_origin`` (``(epoch, ns)``).
+    """
+    origin_epoch, origin_ns = clock_origin
+    source.timeout = TIMED_READ_TIMEOUT_S
+    read = source.read
+    clock = time.perf_counter_ns
+    chunk_ns = int(TIMED_CHUNK_S * 1e9)
+    buffer = bytearray()
+    marks = []
+    while not stop_event.is_set():
+        data = read(1)
+        if data:
+            waiting = source.in_waiting
+            if waiting:
+                data += read(waiting)
+            now = clock()
+            marks.append((len(buffer), now))
+            buffer += data
+            if now - marks[0][1] < chunk_ns and len(buffer) < TIMED_CHUNK_BYTES:
+                continue
+        if buffer:
+            on_data(bytes(buffer), origin_epoch + (marks[0][1] - origin_ns) / 1e9, marks)
+            buffer = bytearray()
+            marks = []
+    if buffer:
+        on_data(bytes(buffer), origin_epoch + (marks[0][1] - origin_ns) / 1e9, marks)
@@ -0,0 +1,186 @@
+import threading
+import time
+
+import serial
+
+# Bytes (and records) a tap keeps for readers that fall behind.
+TAP_RING_BYTES = 4 * 1024 * 1024
+TAP_RECORDS = 65536
+TAP_RX = 1
+TAP_TX = 2
+TAP_DIRECTIONS = {TAP_RX: "RX", TAP_TX: "TX"}
+
+
+class SerialTap:
+    """Raw bytes read from and written to one port, in a shared ring of records.
+
+    Every :meth:`record` stores one ``(data, ns, direction)`` record, with
+    ``data`` as immutable ``bytes`` (the object ``read`` returned, or one copy
+    of a written buffer) and ``ns`` from ``time.perf_counter_ns()``. Readers
+    get those same objects, so adding consumers costs no copies. Consumers get
+    a :class:`TapReader` each and :meth:`TapReader.close` it when done; with
+    no open readers nothing is recorded. The ring keeps at most ``records``
+    records and ``ring_bytes`` bytes; a reader that falls further behind loses
+    the oldest records and is told so.
+    """
+
+    def __init__(self, ring_bytes=TAP_RING_BYTES, records=TAP_RECORDS):
+        self.ring_bytes = int(ring_bytes)
+        self._slots = [None] * max(1, int(records))
+        self._lock = threading.Lock()
+        self._readers = 0
+        self._held_bytes = 0
+        self.oldest = 0  # sequence number of the oldest record still held
+        self.total_bytes = 0
+        self.count = 0
+        self.clock_origin = (time.time(), time.perf_counter_ns())
+
+    def record(self, data, direction, ns=None):
+        """Add ``data`` seen in ``direction`` (:data:`TAP_RX`/:data:`TAP_TX`) at ``ns``."""
+        if not data or not self._readers:
+            return
+        if ns is None:
+            ns = time.perf_counter_ns()
+        if type(data) is not bytes:
+            data = bytes(data)
+        slots = self._slots
+        with self._lock:
+            if self.count - self.oldest == len(slots):
+                self._release_oldest()
+            slots[self.count % len(slots)] = (data, ns, direction)
+            self.count += 1
+            self.total_bytes += len(data)
+            self._held_bytes += len(data)
+            while self._held_bytes > self.ring_bytes and self.count - self.oldest > 1:
+                self._release_oldest()
+
+    def _release_oldest(self):
+        i = self.oldest % len(self._slots)
+        self._held_bytes -= len(self._slots[i][0])
+        self._slots[i] = None
+        self.oldest += 1
+
+    @property
+    def has_readers(self):
+        return self._readers > 0
+
+    def reader(self):
+        """A :class:`TapReader` that starts with the next record."""
+        with self._lock:
+            self._readers += 1
+            return TapReader(self)
+
+    def _release(self):
+        with self._lock:
+            self._readers -= 1
+
+    def epoch_of_ns(self, ns):
+        epoch, origin_ns = self.clock_origin
+        return epoch + (ns - origin_ns) / 1e9
+
+
+class TapReader:
+    """One consumer's position in a :class:`SerialTap`."""
+
+    def __init__(self, tap):
+        self.tap = tap
+        self.position = tap.count
+        self.lost = 0
+        self.closed = False
+
+    def close(self):
+        """Stop reading; once a tap has no open readers it stops recording."""
+        if not self.closed:
+            self.closed = True
+            self.tap._release()
+
+    def read(self):
+        """``(data, ns, direction)`` for each record since the last call.
+
+        ``data`` is the tap's own immutable ``bytes``, shared with every other
+        reader. Records released before this call are counted in :attr:`lost`.
+        """
+        tap = self.tap
+        slots = tap._slots
+        with tap._lock:
+            count = tap.count
+            first = max(self.position, tap.oldest)
+            size = len(slots)
+            a, b = first % size, count % size
+            if first == count:
+                records = []
+            elif a < b:
+                records = slots[a:b]
+            else:
+                records = slots[a:] + slots[:b]
+        self.lost += first - self.position
+        self.position = count
+        return [(data, ns, TAP_DIRECTIONS.get(code)) for data, ns, code in records]
+
+    def read_chunks(self, port=None):
+        """New records as sniffer chunks ``(data, epoch, direction, port, marks)``.
+
+        Consecutive records in one direction become one chunk; ``marks`` keep
+        each record's ``(offset in chunk, perf_counter_ns)`` for gap analysis.
+        """
+        chunks = []
+        parts = []
+        marks = []
+        size = 0
+        direction = None
+        for data, ns, code in self.read():
+            if parts and code != direction:
+                chunks.append(self._chunk(parts, marks, direction, port))
+                parts, marks, size = [], [], 0
+            direction = code
+            marks.append((size, ns))
+            parts.append(data)
+            size += len(data)
+        if parts:
+            chunks.append(self._chunk(parts, marks, direction, port))
+        return chunks
+
+    def _chunk(self, parts, marks, direction, port):
+        return (b"".join(parts), self.tap.epoch_of_ns(marks[0][1]), direction, port, marks)
+
+
+class TappedSerial(serial.Serial):
+    """``serial.Serial`` that records every read and write in :attr:`tap`.
+
+    ``readline``/``read_until`` read a byte at a time underneath; they are
+    recorded once per call, with the time the call returned. The switch that
+    holds back the per-byte records is per thread, so a ``read`` on another
+    thread meanwhile is still recorded.
+    """
+
+    def __init__(self, *args, tap=None, **kwargs):
+        self.tap = tap if tap is not None else SerialTap()
+        self._in_read_until = threading.local()
+        super().__init__(*args, **kwargs)
+
+    def read(self, size=1):
+        data = super().read(size)
+        if data and not getattr(self._in_read_until, "active", False):
+            self.tap.record(data, TAP_RX)
+        return data
+
+    def read_until(self, expected=serial.LF, size=None):
+        if not self.tap.has_readers:
+            return super().read_until(expected, size)
+        self._in_read_until.active = True
+        try:
+            data = super().read_until(expected, size)
+        finally:
+            self._in_read_until.active = False
+        self.tap.record(data, TAP_RX)
+        return data
+
+    def readline(self, size=-1):
+        return self.read_until(serial.LF, None if size is None or size < 0 else size)
+
+    def write(self, data):
+        written = super().write(data)
+        if written is not None and written < len(data):
+            data = memoryview(data)[:written]
+        self.tap.record(data, TAP_TX)
+        return written
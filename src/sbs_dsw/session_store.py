@@ -0,0 +1,238 @@
+import csv
+import glob
+import json
+import os
+import socket
+import time
+
+SESSION_FSYNC_POLICIES = ("row", "interval", "off")
+SESSION_FSYNC_INTERVAL_S = 5.0
+JOURNAL_SUFFIX = ".journal.jsonl"
+# Enough of a journal's end to hold its last record.
+JOURNAL_TAIL_BYTES = 64 * 1024
+
+
+def journal_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + JOURNAL_SUFFIX
+
+
+def read_journal(path):
+    """``(rows, closed)`` from a session journal.
+
+    A torn last line (the app died mid-write) is skipped; ``closed`` tells
+    whether the writer shut down cleanly.
+    """
+    rows = []
+    closed = False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            if record.get("type") == "row" and isinstance(record.get("row"), dict):
+                rows.append(record["row"])
+                closed = False
+            elif record.get("type") == "close":
+                closed = True
+    return rows, closed
+
+
+def end_line(path):
+    """Terminate a torn last line in ``path`` so the next record starts on its own line."""
+    try:
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+
+def _journal_owner(path):
+    """``(host, closed)``: who opened the journal and whether its last record is a clean close."""
+    with open(path, "rb") as f:
+        first = f.readline()
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - JOURNAL_TAIL_BYTES))
+        tail = f.read().splitlines()
+    try:
+        host = json.loads(first).get("host")
+    except (ValueError, AttributeError):
+        host = None
+    closed = False
+    for line in reversed(tail):
+        try:
+            closed = json.loads(line).get("type") == "close"
+        except (ValueError, AttributeError):
+            continue
+        break
+    return host, closed
+
+
+def _superset(fieldnames, rows):
+    """``fieldnames`` followed by any keys the rows add, in first-seen order."""
+    names = list(dict.fromkeys(fieldnames))
+    seen = set(names)
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+    return names
+
+
+def write_csv(path, fieldnames, rows):
+    """Write ``rows`` under one header, replacing ``path`` atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SessionWriter:
+    """Session summary CSV plus a JSON-lines journal, both kept open for the session.
+
+    Each row goes to the journal first (the complete record, whatever its
+    keys), then to the CSV under a header that is a superset of
+    ``fieldnames``. A row with keys the header lacks rewrites the CSV once
+    from the journal under the widened header, so columns never shift.
+    ``fsync`` is ``"row"`` (every row reaches the disk before returning),
+    ``"interval"`` (at most every ``fsync_interval_s``) or ``"off"`` (flush
+    only, the OS decides).
+    """
+
+    def __init__(self, csv_path, fieldnames, fsync="row", fsync_interval_s=SESSION_FSYNC_INTERVAL_S):
+        if fsync not in SESSION_FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.path = csv_path
+        self.journal_path = journal_path_for(csv_path)
+        self.fsync = fsync
+        self.fsync_interval_s = float(fsync_interval_s)
+        self.row_count = 0
+        self._last_sync = time.monotonic()
+        self._csv_file = None
+        self._writer = None
+
+        rows = []
+        if os.path.exists(self.journal_path):
+            rows, _closed = read_journal(self.journal_path)
+        elif os.path.exists(csv_path):
+            # CSV from before journals existed: carry its rows over.
+            with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        self.row_count = len(rows)
+        end_line(self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        if self._journal.tell() == 0:
+            self._journal.write(json.dumps({"type": "open", "host": socket.gethostname()}) + "\n")
+            for row in rows:
+                self._journal.write(json.dumps({"type": "row", "row": row}) + "\n")
+        self.fieldnames = _superset(fieldnames, rows)
+        header = self._csv_header()
+        if header is not None and set(self.fieldnames) <= set(header):
+            self.fieldnames = header
+            self._open_csv()
+        else:
+            self._rewrite_csv(rows)
+        self._sync(force=True)
+
+    def append(self, row):
+        self._journal.write(json.dumps({"type": "row", "row": row}) + "\n")
+        self.row_count += 1
+        if any(key not in self._writer.fieldnames for key in row):
+            self._journal.flush()
+            self.fieldnames = _superset(self.fieldnames, [row])
+            self._rewrite_csv(self.rows())
+        else:
+            self._writer.writerow(row)
+        self._sync()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def rows(self):
+        """Every row written this session, complete, from the journal."""
+        self._journal.flush()
+        rows, _closed = read_journal(self.journal_path)
+        return rows
+
+    def close(self):
+        """Mark the journal cleanly closed and release both files."""
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps({"type": "close", "rows": self.row_count}) + "\n")
+        self._sync(force=True)
+        self._journal.close()
+        self._csv_file.close()
+        self._journal = None
+        self._csv_file = None
+
+    def _csv_header(self):
+        try:
+            with open(self.path, "r", newline="", encoding="utf-8") as f:
+                return next(csv.reader(f), None)
+        except OSError:
+            return None
+
+    def _open_csv(self):
+        self._csv_file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._csv_file, fieldnames=self.fieldnames, restval="")
+
+    def _rewrite_csv(self, rows):
+        if self._csv_file is not None:
+            self._csv_file.close()
+        write_csv(self.path, self.fieldnames, rows)
+        self._open_csv()
+
+    def _sync(self, force=False):
+        self._journal.flush()
+        self._csv_file.flush()
+        if self.fsync == "off" and not force:
+            return
+        now = time.monotonic()
+        if self.fsync == "interval" and not force and now - self._last_sync < self.fsync_interval_s:
+            return
+        os.fsync(self._journal.fileno())
+        os.fsync(self._csv_file.fileno())
+        self._last_sync = now
+
+
+def recover_sessions(session_dir, fieldnames):
+    """Rebuild the CSV and JSON of this host's sessions whose journal was never closed.
+
+    Call before opening this run's :class:`SessionWriter`. Journals opened on
+    other hosts are left alone: on a shared results folder they may belong to
+    a session that is still running. Returns ``(csv_path, row_count)`` per
+    recovered session.
+    """
+    recovered = []
+    host = socket.gethostname()
+    for journal in sorted(glob.glob(os.path.join(session_dir, "*" + JOURNAL_SUFFIX))):
+        try:
+            owner, closed = _journal_owner(journal)
+            if closed or owner != host:
+                continue
+            rows, _closed = read_journal(journal)
+        except OSError:
+            continue
+        base = journal[: -len(JOURNAL_SUFFIX)]
+        csv_path = base + ".csv"
+        write_csv(csv_path, _superset(fieldnames, rows), rows)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        end_line(journal)
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "close", "rows": len(rows), "recovered": True}) + "\n")
+        recovered.append((csv_path, len(rows)))
+    return recovered
@@ -0,0 +1,394 @@
+import datetime as dt
+import mmap
+import os
+import threading
+import time
+
+import numpy as np
+
+DIRECTION_CODES = {None: 0, "RX": 1, "TX": 2}
+DIRECTION_NAMES = {code: name for name, code in DIRECTION_CODES.items()}
+
+
+def direction_mask(codes, direction):
+    """Index rows shown under an RX/TX filter: that direction plus chunks with no direction.
+
+    Plain sniffer reads carry no direction (code 0); an RX or TX filter must
+    not hide them.
+    """
+    codes = np.asarray(codes)
+    return (codes == DIRECTION_CODES[direction]) | (codes == 0)
+
+
+# One row per captured read: where its bytes live in the data file and when,
+# in which direction and on which port (see SnifferCapture.ports) they were
+# seen.
+CAPTURE_INDEX_DTYPE = np.dtype(
+    [
+        ("offset", np.uint64),
+        ("length", np.uint32),
+        ("time", np.float64),
+        ("direction", np.uint8),
+        ("port", np.uint16),
+    ]
+)
+CAPTURE_INDEX_INITIAL = 4096
+# Precise timing mode: one row per read, the stream offset of its first byte
+# and time.perf_counter_ns() when the read returned.
+CAPTURE_TIMING_DTYPE = np.dtype([("offset", np.uint64), ("ns", np.int64)])
+
+
+class SnifferCapture:
+    """Append-only sniffer capture: raw bytes on disk plus a numpy chunk index.
+
+    Every read is appended to ``path`` as-is, so the data file is exactly the
+    byte stream that was seen and doubles as the ``.bin`` export. The index
+    (:data:`CAPTURE_INDEX_DTYPE`) records offset, length, epoch time and
+    direction per chunk; bytes are read back through an mmap of the data
+    file. Totals are running counters; the heap only grows by one small index
+    row per chunk, however large the capture gets.
+
+    Several ports can feed one capture: chunks carry an optional port name
+    (``ports[i]`` is the name of port id ``i``; id 0 is unlabelled). Each
+    appended batch is put in time order, but batches from different readers
+    can overlap in time, so time lookups go through a separate time-sorted
+    permutation of the index rather than the index itself.
+
+    Readers in precise timing mode pass per-read ``(offset in chunk,
+    perf_counter_ns)`` marks with each chunk; they are kept in a separate
+    :data:`CAPTURE_TIMING_DTYPE` array (:meth:`timing_rows`) and
+    :meth:`epoch_of_ns` converts them using the capture's ``clock_origin``.
+
+    Appends come from the UI thread; readers on other threads can use
+    :meth:`snapshot` and :meth:`read` concurrently.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w+b")
+        self._lock = threading.Lock()
+        self._index = np.zeros(CAPTURE_INDEX_INITIAL, dtype=CAPTURE_INDEX_DTYPE)
+        self._count = 0
+        self._time_order = np.zeros(0, dtype=np.int64)
+        self._time_order_count = 0
+        self._map = None
+        self._mapped_size = 0
+        self.total_bytes = 0
+        self.bytes_by_direction = {name: 0 for name in DIRECTION_CODES}
+        self.ports = [None]
+        self._port_ids = {None: 0}
+        self.bytes_by_port = {}
+        self._timing = np.zeros(0, dtype=CAPTURE_TIMING_DTYPE)
+        self._timing_count = 0
+        self.clock_origin = (time.time(), time.perf_counter_ns())
+
+    def __len__(self):
+        return self._count
+
+    def append(self, data, timestamp, direction=None, port=None):
+        self.extend([(data, timestamp, direction, port)])
+
+    def port_id(self, port, create=True):
+        """Index id for ``port`` (a name, or None), registering new names unless ``create`` is False (-1)."""
+        pid = self._port_ids.get(port)
+        if pid is None:
+            if not create:
+                return -1
+            pid = len(self.ports)
+            self.ports.append(port)
+            self._port_ids[port] = pid
+        return pid
+
+    def extend(self, chunks):
+        """Append ``(data, timestamp, direction[, port[, marks]])`` chunks with one file write.
+
+        Chunks are stored in timestamp order (stable, so reads from one port
+        keep their order). ``marks`` are the chunk's per-read
+        ``(offset in chunk, perf_counter_ns)`` pairs, if it has any.
+        """
+        chunks = [c for c in chunks if c[0]]
+        if not chunks:
+            return
+        times = np.fromiter((_epoch(c[1]) for c in chunks), dtype=np.float64, count=len(chunks))
+        if len(chunks) > 1 and np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="stable")
+            chunks = [chunks[i] for i in order]
+            times = times[order]
+        ports = [c[3] if len(c) > 3 else None for c in chunks]
+        with self._lock:
+            needed = self._count + len(chunks)
+            if needed > len(self._index):
+                grown = np.zeros(max(needed, 2 * len(self._index)), dtype=CAPTURE_INDEX_DTYPE)
+                grown[: self._count] = self._index[: self._count]
+                self._index = grown
+            rows = self._index[self._count : needed]
+            lengths = np.fromiter((len(c[0]) for c in chunks), dtype=np.uint64, count=len(chunks))
+            rows["length"] = lengths
+            rows["offset"] = self.total_bytes + np.cumsum(lengths) - lengths
+            rows["time"] = times
+            rows["direction"] = [DIRECTION_CODES.get(c[2], 0) for c in chunks]
+            rows["port"] = [self.port_id(port) for port in ports]
+            self._add_timing(chunks, rows["offset"])
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(b"".join(bytes(c[0]) for c in chunks))
+            self._file.flush()
+            for c, port in zip(chunks, ports):
+                self.bytes_by_direction[c[2] if c[2] in DIRECTION_CODES else None] += len(c[0])
+                self.bytes_by_port[port] = self.bytes_by_port.get(port, 0) + len(c[0])
+            self.total_bytes += int(lengths.sum())
+            start = self._count
+            self._count = needed
+            if self._time_order_count == start and (start == 0 or times[0] >= self._index["time"][self._time_order[start - 1]]):
+                self._time_order = _grow_order(self._time_order, needed)
+                self._time_order[start:needed] = np.arange(start, needed, dtype=np.int64)
+                self._time_order_count = needed
+
+    def _add_timing(self, chunks, offsets):
+        marks = [
+            (int(base) + rel, ns)
+            for c, base in zip(chunks, offsets.tolist())
+            if len(c) > 4 and c[4]
+            for rel, ns in c[4]
+        ]
+        if not marks:
+            return
+        needed = self._timing_count + len(marks)
+        if needed > len(self._timing):
+            grown = np.zeros(max(needed, 2 * len(self._timing), CAPTURE_INDEX_INITIAL), dtype=CAPTURE_TIMING_DTYPE)
+            grown[: self._timing_count] = self._timing[: self._timing_count]
+            self._timing = grown
+        self._timing[self._timing_count : needed] = marks
+        self._timing_count = needed
+
+    def timing_rows(self):
+        """Copy of the per-read timing rows (empty unless a reader used precise timing)."""
+        with self._lock:
+            return self._timing[: self._timing_count].copy()
+
+    def epoch_of_ns(self, ns):
+        """Epoch seconds for ``perf_counter_ns`` value(s) taken in this process."""
+        epoch, origin_ns = self.clock_origin
+        return epoch + (np.asarray(ns, dtype=np.int64) - origin_ns) / 1e9
+
+    def snapshot(self):
+        """``(index, data)`` covering everything captured so far.
+
+        ``index`` is a copy of the filled index rows and ``data`` an mmap (or
+        ``b""`` when empty) at least ``total_bytes`` long. Both stay valid
+        while more data is appended.
+        """
+        with self._lock:
+            return self._index[: self._count].copy(), self._view()
+
+    def read(self, offset, length):
+        """Captured bytes ``[offset, offset + length)`` of the stream."""
+        with self._lock:
+            data = self._view()
+        offset = max(0, int(offset))
+        return bytes(data[offset : min(offset + int(length), self.total_bytes)])
+
+    def port_names(self):
+        """Names of the labelled ports seen so far, in order of appearance."""
+        return [p for p in self.ports if p is not None]
+
+    def chunk(self, i):
+        """``(timestamp, data, direction)`` for chunk ``i``."""
+        row = self._index[: self._count][i]
+        return (
+            dt.datetime.fromtimestamp(float(row["time"])),
+            self.read(int(row["offset"]), int(row["length"])),
+            DIRECTION_NAMES.get(int(row["direction"])),
+        )
+
+    def iter_chunks(self):
+        index, data = self.snapshot()
+        for row in index:
+            start = int(row["offset"])
+            yield (
+                dt.datetime.fromtimestamp(float(row["time"])),
+                bytes(data[start : start + int(row["length"])]),
+                DIRECTION_NAMES.get(int(row["direction"])),
+            )
+
+    def index_rows(self, start=0, stop=None):
+        """Copy of index rows ``[start, stop)`` (or the rows picked by an index array)."""
+        with self._lock:
+            filled = self._index[: self._count]
+            if stop is None and not np.isscalar(start):
+                return filled[np.asarray(start, dtype=np.int64)]
+            return filled[start:stop].copy()
+
+    def data(self):
+        """Read-only view of the captured stream (an mmap, or ``b""`` when empty)."""
+        with self._lock:
+            return self._view()
+
+    def chunk_at_offset(self, offset):
+        """Index of the chunk holding stream byte ``offset`` (clamped to the capture)."""
+        with self._lock:
+            offsets = self._index["offset"][: self._count]
+            return max(0, int(np.searchsorted(offsets, int(offset), side="right")) - 1)
+
+    def chunk_at_time(self, epoch):
+        """Index of the earliest chunk captured at or after ``epoch`` seconds (else the latest chunk)."""
+        with self._lock:
+            if self._count == 0:
+                return 0
+            order = self._sorted_by_time()
+            times = self._index["time"][order]
+            pos = min(int(np.searchsorted(times, float(epoch), side="left")), self._count - 1)
+            return int(order[pos])
+
+    def start_time(self):
+        """Epoch time of the earliest chunk, or None for an empty capture."""
+        with self._lock:
+            if self._count == 0:
+                return None
+            return float(self._index["time"][self._sorted_by_time()[0]])
+
+    def _sorted_by_time(self):
+        """Row numbers in time order; rebuilt only after an out-of-order batch. Caller holds the lock."""
+        if self._time_order_count != self._count:
+            self._time_order = np.argsort(self._index["time"][: self._count], kind="stable")
+            self._time_order_count = self._count
+        return self._time_order[: self._count]
+
+    def _view(self):
+        if self.total_bytes == 0:
+            return b""
+        if self._mapped_size < self.total_bytes:
+            # The file only grows, so an older map stays valid for whoever
+            # still holds it; it is released once its last user lets go.
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = len(self._map)
+        return self._map
+
+    def close(self, remove=False):
+        with self._lock:
+            self._map = None
+            self._mapped_size = 0
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        if remove:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+def _grow_order(arr, needed):
+    if needed <= len(arr):
+        return arr
+    out = np.zeros(max(needed, 2 * len(arr), CAPTURE_INDEX_INITIAL), dtype=np.int64)
+    out[: len(arr)] = arr
+    return out
+
+
+def _epoch(timestamp):
+    if isinstance(timestamp, dt.datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class CaptureRows:
+    """Display rows over a :class:`SnifferCapture` for a virtualized viewer.
+
+    Each chunk is split into rows of ``bytes_per_row`` bytes (the first row of
+    a chunk carries its timestamp). Only per-chunk start rows are stored, so
+    mapping a row back to capture bytes is a ``searchsorted`` and building or
+    extending the model is vectorized over the index. ``direction`` limits the
+    rows to ``"RX"`` or ``"TX"`` chunks (plus direction-less ones, see
+    :func:`direction_mask`) and ``port`` to one port's chunks.
+    """
+
+    def __init__(self, capture, bytes_per_row, direction=None, port=None):
+        self.capture = capture
+        self.bytes_per_row = max(1, int(bytes_per_row))
+        self.direction = direction
+        self.port = port
+        self._chunk_ids = np.zeros(0, dtype=np.int64)
+        self._starts = np.zeros(0, dtype=np.int64)
+        self._used = 0
+        self._seen = 0
+        self.total_rows = 0
+        self.refresh()
+
+    def __len__(self):
+        return self.total_rows
+
+    def refresh(self):
+        """Pick up chunks appended since the last call; returns True if rows were added."""
+        new = self.capture.index_rows(self._seen)
+        if not len(new):
+            return False
+        ids = np.arange(self._seen, self._seen + len(new), dtype=np.int64)
+        self._seen += len(new)
+        if self.direction is not None:
+            keep = direction_mask(new["direction"], self.direction)
+            new = new[keep]
+            ids = ids[keep]
+        if self.port is not None:
+            keep = new["port"] == self.capture.port_id(self.port, create=False)
+            new = new[keep]
+            ids = ids[keep]
+        if not len(ids):
+            return False
+        rows = (new["length"].astype(np.int64) + self.bytes_per_row - 1) // self.bytes_per_row
+        needed = self._used + len(ids)
+        if needed > len(self._starts):
+            size = max(needed, 2 * len(self._starts), CAPTURE_INDEX_INITIAL)
+            self._chunk_ids = np.resize(self._chunk_ids, size)
+            self._starts = np.resize(self._starts, size)
+        self._chunk_ids[self._used : needed] = ids
+        self._starts[self._used : needed] = self.total_rows + np.cumsum(rows) - rows
+        self._used = needed
+        self.total_rows += int(rows.sum())
+        return True
+
+    def rows(self, start, stop):
+        """``(offset, data, time, direction, first_row_of_chunk, port)`` for rows ``[start, stop)``."""
+        start = max(0, int(start))
+        stop = min(int(stop), self.total_rows)
+        if stop <= start:
+            return []
+        row_ids = np.arange(start, stop, dtype=np.int64)
+        k = np.searchsorted(self._starts[: self._used], row_ids, side="right") - 1
+        line = row_ids - self._starts[k]
+        index = self.capture.index_rows(self._chunk_ids[k])
+        data = self.capture.data()
+        ports = self.capture.ports
+        out = []
+        for row, n in zip(index, line.tolist()):
+            offset = int(row["offset"]) + n * self.bytes_per_row
+            end = min(offset + self.bytes_per_row, int(row["offset"]) + int(row["length"]))
+            out.append(
+                (
+                    offset,
+                    bytes(data[offset:end]),
+                    float(row["time"]),
+                    DIRECTION_NAMES.get(int(row["direction"])),
+                    n == 0,
+                    ports[int(row["port"])],
+                )
+            )
+        return out
+
+    def row_for_chunk(self, chunk_id, offset=None):
+        """First row of ``chunk_id`` (or of the row holding ``offset``); the next shown chunk if filtered out."""
+        k = int(np.searchsorted(self._chunk_ids[: self._used], int(chunk_id), side="left"))
+        if k >= self._used:
+            return max(self.total_rows - 1, 0)
+        row = int(self._starts[k])
+        if offset is not None and int(self._chunk_ids[k]) == int(chunk_id):
+            first = int(self.capture.index_rows(int(chunk_id), int(chunk_id) + 1)["offset"][0])
+            row += max(0, int(offset) - first) // self.bytes_per_row
+        return min(row, max(self.total_rows - 1, 0))
+
+    def row_for_offset(self, offset):
+        return self.row_for_chunk(self.capture.chunk_at_offset(offset), offset)
+
+    def row_for_time(self, epoch):
+        return self.row_for_chunk(self.capture.chunk_at_time(epoch))
@@ -0,0 +1,199 @@
+import datetime as dt
+import os
+
+import numpy as np
+
+try:
+    from .byte_codec import DUMP_ASCII, to_hex
+    from .sniffer_capture import DIRECTION_NAMES, direction_mask
+    from .sniffer_pcapng import PcapngWriter
+except ImportError:
+    from byte_codec import DUMP_ASCII, to_hex
+    from sniffer_capture import DIRECTION_NAMES, direction_mask
+    from sniffer_pcapng import PcapngWriter
+
+EXPORT_WRITE_BUFFER = 1024 * 1024
+# Chunks formatted per write; also how often progress is reported.
+EXPORT_BATCH_CHUNKS = 2048
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def export_format_for_path(path):
+    """``bin``, ``hex``, ``pcapng`` or ``txt`` (hex dump) from the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    return {".bin": "bin", ".hex": "hex", ".pcapng": "pcapng"}.get(ext, "txt")
+
+
+def select_chunks(index, start=None, end=None, direction=None, port_id=None):
+    """Positions of index rows inside ``[start, end]`` (epoch seconds) and matching ``direction``/``port_id``.
+
+    Chunks with no direction pass any ``direction`` filter.
+    """
+    keep = np.ones(len(index), dtype=bool)
+    if start is not None:
+        keep &= index["time"] >= float(start)
+    if end is not None:
+        keep &= index["time"] <= float(end)
+    if direction is not None:
+        keep &= direction_mask(index["direction"], direction)
+    if port_id is not None:
+        keep &= index["port"] == port_id
+    return np.flatnonzero(keep)
+
+
+def _time_labels(times, fmt):
+    """``strftime(fmt)`` plus milliseconds per epoch time, formatting each second once."""
+    out = []
+    last_second = None
+    prefix = ""
+    for t in times:
+        # Round to microseconds first, as datetime.fromtimestamp does.
+        second, micros = divmod(round(t * 1e6), 1_000_000)
+        if second != last_second:
+            prefix = dt.datetime.fromtimestamp(second).strftime(fmt)
+            last_second = second
+        out.append(f"{prefix}.{micros // 1000:03d}")
+    return out
+
+
+def _hex_lines(index, data):
+    out = []
+    labels = _time_labels(index["time"].tolist(), "%H:%M:%S")
+    for start, length, ts in zip(index["offset"].tolist(), index["length"].tolist(), labels):
+        out.append(f"[{ts}] {to_hex(data[start:start + length])}\n")
+    return out
+
+
+# Row 256 is the filler for positions past the end of a short line.
+_HEX3 = np.frombuffer(b"".join(f"{b:02X} ".encode("ascii") for b in range(256)) + b"   ", dtype=np.uint8).reshape(257, 3)
+_HEX2 = _HEX3[:256, :2]
+_DUMP_ASCII_ARRAY = np.frombuffer(DUMP_ASCII + b"\0", dtype=np.uint8)
+_BAR = "│".encode("utf-8")
+_NEWLINE = os.linesep.encode("ascii")
+# "OOOOOOOO  " + 16 x "HH " + "  " + bar + 16 ASCII + bar + newline
+_DUMP_HEX_COL = 10
+_DUMP_ASCII_COL = _DUMP_HEX_COL + 48 + 2 + len(_BAR)
+_DUMP_LINE_TEMPLATE = np.frombuffer(
+    b" " * (_DUMP_ASCII_COL - len(_BAR)) + _BAR + b"\0" * 16 + _BAR + _NEWLINE, dtype=np.uint8
+)
+
+
+def _dump_block(index, data):
+    """Hex dump of ``index`` chunks, one ``--- time ---`` header per chunk.
+
+    Produced as UTF-8 bytes with native line endings, for a binary-mode file.
+    All 16-byte lines of the batch are laid out at once in a numpy array with
+    lookup tables. The ASCII column of short lines is padded with NULs that
+    are stripped afterwards, so the closing bar follows the last character
+    as in a plain text dump.
+    """
+    lengths = index["length"].astype(np.int64)
+    offsets = index["offset"].astype(np.int64)
+    lines_per = (lengths + 15) // 16
+    first_line = np.cumsum(lines_per) - lines_per
+    chunk_of_line = np.repeat(np.arange(len(index)), lines_per)
+    line_in_chunk = np.arange(int(lines_per.sum())) - first_line[chunk_of_line]
+    line_off = offsets[chunk_of_line] + 16 * line_in_chunk
+    line_n = np.minimum(16, lengths[chunk_of_line] - 16 * line_in_chunk)
+
+    # Copy each chunk into its run of 16-byte line slots with one 1-D gather;
+    # slots past the end of a chunk hold 256, the filler row of the tables.
+    n = len(line_off)
+    total = int(lengths.sum())
+    byte_start = np.cumsum(lengths) - lengths
+    within = np.arange(total) - np.repeat(byte_start, lengths)
+    values = np.full(n * 16, 256, dtype=np.intp)
+    values[np.repeat(first_line * 16, lengths) + within] = np.take(
+        np.frombuffer(data, dtype=np.uint8), np.repeat(offsets, lengths) + within
+    )
+    values = values.reshape(n, 16)
+
+    rows = np.tile(_DUMP_LINE_TEMPLATE, (n, 1))
+    offset_bytes = line_off.astype(">u4").view(np.uint8).reshape(n, 4)
+    rows[:, :8] = np.take(_HEX2, offset_bytes, axis=0).reshape(n, 8)
+    rows[:, _DUMP_HEX_COL:_DUMP_HEX_COL + 48] = np.take(_HEX3, values, axis=0).reshape(n, 48)
+    rows[:, _DUMP_ASCII_COL:_DUMP_ASCII_COL + 16] = np.take(_DUMP_ASCII_ARRAY, values)
+
+    body = rows.tobytes().replace(b"\0", b"")
+    row_bytes = rows.shape[1] - (16 - line_n)
+    line_ends = np.concatenate(([0], np.cumsum(row_bytes)))
+    chunk_ends = line_ends[np.cumsum(lines_per)].tolist()
+    chunk_starts = line_ends[first_line].tolist()
+    out = []
+    for ts, a, b in zip(_time_labels(index["time"].tolist(), "%Y-%m-%d %H:%M:%S"), chunk_starts, chunk_ends):
+        out.append(f"--- {ts} ---".encode("ascii") + _NEWLINE)
+        out.append(body[a:b])
+    return b"".join(out)
+
+
+def export_capture(
+    capture, path, fmt=None, start=None, end=None, direction=None, cancel=None, progress=None, port=None, port_filter=None
+):
+    """Stream a :class:`SnifferCapture` (or a time/direction slice of it) to ``path``.
+
+    ``fmt`` is ``bin`` (raw bytes), ``hex`` (one timestamped hex line per
+    chunk), ``pcapng`` (one packet per chunk on a port RX/TX interface;
+    ``port`` names chunks captured without one) or ``txt`` (hex dump with
+    chunk headers); by default it follows the extension. ``port_filter``
+    keeps only one port's chunks.
+
+    Output goes to ``path + ".part"`` and is renamed on success, so a
+    cancelled export (``cancel`` set) leaves nothing behind and raises
+    :class:`ExportCancelled`. ``progress(done_bytes, total_bytes)`` is called
+    per batch. Returns ``(chunks, bytes)`` exported.
+    """
+    fmt = fmt or export_format_for_path(path)
+    index = capture.index_rows(0, len(capture))
+    data = capture.data()
+    filtered = start is not None or end is not None or direction is not None or port_filter is not None
+    if filtered:
+        port_id = None if port_filter is None else capture.port_id(port_filter, create=False)
+        index = index[select_chunks(index, start, end, direction, port_id)]
+    total = int(index["length"].sum()) if len(index) else 0
+    part = path + ".part"
+    done = 0
+    mode, encoding = ("w", "utf-8") if fmt == "hex" else ("wb", None)
+    try:
+        with open(part, mode, buffering=EXPORT_WRITE_BUFFER, encoding=encoding) as f:
+            pcapng = PcapngWriter(f) if fmt == "pcapng" else None
+            port_names = [name or port or "serial" for name in capture.ports]
+            if fmt == "bin" and not filtered:
+                # The capture data file already is the raw stream.
+                with open(capture.path, "rb") as src:
+                    while done < total:
+                        if cancel is not None and cancel.is_set():
+                            raise ExportCancelled()
+                        block = src.read(min(EXPORT_WRITE_BUFFER * 8, total - done))
+                        if not block:
+                            break
+                        f.write(block)
+                        done += len(block)
+                        if progress is not None:
+                            progress(done, total)
+            else:
+                for i in range(0, len(index), EXPORT_BATCH_CHUNKS):
+                    if cancel is not None and cancel.is_set():
+                        raise ExportCancelled()
+                    batch = index[i : i + EXPORT_BATCH_CHUNKS]
+                    if fmt == "bin":
+                        f.write(b"".join(bytes(data[int(r["offset"]) : int(r["offset"]) + int(r["length"])]) for r in batch))
+                    elif fmt == "hex":
+                        f.write("".join(_hex_lines(batch, data)))
+                    elif pcapng is not None:
+                        pcapng.write_index(batch, data, port_names, DIRECTION_NAMES)
+                    else:
+                        f.write(_dump_block(batch, data))
+                    done += int(batch["length"].sum())
+                    if progress is not None:
+                        progress(done, total)
+        os.replace(part, path)
+    except BaseException:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
+    return len(index), done
@@ -0,0 +1,133 @@
+import re
+
+try:
+    from .byte_codec import BIN_TABLE, DEC_TABLE, ESCAPE_TABLE, HEXDUMP_BYTES_PER_LINE, ROW_ESCAPE_TABLE, to_hex
+except ImportError:
+    from byte_codec import BIN_TABLE, DEC_TABLE, ESCAPE_TABLE, HEXDUMP_BYTES_PER_LINE, ROW_ESCAPE_TABLE, to_hex
+
+# Bytes shown per row by the virtualized viewer, per display mode.
+ROW_BYTES = {"hexdump": HEXDUMP_BYTES_PER_LINE, "hex": 32, "ascii": 64, "dec": 16, "bin": 8}
+
+_PRINTABLE_RUNS = re.compile(rb"[\x20-\x7e]+|[^\x20-\x7e]+")
+
+
+class TagRuns:
+    """Flat ``text, tags, text, tags, ...`` list for a single ``Text.insert``.
+
+    Adjacent pieces with the same tag are merged, so a chunk costs one Tcl
+    call with one run per colour change instead of one call per byte.
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def add(self, text, tag=""):
+        if not text:
+            return
+        parts = self.parts
+        if parts and parts[-1] == tag:
+            parts[-2] += text
+        else:
+            parts.append(text)
+            parts.append(tag)
+
+    def __len__(self):
+        return len(self.parts) // 2
+
+    def text(self):
+        return "".join(self.parts[0::2])
+
+
+def data_tag(direction, default):
+    """Tag for the payload columns: ``rx``/``tx`` in mirror mode, else ``default``."""
+    if not direction:
+        return default
+    return "rx" if direction.upper() == "RX" else "tx"
+
+
+def _add_printable_runs(runs, data, text_tag, escape_table=None):
+    for match in _PRINTABLE_RUNS.finditer(data):
+        run = match.group()
+        if 32 <= run[0] <= 126:
+            runs.add(run.decode("ascii"), text_tag)
+        elif escape_table is not None:
+            runs.add("".join(map(escape_table.__getitem__, run)), "nonprint")
+        else:
+            runs.add("." * len(run), "nonprint")
+
+
+def format_hexdump(runs, data, offset, ts_text=None, direction=None):
+    """Offset | hex bytes | ASCII lines; returns the offset after ``data``."""
+    hex_tag = data_tag(direction, "hex")
+    for i in range(0, len(data), HEXDUMP_BYTES_PER_LINE):
+        chunk = data[i:i + HEXDUMP_BYTES_PER_LINE]
+        if ts_text and i == 0:
+            runs.add(ts_text + " ", "timestamp")
+        runs.add(f"{offset:08X}  ", "offset")
+        left = chunk[:8].hex(" ").upper()
+        if len(chunk) > 8:
+            left += "  " + chunk[8:].hex(" ").upper()
+        runs.add(left.ljust(50), hex_tag)
+        runs.add(" │ ", "offset")
+        _add_printable_runs(runs, chunk, "ascii")
+        runs.add("\n")
+        offset += len(chunk)
+    return offset
+
+
+def format_hex(runs, data, ts_text=None, direction=None):
+    if ts_text:
+        runs.add(f"[{ts_text}] ", "timestamp")
+    runs.add(to_hex(data) + " ", data_tag(direction, "hex"))
+
+
+def format_ascii(runs, data, ts_text=None, direction=None, escape_table=ESCAPE_TABLE):
+    """Printable runs in the data tag; CR/LF/TAB and other bytes escaped as ``nonprint``."""
+    if ts_text:
+        runs.add(f"[{ts_text}] ", "timestamp")
+    _add_printable_runs(runs, data, data_tag(direction, "ascii"), escape_table)
+
+
+def format_binary(runs, data, ts_text=None, direction=None):
+    if ts_text:
+        runs.add(f"[{ts_text}] ", "timestamp")
+    runs.add(" ".join(map(BIN_TABLE.__getitem__, data)) + " ", data_tag(direction, "hex"))
+
+
+def format_decimal(runs, data, ts_text=None, direction=None):
+    if ts_text:
+        runs.add(f"[{ts_text}] ", "timestamp")
+    runs.add(" ".join(map(DEC_TABLE.__getitem__, data)) + " ", data_tag(direction, "hex"))
+
+
+def format_row(runs, mode, data, offset, ts_text=None, direction=None, continuation=False, port=None, port_tag="port"):
+    """One viewer row of ``mode`` for up to :data:`ROW_BYTES` bytes at stream ``offset``.
+
+    Rows of RX/TX chunks are prefixed with the direction, and with ``port``
+    (tagged ``port_tag``) when given. ``continuation`` rows (not the first of
+    their chunk) get blank padding in place of the port, direction and
+    timestamp, so columns stay aligned.
+    """
+    port_text = f"[{port}] " if port else ""
+    dir_text = f"[{direction}] " if direction else ""
+    ts_part = ""
+    if ts_text:
+        ts_part = f"{ts_text} " if mode == "hexdump" else f"[{ts_text}] "
+    if continuation:
+        runs.add(" " * (len(port_text) + len(dir_text) + len(ts_part)))
+    else:
+        runs.add(port_text, port_tag)
+        runs.add(dir_text, data_tag(direction, "hex"))
+        runs.add(ts_part, "timestamp")
+    if mode == "hexdump":
+        format_hexdump(runs, data, offset, direction=direction)
+        return
+    if mode == "hex":
+        format_hex(runs, data, direction=direction)
+    elif mode == "ascii":
+        format_ascii(runs, data, direction=direction, escape_table=ROW_ESCAPE_TABLE)
+    elif mode == "dec":
+        format_decimal(runs, data, direction=direction)
+    else:
+        format_binary(runs, data, direction=direction)
+    runs.add("\n")
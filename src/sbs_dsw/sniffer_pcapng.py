@@ -0,0 +1,199 @@
+import struct
+
+# Wireshark's first "user" link type; packet tools can map it to a dissector.
+LINKTYPE_USER0 = 147
+PCAPNG_APPLICATION = "SBS Engineer Field Kit"
+
+_SHB_TYPE = 0x0A0D0D0A
+_IDB_TYPE = 0x00000001
+_EPB_TYPE = 0x00000006
+_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+_OPT_ENDOFOPT = 0
+_OPT_SHB_USERAPPL = 4
+_OPT_IF_NAME = 2
+_OPT_IF_DESCRIPTION = 3
+_OPT_IF_TSRESOL = 9
+_OPT_EPB_FLAGS = 2
+
+# epb_flags bits 0-1: 1 = inbound, 2 = outbound.
+_EPB_DIRECTION_FLAGS = {"RX": 1, "TX": 2}
+
+_EPB_HEAD = struct.Struct("<IIIIIII")
+_EPB_FLAGS_OPTION = struct.Struct("<HHIHH")
+_U32 = struct.Struct("<I")
+_PAD = (b"", b"\0\0\0", b"\0\0", b"\0")
+
+
+def _option(code, value):
+    return struct.pack("<HH", code, len(value)) + value + _PAD[len(value) % 4]
+
+
+def _block(block_type, body):
+    length = 12 + len(body)
+    return struct.pack("<II", block_type, length) + body + _U32.pack(length)
+
+
+def interface_name(port, direction):
+    """``COM3``, ``COM3 RX`` or ``COM3 TX``."""
+    return f"{port} {direction}" if direction else port
+
+
+class PcapngWriter:
+    """Stream serial chunks into a pcapng file, one interface per port and direction.
+
+    Interfaces use :data:`LINKTYPE_USER0` and nanosecond timestamps
+    (``if_tsresol`` 9); each chunk becomes one Enhanced Packet Block whose
+    ``epb_flags`` carry the direction. Interface blocks are written the first
+    time a port/direction shows up, so the file can be fed while capturing.
+    """
+
+    def __init__(self, path_or_file):
+        if isinstance(path_or_file, (str, bytes)) or hasattr(path_or_file, "__fspath__"):
+            self._file = open(path_or_file, "wb")
+            self._owns_file = True
+        else:
+            self._file = path_or_file
+            self._owns_file = False
+        self.path = getattr(self._file, "name", None)
+        self._interfaces = {}
+        self.packet_count = 0
+        body = struct.pack("<IHHq", _BYTE_ORDER_MAGIC, 1, 0, -1)
+        body += _option(_OPT_SHB_USERAPPL, PCAPNG_APPLICATION.encode("utf-8")) + _option(_OPT_ENDOFOPT, b"")
+        self._file.write(_block(_SHB_TYPE, body))
+
+    def interface(self, port, direction=None):
+        """Interface id for ``(port, direction)``, writing its description block on first use."""
+        key = (port, direction)
+        if_id = self._interfaces.get(key)
+        if if_id is None:
+            if_id = len(self._interfaces)
+            self._interfaces[key] = if_id
+            body = struct.pack("<HHI", LINKTYPE_USER0, 0, 0)
+            body += _option(_OPT_IF_NAME, interface_name(port, direction).encode("utf-8"))
+            if direction:
+                body += _option(_OPT_IF_DESCRIPTION, f"Serial {direction} on {port}".encode("utf-8"))
+            body += _option(_OPT_IF_TSRESOL, bytes([9])) + _option(_OPT_ENDOFOPT, b"")
+            self._file.write(_block(_IDB_TYPE, body))
+        return if_id
+
+    def _packet(self, if_id, ts_ns, data, direction):
+        n = len(data)
+        flags = _EPB_DIRECTION_FLAGS.get(direction)
+        options = b"" if flags is None else _EPB_FLAGS_OPTION.pack(_OPT_EPB_FLAGS, 4, flags, _OPT_ENDOFOPT, 0)
+        length = 32 + n + (-n % 4) + len(options)
+        return b"".join(
+            (
+                _EPB_HEAD.pack(_EPB_TYPE, length, if_id, ts_ns >> 32, ts_ns & 0xFFFFFFFF, n, n),
+                data,
+                _PAD[n % 4],
+                options,
+                _U32.pack(length),
+            )
+        )
+
+    def write_chunks(self, chunks, port):
+        """Append ``(data, timestamp, direction[, port])`` chunks; ``port`` names unlabelled ones.
+
+        ``timestamp`` is a ``datetime``, epoch seconds or integer epoch
+        nanoseconds.
+        """
+        out = []
+        for chunk in chunks:
+            data, timestamp, direction = chunk[:3]
+            if not data:
+                continue
+            chunk_port = (chunk[3] if len(chunk) > 3 else None) or port
+            out.append(self._packet(self.interface(chunk_port, direction), _epoch_ns(timestamp), bytes(data), direction))
+        if out:
+            self._file.write(b"".join(out))
+            self.packet_count += len(out)
+
+    def write_index(self, index, data, port_names, direction_names):
+        """Append capture index rows (``offset``/``length``/``time``/``direction``/``port``) read from ``data``.
+
+        ``port_names`` maps the index's port ids to interface port names.
+        """
+        if not len(index):
+            return
+        keys = sorted(set(zip(index["port"].tolist(), index["direction"].tolist())))
+        ids = {key: self.interface(port_names[key[0]], direction_names[key[1]]) for key in keys}
+        times = (index["time"] * 1e9).round().astype("int64").tolist()
+        out = []
+        for start, length, ts_ns, code, pid in zip(
+            index["offset"].tolist(), index["length"].tolist(), times, index["direction"].tolist(), index["port"].tolist()
+        ):
+            out.append(self._packet(ids[(pid, code)], ts_ns, data[start:start + length], direction_names[code]))
+        self._file.write(b"".join(out))
+        self.packet_count += len(out)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def _epoch_ns(timestamp):
+    if isinstance(timestamp, int):
+        return timestamp
+    if hasattr(timestamp, "timestamp"):
+        timestamp = timestamp.timestamp()
+    return int(round(float(timestamp) * 1e9))
+
+
+def read_pcapng(path):
+    """``(data, epoch_seconds, direction, port)`` per packet of a pcapng file, in file order.
+
+    Understands the files :class:`PcapngWriter` produces (and other
+    little-endian pcapng with Enhanced Packet Blocks): the direction comes
+    from ``epb_flags`` or an ``RX``/``TX`` suffix of the interface name, the
+    port from the rest of the name.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    out = []
+    interfaces = []
+    pos = 0
+    while pos + 12 <= len(raw):
+        block_type, length = struct.unpack_from("<II", raw, pos)
+        if length < 12 or pos + length > len(raw):
+            raise ValueError(f"Truncated pcapng block at byte {pos}")
+        body = raw[pos + 8 : pos + length - 4]
+        if block_type == _SHB_TYPE:
+            if struct.unpack_from("<I", body)[0] != _BYTE_ORDER_MAGIC:
+                raise ValueError("Only little-endian pcapng files are supported")
+            interfaces = []
+        elif block_type == _IDB_TYPE:
+            options = _parse_options(body[8:])
+            name = options.get(_OPT_IF_NAME, b"").decode("utf-8", errors="replace")
+            tsresol = options.get(_OPT_IF_TSRESOL, b"\x06")[0]
+            scale = 2.0 ** -(tsresol & 0x7F) if tsresol & 0x80 else 10.0 ** -tsresol
+            port, _sep, suffix = name.rpartition(" ")
+            direction = suffix if suffix in ("RX", "TX") else None
+            interfaces.append((port if direction else name, direction, scale))
+        elif block_type == _EPB_TYPE:
+            if_id, ts_high, ts_low, captured, _original = struct.unpack_from("<IIIII", body)
+            port, direction, scale = interfaces[if_id]
+            flags = _parse_options(body[20 + captured + (-captured % 4) :]).get(_OPT_EPB_FLAGS)
+            if flags is not None:
+                code = struct.unpack("<I", flags[:4])[0] & 3
+                direction = {1: "RX", 2: "TX"}.get(code, direction)
+            out.append((body[20 : 20 + captured], ((ts_high << 32) | ts_low) * scale, direction, port or None))
+        pos += length
+    return out
+
+
+def _parse_options(raw):
+    options = {}
+    pos = 0
+    while pos + 4 <= len(raw):
+        code, length = struct.unpack_from("<HH", raw, pos)
+        if code == _OPT_ENDOFOPT:
+            break
+        options.setdefault(code, raw[pos + 4 : pos + 4 + length])
+        pos += 4 + length + (-length % 4)
+    return options
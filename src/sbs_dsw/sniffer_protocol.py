@@ -0,0 +1,260 @@
+import re
+
+import numpy as np
+
+try:
+    from .sniffer_capture import DIRECTION_NAMES
+except ImportError:
+    from sniffer_capture import DIRECTION_NAMES
+
+# A message also ends when its direction goes quiet this long (prompts such
+# as "S>" have no line terminator).
+FRAME_GAP_S = 0.25
+RESPONSE_TIMEOUT_S = 2.0
+ERROR_PATTERN = re.compile(rb"\?CMD|\bERROR\b", re.IGNORECASE)
+LATENCY_BINS_MS = (0, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_TERMINATORS = re.compile(rb"[\r\n]+")
+_COMMAND_SPLIT = re.compile(r"[=\s,]")
+
+
+class Message:
+    """One framed line/message in a single direction."""
+
+    __slots__ = ("direction", "start", "end", "offset", "data")
+
+    def __init__(self, direction, start, end, offset, data):
+        self.direction = direction
+        self.start = start
+        self.end = end
+        self.offset = offset
+        self.data = data
+
+    def text(self):
+        return self.data.decode("ascii", errors="replace")
+
+
+class Transaction:
+    """A TX command and the RX messages that answered it."""
+
+    __slots__ = ("port", "command", "command_type", "time", "offset", "responses", "first_response", "status")
+
+    def __init__(self, message, port=None):
+        self.port = port
+        self.command = message.text()
+        self.command_type = command_type(self.command)
+        self.time = message.end
+        self.offset = message.offset
+        self.responses = []
+        self.first_response = None
+        self.status = "pending"
+
+    @property
+    def latency_s(self):
+        if self.first_response is None:
+            return None
+        return max(0.0, self.first_response - self.time)
+
+    @property
+    def response_bytes(self):
+        return sum(len(m.data) for m in self.responses)
+
+    def response_text(self):
+        return " | ".join(m.text() for m in self.responses)
+
+
+def command_type(text):
+    """``SETTIME`` for ``SetTime=2024...``, ``DS`` for ``ds``; the first word of a command, upper case."""
+    word = _COMMAND_SPLIT.split(text.strip(), 1)[0]
+    return word.upper() or "?"
+
+
+class _Framer:
+    def __init__(self, direction):
+        self.direction = direction
+        self.buffer = bytearray()
+        self.start = None
+        self.last = None
+        self.offset = 0
+
+    def feed(self, data, time, offset):
+        """Split ``data`` on CR/LF; returns the messages it completes."""
+        out = []
+        pos = 0
+        for match in _TERMINATORS.finditer(data):
+            self._add(data[pos:match.start()], time, offset + pos)
+            msg = self.flush(time)
+            if msg is not None:
+                out.append(msg)
+            pos = match.end()
+        self._add(data[pos:], time, offset + pos)
+        return out
+
+    def _add(self, part, time, offset):
+        if not part:
+            return
+        if not self.buffer:
+            self.start = time
+            self.offset = offset
+        self.buffer += part
+        self.last = time
+
+    def flush(self, time=None):
+        if not self.buffer.strip():
+            self.buffer.clear()
+            return None
+        msg = Message(self.direction, self.start, self.last if time is None else time, self.offset, bytes(self.buffer).strip())
+        self.buffer.clear()
+        return msg
+
+
+class TransactionDecoder:
+    """Frame a :class:`SnifferCapture` into messages and pair TX commands with RX responses.
+
+    Each port and direction is split into lines on CR/LF, or when it goes
+    quiet for ``gap_s`` or the other side starts talking. Every TX message
+    opens a transaction on its port; RX messages on that port up to the next
+    command are its response. Latency runs from the end of the command to the
+    first response byte; a command with no response within ``timeout_s`` is a
+    ``timeout`` and one whose response matches :data:`ERROR_PATTERN` an
+    ``error``.
+
+    :meth:`refresh` decodes only chunks appended since the last call, so the
+    table can follow a live capture; :meth:`expire` times out commands while
+    the capture is quiet. ``answered`` counts commands with a response.
+    """
+
+    def __init__(self, capture, timeout_s=RESPONSE_TIMEOUT_S, gap_s=FRAME_GAP_S):
+        self.capture = capture
+        self.timeout_s = timeout_s
+        self.gap_s = gap_s
+        self.transactions = []
+        self.unsolicited = 0
+        self.answered = 0
+        self._framers = {}
+        self._open = {}  # port id -> index of its open transaction
+        self._seen = 0
+        self._last_time = None
+
+    def refresh(self):
+        """Decode new chunks; returns the index of the first transaction added or changed, or None."""
+        index = self.capture.index_rows(self._seen)
+        if not len(index):
+            return None
+        self._seen += len(index)
+        data = self.capture.data()
+        first_changed = min(self._open.values(), default=len(self.transactions))
+        before = len(self.transactions)
+        for start, length, time, code, pid in zip(
+            index["offset"].tolist(),
+            index["length"].tolist(),
+            index["time"].tolist(),
+            index["direction"].tolist(),
+            index["port"].tolist(),
+        ):
+            direction = DIRECTION_NAMES.get(code) or "RX"
+            other = self._framer(pid, "RX" if direction == "TX" else "TX")
+            # The other side answering (or a long pause) ends a pending message.
+            if other.buffer:
+                self._message(pid, other.flush())
+            framer = self._framer(pid, direction)
+            if framer.buffer and time - framer.last > self.gap_s:
+                self._message(pid, framer.flush())
+            for msg in framer.feed(bytes(data[start:start + length]), time, start):
+                self._message(pid, msg)
+            self._last_time = time
+        self._expire(self._last_time)
+        if len(self.transactions) == before and not self._open:
+            return None
+        return max(0, min(first_changed, len(self.transactions) - 1))
+
+    def _framer(self, pid, direction):
+        framer = self._framers.get((pid, direction))
+        if framer is None:
+            framer = self._framers[(pid, direction)] = _Framer(direction)
+        return framer
+
+    def _message(self, pid, msg):
+        if msg is None:
+            return
+        if msg.direction == "TX":
+            self._close(pid)
+            self._open[pid] = len(self.transactions)
+            self.transactions.append(Transaction(msg, self.capture.ports[pid]))
+            return
+        if pid not in self._open:
+            self.unsolicited += 1
+            return
+        t = self.transactions[self._open[pid]]
+        if t.first_response is None:
+            t.first_response = msg.start
+            self.answered += 1
+        t.responses.append(msg)
+        if ERROR_PATTERN.search(msg.data):
+            t.status = "error"
+
+    def expire(self, now):
+        """Time out open commands still unanswered at ``now`` (epoch seconds).
+
+        Returns the index of the first transaction that changed, or None.
+        """
+        return self._expire(now)
+
+    def _expire(self, now):
+        """Mark open commands as timed out once ``timeout_s`` passes with no reply."""
+        if now is None:
+            return None
+        changed = None
+        for i in self._open.values():
+            t = self.transactions[i]
+            if t.status == "pending" and t.first_response is None and now - t.time > self.timeout_s:
+                t.status = "timeout"
+                changed = i if changed is None else min(changed, i)
+        return changed
+
+    def _close(self, pid):
+        i = self._open.pop(pid, None)
+        if i is None:
+            return
+        t = self.transactions[i]
+        if t.status == "pending":
+            if t.first_response is None or t.latency_s > self.timeout_s:
+                t.status = "timeout"
+            else:
+                t.status = "ok"
+
+
+def transaction_summary(transactions):
+    """Per command type: count, latency percentiles (ms), mean response bytes, errors, timeouts.
+
+    Returns a list of dicts sorted by command count, busiest first.
+    """
+    groups = {}
+    for t in transactions:
+        groups.setdefault(t.command_type, []).append(t)
+    out = []
+    for name, items in groups.items():
+        latencies = np.array([t.latency_s for t in items if t.latency_s is not None], dtype=np.float64) * 1000.0
+        sizes = [t.response_bytes for t in items if t.responses]
+        out.append(
+            {
+                "command": name,
+                "count": len(items),
+                "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else None,
+                "max_ms": float(latencies.max()) if len(latencies) else None,
+                "mean_bytes": float(np.mean(sizes)) if sizes else 0.0,
+                "errors": sum(1 for t in items if t.status == "error"),
+                "timeouts": sum(1 for t in items if t.status == "timeout"),
+            }
+        )
+    out.sort(key=lambda row: (-row["count"], row["command"]))
+    return out
+
+
+def latency_histogram(transactions, bins_ms=LATENCY_BINS_MS):
+    """Counts of answered commands per latency bin; the last bin is open-ended."""
+    latencies = np.array([t.latency_s for t in transactions if t.latency_s is not None], dtype=np.float64) * 1000.0
+    edges = np.asarray(bins_ms, dtype=np.float64)
+    counts = np.bincount(np.searchsorted(edges, latencies, side="right") - 1, minlength=len(edges))
+    return list(zip(edges.tolist(), counts[: len(edges)].tolist()))
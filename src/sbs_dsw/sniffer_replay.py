@@ -0,0 +1,176 @@
+import time
+
+try:
+    from .sniffer_capture import DIRECTION_CODES, DIRECTION_NAMES
+except ImportError:
+    from sniffer_capture import DIRECTION_CODES, DIRECTION_NAMES
+
+# Sleep until this close to a deadline, then spin, so chunk timing holds to
+# well under a millisecond instead of the OS sleep granularity.
+REPLAY_SPIN_S = 0.002
+# In answer mode, a host command is complete after this much silence (or a
+# line terminator).
+REPLAY_COMMAND_GAP_S = 0.05
+
+
+class ReplayStats:
+    """Progress of a replay; ``max_late_s`` is the worst slip behind the schedule."""
+
+    def __init__(self, total_chunks):
+        self.total_chunks = total_chunks
+        self.chunks = 0
+        self.bytes = 0
+        self.commands = 0
+        self.max_late_s = 0.0
+
+
+class CaptureChunks:
+    """Lazy sequence of ``(data, epoch, direction)`` over capture index rows.
+
+    Only the index is held; a chunk's bytes are copied out of the capture
+    when that chunk is read.
+    """
+
+    def __init__(self, index, data):
+        self._index = index
+        self._data = data
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        row = self._index[i]
+        start = int(row["offset"])
+        return bytes(self._data[start:start + int(row["length"])]), float(row["time"]), DIRECTION_NAMES.get(int(row["direction"]))
+
+    def __iter__(self):
+        for i in range(len(self._index)):
+            yield self[i]
+
+    def only(self, direction):
+        """The chunks of one direction, still lazy."""
+        return CaptureChunks(self._index[self._index["direction"] == DIRECTION_CODES[direction]], self._data)
+
+    def timeline(self):
+        """``(epoch, direction)`` per chunk, without reading any data."""
+        return zip(self._index["time"].tolist(), [DIRECTION_NAMES.get(c) for c in self._index["direction"].tolist()])
+
+
+def capture_chunks(capture, port=None):
+    """:class:`CaptureChunks` for every chunk of a :class:`SnifferCapture` (optionally one port)."""
+    index, data = capture.snapshot()
+    if port is not None:
+        index = index[index["port"] == capture.port_id(port, create=False)]
+    return CaptureChunks(index, data)
+
+
+def _sleep_until(deadline, stop_event):
+    while True:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 or stop_event.is_set():
+            return
+        if remaining > REPLAY_SPIN_S:
+            stop_event.wait(remaining - REPLAY_SPIN_S)
+
+
+def _send(ser, chunks, speed, stop_event, stats, progress):
+    """Write ``chunks`` keeping their recorded spacing divided by ``speed`` (0 = no waiting)."""
+    if not chunks:
+        return
+    start_wall = time.perf_counter()
+    first = chunks[0][1]
+    for chunk in chunks:
+        data, epoch = chunk[0], chunk[1]
+        if stop_event.is_set():
+            return
+        if speed:
+            deadline = start_wall + (epoch - first) / speed
+            _sleep_until(deadline, stop_event)
+            stats.max_late_s = max(stats.max_late_s, time.perf_counter() - deadline)
+        ser.write(data)
+        stats.chunks += 1
+        stats.bytes += len(data)
+        if progress is not None:
+            progress(stats)
+
+
+def _wait_for_command(ser, stop_event):
+    """Read one host command: up to a line terminator or a short silence. Returns the bytes (b"" on stop).
+
+    CR, LF and CRLF all end a command once; reads holding only terminators
+    (such as the LF of a CRLF that arrived after its CR) are skipped.
+    """
+    got = bytearray()
+    ser.timeout = REPLAY_COMMAND_GAP_S
+    while not stop_event.is_set():
+        data = ser.read(max(1, ser.in_waiting))
+        if data:
+            got += data
+            if not got.strip(b"\r\n"):
+                got.clear()
+            elif data.endswith((b"\r", b"\n")):
+                break
+        elif got:
+            break
+    return bytes(got)
+
+
+def _only(chunks, direction):
+    if isinstance(chunks, CaptureChunks):
+        return chunks.only(direction)
+    return [c for c in chunks if c[2] == direction]
+
+
+def _timeline(chunks):
+    if isinstance(chunks, CaptureChunks):
+        return chunks.timeline()
+    return ((c[1], c[2]) for c in chunks)
+
+
+def replay(chunks, ser, stop_event, direction="RX", speed=1.0, answer=False, progress=None):
+    """Write the ``direction`` chunks (all chunks for None) of a recorded capture to ``ser``.
+
+    ``chunks`` are ``(data, epoch, direction[, port])`` in capture order
+    (a list, or :class:`CaptureChunks`). With
+    ``speed`` 1 the recorded gaps between chunks are kept, 10 plays ten times
+    faster and 0 sends back to back. With ``answer`` the port plays the
+    device: recorded output before the first command is sent right away, then
+    each time the host sends a command the output recorded after the next
+    recorded command (the other direction) follows, in order and with its
+    recorded timing. Commands are paired by order, not content.
+
+    Runs until done or ``stop_event`` is set; ``progress(stats)`` is called
+    per chunk. Returns the :class:`ReplayStats`.
+    """
+    if not answer or direction is None:
+        selected = chunks if direction is None else _only(chunks, direction)
+        stats = ReplayStats(len(selected))
+        _send(ser, selected, speed, stop_event, stats, progress)
+        return stats
+
+    # Turns: (time the recorded command ended, positions of the ``direction``
+    # chunks that followed it); chunk data is read only when a turn is sent.
+    turns = [(None, [])]
+    in_command = False
+    for i, (epoch, chunk_direction) in enumerate(_timeline(chunks)):
+        if chunk_direction == direction:
+            turns[-1][1].append(i)
+            in_command = False
+        elif chunk_direction is not None:
+            if in_command:
+                turns[-1] = (epoch, turns[-1][1])
+            else:
+                turns.append((epoch, []))
+                in_command = True
+    stats = ReplayStats(sum(len(t[1]) for t in turns))
+    _send(ser, [chunks[i] for i in turns[0][1]], speed, stop_event, stats, progress)
+    for command_end, positions in turns[1:]:
+        if stop_event.is_set() or not _wait_for_command(ser, stop_event):
+            break
+        stats.commands += 1
+        turn = [chunks[i] for i in positions]
+        if turn and speed:
+            # Keep the recorded command-to-reply delay too.
+            _sleep_until(time.perf_counter() + max(0.0, turn[0][1] - command_end) / speed, stop_event)
+        _send(ser, turn, speed, stop_event, stats, progress)
+    return stats
@@ -0,0 +1,105 @@
+import re
+
+import numpy as np
+
+try:
+    from .sniffer_capture import DIRECTION_NAMES, direction_mask
+except ImportError:
+    from sniffer_capture import DIRECTION_NAMES, direction_mask
+
+SEARCH_KINDS = ("hex", "ascii", "regex")
+# The regex engine holds the GIL while it scans, so blocks stay small enough
+# that capture and UI threads get to run between them.
+SEARCH_BLOCK_BYTES = 4 * 1024 * 1024
+# Matches may run this far past a block boundary; longer regex matches that
+# straddle a boundary are cut there.
+SEARCH_OVERLAP_BYTES = 64 * 1024
+SEARCH_MAX_RESULTS = 10000
+
+
+def compile_pattern(text, kind="hex", ignore_case=False):
+    """Compile search ``text`` into a bytes regex.
+
+    ``hex`` takes byte pairs with optional spaces and ``??`` wildcards
+    (``"0D 0A"``, ``"AA ?? 55"``), ``ascii`` is a literal string and ``regex``
+    a Python regular expression applied to the raw bytes. Raises
+    ``ValueError`` for input that is not a valid pattern.
+    """
+    if kind not in SEARCH_KINDS:
+        raise ValueError(f"Unknown search kind: {kind}")
+    if not text:
+        raise ValueError("Empty search pattern")
+    flags = re.DOTALL | (re.IGNORECASE if ignore_case else 0)
+    if kind == "hex":
+        digits = re.sub(r"[\s,:]+", "", text)
+        if digits.lower().startswith("0x"):
+            digits = digits[2:]
+        if not digits or len(digits) % 2:
+            raise ValueError("Hex pattern needs whole bytes, e.g. 0D 0A")
+        parts = []
+        for i in range(0, len(digits), 2):
+            pair = digits[i:i + 2]
+            parts.append(b"." if pair == "??" else re.escape(bytes.fromhex(pair)))
+        return re.compile(b"".join(parts), re.DOTALL)
+    if kind == "ascii":
+        return re.compile(re.escape(text.encode("utf-8")), flags)
+    try:
+        return re.compile(text.encode("utf-8"), flags)
+    except re.error as exc:
+        raise ValueError(f"Invalid regex: {exc}") from exc
+
+
+def search_capture(capture, pattern, cancel=None, progress=None, direction=None, max_results=SEARCH_MAX_RESULTS):
+    """Find ``pattern`` in a :class:`SnifferCapture` without copying it.
+
+    The capture is scanned through its mmap in :data:`SEARCH_BLOCK_BYTES`
+    blocks, up to the size it had when the search started, so it can keep
+    growing meanwhile. ``cancel`` (a ``threading.Event``) stops early and
+    ``progress(done_bytes, total_bytes)`` is called per block.
+
+    Returns ``(offsets, lengths, times, directions, truncated)``: numpy arrays
+    of match start offsets and lengths, the epoch time and direction name of
+    the chunk where each match starts, and whether ``max_results`` cut the
+    list short. ``direction`` keeps only matches starting in RX or TX chunks
+    (and in chunks with no direction, which no filter hides).
+    """
+    data = capture.data()
+    total = min(capture.total_bytes, len(data))
+    offsets = []
+    lengths = []
+    truncated = False
+    index = capture.index_rows(0, len(capture)) if direction is not None else None
+    shown = direction_mask(index["direction"], direction) if index is not None else None
+    pos = 0
+    while pos < total:
+        if cancel is not None and cancel.is_set():
+            break
+        block_end = min(pos + SEARCH_BLOCK_BYTES, total)
+        for match in pattern.finditer(data, pos, min(block_end + SEARCH_OVERLAP_BYTES, total)):
+            start = match.start()
+            if start >= block_end:
+                break
+            if match.end() == start:
+                continue
+            if shown is not None and not shown[int(np.searchsorted(index["offset"], start, side="right")) - 1]:
+                continue
+            offsets.append(start)
+            lengths.append(match.end() - start)
+            if len(offsets) >= max_results:
+                truncated = True
+                break
+        if truncated:
+            break
+        pos = block_end
+        if progress is not None:
+            progress(pos, total)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    if not len(offsets):
+        return offsets, lengths, np.zeros(0), [], truncated
+    if index is None:
+        index = capture.index_rows(0, len(capture))
+    chunks = np.searchsorted(index["offset"], offsets, side="right") - 1
+    times = index["time"][chunks]
+    directions = [DIRECTION_NAMES.get(int(code)) for code in index["direction"][chunks]]
+    return offsets, lengths, times, directions, truncated
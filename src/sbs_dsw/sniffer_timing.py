@@ -0,0 +1,111 @@
+import numpy as np
+
+try:
+    from .sniffer_capture import DIRECTION_NAMES
+except ImportError:
+    from sniffer_capture import DIRECTION_NAMES
+
+GAP_CHAR = 1
+GAP_TURNAROUND = 2
+GAP_IDLE = 3
+GAP_KIND_NAMES = {GAP_CHAR: "char", GAP_TURNAROUND: "turnaround", GAP_IDLE: "idle"}
+
+BITS_PER_CHAR = 10  # 8N1: start + 8 data + stop
+# A pause inside a message longer than 1.5 characters is a stall (the same
+# limit Modbus RTU puts on inter-character gaps).
+CHAR_GAP_BITS = 15
+IDLE_GAP_S = 0.1
+GAP_BINS_MS = (0, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+GAP_DTYPE = np.dtype(
+    [
+        ("offset", np.uint64),
+        ("time", np.float64),
+        ("gap_s", np.float64),
+        ("bits", np.float64),
+        ("kind", np.uint8),
+        ("direction", np.uint8),
+        ("port", np.uint16),
+    ]
+)
+
+
+def find_gaps(capture, baud, char_gap_bits=CHAR_GAP_BITS, idle_s=IDLE_GAP_S, bits_per_char=BITS_PER_CHAR):
+    """Silences between reads of a precise-timing capture, as a :data:`GAP_DTYPE` array.
+
+    A read of ``n`` bytes returning at ``ns`` started arriving no later than
+    ``n`` character times earlier; the gap before it is the time from the
+    previous read (on any port or direction) to that point. A gap is a
+    ``turnaround`` when the previous read came from another port/direction,
+    ``idle`` when it is at least ``idle_s``, and ``char`` when it exceeds
+    ``char_gap_bits`` bit-times, i.e. a stall in the middle of a message.
+    Shorter gaps are dropped. ``offset`` is the stream offset of the first
+    byte after the gap.
+    """
+    index = capture.index_rows()
+    timing = capture.timing_rows()
+    if len(timing) < 2 or not len(index):
+        return np.zeros(0, dtype=GAP_DTYPE)
+    bit_s = 1.0 / float(baud)
+    offsets = timing["offset"].astype(np.int64)
+    chunk = np.searchsorted(index["offset"], timing["offset"], side="right") - 1
+    chunk_end = index["offset"][chunk].astype(np.int64) + index["length"][chunk]
+    nbytes = np.minimum(np.append(offsets[1:], np.iinfo(np.int64).max), chunk_end) - offsets
+    stream = index["port"][chunk].astype(np.int64) * 256 + index["direction"][chunk]
+
+    order = np.argsort(timing["ns"], kind="stable")
+    ns = timing["ns"][order]
+    stream = stream[order]
+    started = ns[1:] - nbytes[order][1:] * bits_per_char * bit_s * 1e9
+    gap_s = np.maximum(started - ns[:-1], 0.0) / 1e9
+    kind = np.zeros(len(gap_s), dtype=np.uint8)
+    kind[gap_s > char_gap_bits * bit_s] = GAP_CHAR
+    kind[gap_s >= idle_s] = GAP_IDLE
+    kind[stream[1:] != stream[:-1]] = GAP_TURNAROUND
+    keep = np.flatnonzero(kind)
+
+    rows = order[1:][keep]
+    gaps = np.zeros(len(keep), dtype=GAP_DTYPE)
+    gaps["offset"] = timing["offset"][rows]
+    gaps["time"] = capture.epoch_of_ns(ns[1:][keep])
+    gaps["gap_s"] = gap_s[keep]
+    gaps["bits"] = gap_s[keep] / bit_s
+    gaps["kind"] = kind[keep]
+    gaps["direction"] = index["direction"][chunk[rows]]
+    gaps["port"] = index["port"][chunk[rows]]
+    return gaps
+
+
+def gap_summary(gaps):
+    """Per gap kind: count and gap percentiles (ms), in :data:`GAP_KIND_NAMES` order."""
+    out = []
+    for code, name in GAP_KIND_NAMES.items():
+        ms = gaps["gap_s"][gaps["kind"] == code] * 1000.0
+        out.append(
+            {
+                "kind": name,
+                "count": len(ms),
+                "p50_ms": float(np.percentile(ms, 50)) if len(ms) else None,
+                "p95_ms": float(np.percentile(ms, 95)) if len(ms) else None,
+                "max_ms": float(ms.max()) if len(ms) else None,
+            }
+        )
+    return out
+
+
+def gap_histogram(gaps, kind=None, bins_ms=GAP_BINS_MS):
+    """Counts of gaps (of one kind code, or all) per bin; the last bin is open-ended."""
+    if kind is not None:
+        gaps = gaps[gaps["kind"] == kind]
+    edges = np.asarray(bins_ms, dtype=np.float64)
+    counts = np.bincount(np.searchsorted(edges, gaps["gap_s"] * 1000.0, side="right") - 1, minlength=len(edges))
+    return list(zip(edges.tolist(), counts[: len(edges)].tolist()))
+
+
+def describe_gap(gap, port_names):
+    """``(port, direction, kind)`` display names for one gap row."""
+    return (
+        port_names[int(gap["port"])] or "",
+        DIRECTION_NAMES.get(int(gap["direction"])) or "",
+        GAP_KIND_NAMES.get(int(gap["kind"]), "?"),
+    )
@@ -0,0 +1,170 @@
+import datetime as dt
+from collections import deque
+
+try:
+    from .sniffer_protocol import ERROR_PATTERN
+    from .sniffer_search import compile_pattern
+except ImportError:
+    from sniffer_protocol import ERROR_PATTERN
+    from sniffer_search import compile_pattern
+
+TRIGGER_KINDS = ("hex", "ascii", "regex", "error", "idle")
+TRIGGER_PRE_BYTES = 64 * 1024
+TRIGGER_POST_S = 5.0
+TRIGGER_IDLE_S = 1.0
+# Pattern matches may straddle reads by up to this many bytes.
+TRIGGER_OVERLAP_BYTES = 256
+
+
+class Trigger:
+    """One trigger condition.
+
+    ``hex``/``ascii``/``regex`` match ``text`` the way sniffer search does,
+    ``error`` matches :data:`ERROR_PATTERN` and ``idle`` fires on the first
+    bytes after at least ``idle_s`` of silence. ``direction`` (``"RX"``/``"TX"``)
+    limits the condition to one direction.
+    """
+
+    def __init__(self, kind, text="", direction=None, idle_s=TRIGGER_IDLE_S):
+        if kind not in TRIGGER_KINDS:
+            raise ValueError(f"Unknown trigger kind: {kind}")
+        self.kind = kind
+        self.text = text
+        self.direction = direction
+        self.idle_s = float(idle_s)
+        if kind == "error":
+            self.pattern = ERROR_PATTERN
+        elif kind == "idle":
+            self.pattern = None
+        else:
+            self.pattern = compile_pattern(text, kind)
+
+    def describe(self):
+        if self.kind == "idle":
+            what = f"idle ≥ {self.idle_s:g} s"
+        elif self.kind == "error":
+            what = "error response"
+        else:
+            what = f"{self.kind} {self.text!r}"
+        return f"{what} ({self.direction})" if self.direction else what
+
+
+class TriggerEngine:
+    """Keep only the traffic around trigger hits, like a logic analyzer.
+
+    Chunks (``(data, timestamp, direction[, port[, marks]])``) go through a
+    ring of the last ``pre_bytes`` bytes. When a :class:`Trigger` fires, a
+    segment opens with the ring's contents and records everything until
+    ``post_s`` after the latest hit; hits inside an open segment extend it.
+    :meth:`feed` and :meth:`expire` return actions for the caller to carry
+    out: ``("open", number, reason)``, ``("chunks", chunks)`` and
+    ``("close", number)``. Memory is bounded by the ring.
+    """
+
+    def __init__(self, triggers, pre_bytes=TRIGGER_PRE_BYTES, post_s=TRIGGER_POST_S):
+        self.triggers = list(triggers)
+        self.pre_bytes = max(0, int(pre_bytes))
+        self.post_s = float(post_s)
+        self.segments = 0
+        self.hits = 0
+        self.open = False
+        self._until = None
+        self._ring = deque()
+        self._ring_bytes = 0
+        self._tails = {}  # (port, direction) -> last bytes, for matches across reads
+        self._last_time = None
+
+    def feed(self, chunks):
+        actions = []
+        recorded = []
+        for chunk in chunks:
+            if not chunk[0]:
+                continue
+            t = _epoch(chunk[1])
+            if self.open and t > self._until:
+                self._flush(actions, recorded)
+                actions.append(("close", self.segments))
+                self.open = False
+            reason = self._check(chunk, t)
+            if reason is not None:
+                self.hits += 1
+                self._until = t + self.post_s
+                if not self.open:
+                    self.open = True
+                    self.segments += 1
+                    actions.append(("open", self.segments, reason))
+                    recorded.extend(self._ring)
+                    self._ring.clear()
+                    self._ring_bytes = 0
+            if self.open:
+                recorded.append(chunk)
+            else:
+                self._remember(chunk)
+        self._flush(actions, recorded)
+        return actions
+
+    def expire(self, now):
+        """Close the open segment once ``post_s`` has passed since its last hit (``now`` in epoch seconds)."""
+        if self.open and now > self._until:
+            self.open = False
+            return [("close", self.segments)]
+        return []
+
+    def _flush(self, actions, recorded):
+        if recorded:
+            actions.append(("chunks", list(recorded)))
+            recorded.clear()
+
+    def _check(self, chunk, t):
+        data, _ts, direction = chunk[:3]
+        key = (chunk[3] if len(chunk) > 3 else None, direction)
+        tail = self._tails.get(key, b"")
+        window = tail + bytes(data)
+        self._tails[key] = window[-TRIGGER_OVERLAP_BYTES:]
+        gap = None if self._last_time is None else t - self._last_time
+        self._last_time = t
+        for trigger in self.triggers:
+            if trigger.direction is not None and trigger.direction != direction:
+                continue
+            if trigger.pattern is None:
+                if gap is not None and gap >= trigger.idle_s:
+                    return trigger.describe()
+                continue
+            # Only matches that end in the new bytes count.
+            for match in trigger.pattern.finditer(window):
+                if match.end() > len(tail):
+                    return trigger.describe()
+        return None
+
+    def _remember(self, chunk):
+        if not self.pre_bytes:
+            return
+        self._ring.append(chunk)
+        self._ring_bytes += len(chunk[0])
+        while self._ring_bytes > self.pre_bytes:
+            excess = self._ring_bytes - self.pre_bytes
+            oldest = self._ring[0]
+            if len(oldest[0]) <= excess:
+                self._ring.popleft()
+                self._ring_bytes -= len(oldest[0])
+            else:
+                self._ring[0] = _trim_front(oldest, excess)
+                self._ring_bytes -= excess
+
+
+def _trim_front(chunk, count):
+    """``chunk`` without its first ``count`` bytes (precise-timing marks shifted to match)."""
+    trimmed = (chunk[0][count:],) + tuple(chunk[1:4])
+    if len(chunk) > 4 and chunk[4]:
+        marks = [(rel - count, ns) for rel, ns in chunk[4] if rel >= count]
+        cut = [ns for rel, ns in chunk[4] if rel < count]
+        if cut and (not marks or marks[0][0] > 0):
+            marks.insert(0, (0, cut[-1]))
+        trimmed += (marks,)
+    return trimmed
+
+
+def _epoch(timestamp):
+    if isinstance(timestamp, dt.datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
@@ -0,0 +1,239 @@
+import collections
+import queue
+import threading
+import time
+
+UI_EVENT_KEEP = "keep"
+UI_EVENT_MERGE = "merge"
+UI_EVENT_LATEST = "latest"
+
+
+class UIEventQueue:
+    """Bounded worker -> UI queue with per-event policies and lag telemetry.
+
+    Items are ``(event, args, kwargs)`` tuples as posted by ``_ui_post``.
+    Policies (set per event name, default ``keep``):
+
+    * ``keep``   - one queue slot per event (run results, errors).
+    * ``merge``  - folded into the pending entry for the same key, so a fast
+      producer occupies one slot per key until the UI drains it. Nothing is
+      lost; the dispatcher still sees every event. With ``limit``, an entry
+      holds at most that much ``cost(args, kwargs)`` (default 1 per event).
+    * ``latest`` - like ``merge`` but only the newest event per key is kept.
+
+    Nothing is ever dropped. A worker that would push the queue past
+    ``maxsize`` entries, or a merge entry past its ``limit``, waits until the
+    UI drains (backpressure); the wait is counted in ``blocked``. The UI
+    thread itself never waits, since only it can drain. :meth:`close`
+    releases waiting workers and ignores later posts.
+    """
+
+    def __init__(self, maxsize=20000):
+        self.maxsize = max(1, int(maxsize))
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._entries = collections.deque()
+        self._pending = {}  # (event, key) -> entry still waiting in the deque
+        self._policies = {}
+        self._drain_oldest = None
+        self._waiting = 0
+        self.closed = False
+        self.reset_stats()
+
+    def set_policy(self, event, policy, key=None, limit=None, cost=None):
+        self._policies[event] = (policy, key, limit, cost)
+
+    def reset_stats(self):
+        with self._lock:
+            self.enqueued = 0
+            self.merged = 0
+            self.blocked = 0
+            self.max_depth = len(self._entries)
+            self.max_latency_s = 0.0
+            self.last_latency_s = 0.0
+
+    def qsize(self):
+        return len(self._entries)
+
+    def put(self, item, block=True, timeout=None):
+        """Queue ``item``; waits for room on worker threads when ``block``, else raises ``queue.Full``."""
+        event, args, kwargs = item
+        policy, key_fn, limit, cost_fn = self._policies.get(event, (UI_EVENT_KEEP, None, None, None))
+        cost = cost_fn(args, kwargs) if cost_fn else 1
+        may_wait = block and threading.current_thread() is not threading.main_thread()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            key = (event, key_fn(args, kwargs) if key_fn else None)
+            merging = policy in (UI_EVENT_MERGE, UI_EVENT_LATEST)
+            waited = False
+            while not self.closed:
+                entry = self._pending.get(key) if merging else None
+                if entry is not None and (policy == UI_EVENT_LATEST or not limit or entry[4] + cost <= limit):
+                    break
+                if entry is None and len(self._entries) < self.maxsize:
+                    break
+                if not may_wait:
+                    if block:
+                        break  # UI thread: over the bound rather than deadlock
+                    raise queue.Full
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Full
+                if not waited:
+                    self.blocked += 1
+                    waited = True
+                self._waiting += 1
+                try:
+                    self._space.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            if self.closed:
+                return
+            self.enqueued += 1
+            now = time.monotonic()
+            entry = self._pending.get(key) if merging else None
+            if entry is not None:
+                if policy == UI_EVENT_LATEST:
+                    entry[2][:] = [(args, kwargs)]
+                    entry[4] = cost
+                else:
+                    entry[2].append((args, kwargs))
+                    entry[4] += cost
+                self.merged += 1
+                return
+            entry = [event, now, [(args, kwargs)], key, cost]
+            self._entries.append(entry)
+            if merging:
+                self._pending[key] = entry
+            self.max_depth = max(self.max_depth, len(self._entries))
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def drain(self, max_events):
+        """Pop pending entries, expanded to events, and wake waiting workers."""
+        events = []
+        oldest = None
+        with self._lock:
+            while self._entries and len(events) < max_events:
+                entry = self._entries.popleft()
+                event, t_enq, items, key, _cost = entry
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+                oldest = t_enq if oldest is None else min(oldest, t_enq)
+                events.extend((event, args, kwargs) for args, kwargs in items)
+            if events:
+                self._space.notify_all()
+        self._drain_oldest = oldest
+        return events
+
+    def close(self):
+        """Release waiting workers; later posts are ignored."""
+        with self._lock:
+            self.closed = True
+            self._space.notify_all()
+
+    def mark_handled(self):
+        """Record enqueue-to-handle latency for the entries returned by the last drain."""
+        if self._drain_oldest is None:
+            return
+        latency = time.monotonic() - self._drain_oldest
+        self._drain_oldest = None
+        self.last_latency_s = latency
+        self.max_latency_s = max(self.max_latency_s, latency)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "depth": len(self._entries),
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued,
+                "merged": self.merged,
+                "blocked": self.blocked,
+                "waiting": self._waiting,
+                "last_latency_s": self.last_latency_s,
+                "max_latency_s": self.max_latency_s,
+            }
+
+
+class UIEventDispatcher:
+    """Table-driven dispatcher for events posted by worker threads.
+
+    Each event name maps to a handler. Plain handlers are called once per
+    event with the posted ``*args, **kwargs``. Batched handlers are called
+    once per tick per target with every pending event for that target, so a
+    burst of console lines becomes one widget update:
+
+    * ``batch_key(args, kwargs)`` picks the target (e.g. the port) and the
+      handler receives ``(target, [(args, kwargs), ...])``.
+    * ``coalesce=True`` keeps only the newest event per target and calls the
+      handler with that event's arguments, for state where only the latest
+      value is visible (status labels).
+
+    Events without ``batch_key`` act as barriers: pending batches are flushed
+    before they run, so ordering between e.g. "clear view" and "append
+    sample" is preserved.
+    """
+
+    def __init__(self, event_queue, max_events_per_tick=5000):
+        self.event_queue = event_queue
+        self.max_events_per_tick = max(1, int(max_events_per_tick))
+        self._routes = {}
+
+    def register(self, event, handler, batch_key=None, coalesce=False):
+        self._routes[event] = (handler, batch_key, bool(coalesce))
+
+    def register_many(self, table):
+        """Register ``{event: handler}`` or ``{event: (handler, batch_key, coalesce)}``."""
+        for event, route in table.items():
+            if callable(route):
+                self.register(event, route)
+            else:
+                self.register(event, *route)
+
+    def drain(self):
+        """Pop up to ``max_events_per_tick`` pending events without blocking."""
+        if hasattr(self.event_queue, "drain"):
+            return self.event_queue.drain(self.max_events_per_tick)
+        events = []
+        while len(events) < self.max_events_per_tick:
+            try:
+                events.append(self.event_queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def dispatch(self, events):
+        """Run handlers for ``events`` (``(name, args, kwargs)`` tuples); returns the count handled."""
+        pending = {}
+        for event, args, kwargs in events:
+            route = self._routes.get(event)
+            if route is None:
+                continue
+            handler, batch_key, coalesce = route
+            if batch_key is None:
+                self._flush(pending)
+                handler(*args, **kwargs)
+                continue
+            key = (event, batch_key(args, kwargs))
+            if coalesce:
+                # Re-insert so the flush order follows the newest event.
+                pending.pop(key, None)
+                pending[key] = (args, kwargs)
+            else:
+                pending.setdefault(key, []).append((args, kwargs))
+        self._flush(pending)
+        return len(events)
+
+    def pump(self):
+        return self.dispatch(self.drain())
+
+    def _flush(self, pending):
+        for (event, target), items in pending.items():
+            handler, _batch_key, coalesce = self._routes[event]
+            if coalesce:
+                args, kwargs = items
+                handler(*args, **kwargs)
+            else:
+                handler(target, items)
+        pending.clear()
@@ -0,0 +1,79 @@
+import threading
+
+import serial
+
+from sbs_dsw.sniffer_capture import SnifferCapture
+from sbs_dsw.sniffer_pcapng import PcapngWriter, read_pcapng
+from sbs_dsw.sniffer_replay import _wait_for_command, capture_chunks, replay
+
+
+class ScriptedPort:
+    """Serial stand-in: ``read`` hands out the scripted reads, ``write`` records."""
+
+    def __init__(self, reads=()):
+        self.reads = list(reads)
+        self.written = []
+        self.timeout = None
+
+    @property
+    def in_waiting(self):
+        return len(self.reads[0]) if self.reads else 0
+
+    def read(self, _size=1):
+        return self.reads.pop(0) if self.reads else b""
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+
+def _write_pcapng(path):
+    chunks = [
+        (b"ts\r\n", 100.00, "TX", "COM3"),
+        (b"22.5,0.1\r\n", 100.01, "RX", "COM3"),
+        (b"other\r\n", 100.02, "RX", "COM4"),
+        (b"ts\r\n", 100.03, "TX", "COM3"),
+        (b"22.6,0.1\r\n", 100.04, "RX", "COM3"),
+    ]
+    writer = PcapngWriter(path)
+    writer.write_chunks(chunks, "COM3")
+    writer.close()
+    return chunks
+
+
+def test_replay_pcapng_file_end_to_end(tmp_path):
+    path = tmp_path / "capture.pcapng"
+    _write_pcapng(path)
+    chunks = [c for c in read_pcapng(path) if c[3] == "COM3"]
+    ser = serial.serial_for_url("loop://", timeout=0.1)
+    try:
+        stats = replay(chunks, ser, threading.Event(), direction="RX", speed=0)
+        assert stats.chunks == 2
+        assert ser.read(stats.bytes) == b"22.5,0.1\r\n22.6,0.1\r\n"
+    finally:
+        ser.close()
+
+
+def test_replay_pcapng_answers_each_command_once(tmp_path):
+    path = tmp_path / "capture.pcapng"
+    _write_pcapng(path)
+    chunks = [c for c in read_pcapng(path) if c[3] == "COM3"]
+    ser = ScriptedPort([b"ts\r", b"\n", b"ts\r\n"])
+    stats = replay(chunks, ser, threading.Event(), direction="RX", speed=0, answer=True)
+    assert stats.commands == 2
+    assert ser.written == [b"22.5,0.1\r\n", b"22.6,0.1\r\n"]
+
+
+def test_wait_for_command_skips_lone_terminators():
+    ser = ScriptedPort([b"\n", b"ts\r", b"\n"])
+    assert _wait_for_command(ser, threading.Event()) == b"ts\r"
+    assert ser.reads == [b"\n"]
+
+
+def test_capture_chunks_reads_data_lazily(tmp_path):
+    capture = SnifferCapture(str(tmp_path / "sniffer.bin"))
+    capture.extend([(b"ts\r\n", 1.0, "TX"), (b"22.5\r\n", 1.1, "RX"), (b"ts\r\n", 1.2, "TX"), (b"22.6\r\n", 1.3, "RX")])
+    chunks = capture_chunks(capture)
+    assert len(chunks) == 4
+    assert chunks[1] == (b"22.5\r\n", 1.1, "RX")
+    assert [c[0] for c in chunks.only("RX")] == [b"22.5\r\n", b"22.6\r\n"]
+    capture.close()
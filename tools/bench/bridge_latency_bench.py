@@ -0,0 +1,71 @@
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import serial
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sbs_dsw.serial_bridge import ForwardLatency, forward_loop  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure latency added by the bridge forwarding loop over loop:// ports.")
+    parser.add_argument("--messages", type=int, default=200, help="Messages per size (default: 200)")
+    parser.add_argument("--sizes", default="1,8,64,512,4096", help="Comma-separated message sizes in bytes")
+    parser.add_argument("--legacy", action="store_true", help="Also time the old read(256)/50 ms timeout loop")
+    return parser.parse_args()
+
+
+def legacy_loop(source, dest, stop_event, on_data=None, latency=None):
+    source.timeout = 0.05
+    while not stop_event.is_set():
+        data = source.read(256)
+        if data:
+            dest.write(data)
+
+
+def run(loop, size, messages):
+    """End-to-end latency (us) of ``messages`` writes of ``size`` bytes through ``loop``."""
+    upstream = serial.serial_for_url("loop://", timeout=1.0)
+    downstream = serial.serial_for_url("loop://", timeout=1.0)
+    stop = threading.Event()
+    latency = ForwardLatency()
+    worker = threading.Thread(target=loop, args=(upstream, downstream, stop), kwargs={"latency": latency}, daemon=True)
+    worker.start()
+    payload = bytes(range(256)) * (size // 256 + 1)
+    payload = payload[:size]
+    out = np.zeros(messages)
+    for i in range(messages):
+        t0 = time.perf_counter_ns()
+        upstream.write(payload)
+        got = 0
+        while got < size:
+            got += len(downstream.read(size - got))
+        out[i] = (time.perf_counter_ns() - t0) / 1000.0
+    stop.set()
+    worker.join(timeout=1.0)
+    return out, latency.summary()
+
+
+def main():
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    loops = [("forward_loop", forward_loop)] + ([("legacy", legacy_loop)] if args.legacy else [])
+    for name, loop in loops:
+        for size in sizes:
+            e2e, st = run(loop, size, args.messages)
+            line = (
+                f"{name:12s} {size:>6d} B  end-to-end p50 {np.percentile(e2e, 50):9.1f} us  "
+                f"p99 {np.percentile(e2e, 99):9.1f} us"
+            )
+            if st["count"]:
+                line += f"  | in-bridge p50 {st['p50_us']:7.1f} us  p99 {st['p99_us']:7.1f} us  ({st['count']} forwards)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
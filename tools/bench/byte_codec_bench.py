@@ -0,0 +1,95 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sbs_dsw.byte_codec import BYTE_MODES, format_bytes  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure byte-to-text throughput (MB/s) per display mode.")
+    parser.add_argument("--bytes", type=int, default=1_000_000, help="Bytes formatted per mode (default: 1000000)")
+    parser.add_argument("--chunk", type=int, default=256, help="Bytes per call, like one serial read (default: 256)")
+    parser.add_argument(
+        "--data",
+        choices=("text", "binary"),
+        default="text",
+        help="Mostly printable NMEA-like text or uniform random bytes (default: text)",
+    )
+    return parser.parse_args()
+
+
+def make_chunks(total, chunk, kind):
+    rng = np.random.default_rng(0)
+    if kind == "binary":
+        raw = rng.integers(0, 256, total, dtype=np.uint8).tobytes()
+    else:
+        line = b"$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47\r\n"
+        raw = (line * (total // len(line) + 1))[:total]
+    return [raw[i:i + chunk] for i in range(0, total, chunk)]
+
+
+def legacy_format(data, mode):
+    """The per-byte loops the console used before byte_codec."""
+    if mode == "hex":
+        return " ".join(f"{b:02X}" for b in data)
+    if mode == "dec":
+        return " ".join(str(b) for b in data)
+    if mode == "bin":
+        return " ".join(f"{b:08b}" for b in data)
+    if mode == "hexdump":
+        lines = []
+        for i in range(0, len(data), 16):
+            chunk = data[i:i + 16]
+            left = " ".join(f"{b:02X}" for b in chunk[:8])
+            if len(chunk) > 8:
+                left += "  " + " ".join(f"{b:02X}" for b in chunk[8:])
+            text = "".join(chr(b) if 32 <= b <= 126 else "." for b in chunk)
+            lines.append(f"{i:08X}  {left:<50} │ {text}")
+        return "\n".join(lines)
+    out = []
+    for b in data:
+        if 32 <= b <= 126:
+            out.append(chr(b))
+        elif b == 13:
+            out.append("<CR>")
+        elif b == 10:
+            out.append("<LF>")
+        elif b == 9:
+            out.append("<TAB>")
+        else:
+            out.append(f"<0x{b:02X}>")
+    return "".join(out)
+
+
+def run(formatter, mode, chunks):
+    t0 = time.perf_counter()
+    for data in chunks:
+        formatter(data, mode)
+    return time.perf_counter() - t0
+
+
+def main():
+    args = parse_args()
+    chunks = make_chunks(args.bytes, args.chunk, args.data)
+    total = sum(len(c) for c in chunks)
+    print(f"{total:,} bytes in {len(chunks):,} chunks of {args.chunk} ({args.data})")
+    for mode in BYTE_MODES:
+        for data in chunks[:64]:
+            if format_bytes(data, mode) != legacy_format(data, mode):
+                print(f"{mode}: output differs from the legacy formatter")
+                break
+        codec = run(format_bytes, mode, chunks)
+        legacy = run(legacy_format, mode, chunks)
+        print(
+            f"{mode:8s} codec: {total / codec / 1e6:8.2f} MB/s  legacy: {total / legacy / 1e6:8.2f} MB/s"
+            f"  ({legacy / codec:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
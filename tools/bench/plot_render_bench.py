@@ -0,0 +1,133 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sbs_dsw.plot_lod import MinMaxPyramid  # noqa: E402
+from sbs_dsw.raster import RasterImage  # noqa: E402
+
+COLORS = ["#2563eb", "#dc2626", "#059669", "#d97706", "#7c3aed", "#0891b2", "#db2777", "#65a30d", "#ea580c", "#4f46e5"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare canvas-item and numpy-raster plot rendering.")
+    parser.add_argument("--ports", type=int, default=10, help="Number of series (default: 10)")
+    parser.add_argument("--points", type=int, default=100_000, help="Samples per series (default: 100000)")
+    parser.add_argument("--width", type=int, default=1000, help="Plot width in pixels (default: 1000)")
+    parser.add_argument("--height", type=int, default=400, help="Plot height in pixels (default: 400)")
+    parser.add_argument("--markers", action="store_true", help="Also draw a marker per point")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case (default: 3)")
+    return parser.parse_args()
+
+
+def make_series(ports, points):
+    rng = np.random.default_rng(0)
+    series = []
+    for i in range(ports):
+        walk = np.cumsum(rng.normal(0.0, 1.0, points)) + i * 50.0
+        pyramid = MinMaxPyramid()
+        pyramid.extend(walk)
+        series.append(pyramid)
+    return series
+
+
+def project(series, width, height, lod):
+    """Pixel coordinates per series: every sample, or the pyramid summary."""
+    n = max(len(s) for s in series)
+    lows = []
+    highs = []
+    summaries = []
+    for s in series:
+        xs, mins, maxs, level = s.query(0, n, width if lod else n)
+        summaries.append((xs, mins, maxs, level))
+        lows.append(np.nanmin(mins))
+        highs.append(np.nanmax(maxs))
+    y_min, y_max = min(lows), max(highs)
+    y_den = max(y_max - y_min, 1e-12)
+    out = []
+    for xs, mins, maxs, level in summaries:
+        px = xs / max(n - 1, 1) * (width - 1)
+        py_min = (height - 1) - (mins - y_min) / y_den * (height - 1)
+        if level == 0:
+            out.append((px, py_min, level))
+        else:
+            py_max = (height - 1) - (maxs - y_min) / y_den * (height - 1)
+            out.append((np.repeat(px, 2), np.column_stack((py_min, py_max)).ravel(), level))
+    return out
+
+
+def draw_items(canvas, lines, markers):
+    canvas.delete("all")
+    for (xs, ys, level), color in zip(lines, COLORS * 4):
+        canvas.create_line(*np.column_stack((xs, ys)).ravel().tolist(), fill=color, width=2 if level == 0 else 1)
+        if markers and level == 0:
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=color, outline="")
+    canvas.update()
+
+
+def draw_raster(canvas, lines, markers, width, height):
+    img = RasterImage(width, height, "#060e18")
+    for (xs, ys, level), color in zip(lines, COLORS * 4):
+        img.polyline(xs, ys, color, width=2 if level == 0 else 1)
+        if markers and level == 0:
+            img.markers(xs, ys, color, radius=2)
+    data = img.to_ppm()
+    if canvas is not None:
+        import tkinter as tk
+
+        canvas.delete("all")
+        canvas._raster_photo = tk.PhotoImage(master=canvas, data=data, format="PPM")
+        canvas.create_image(0, 0, image=canvas._raster_photo, anchor="nw")
+        canvas.update()
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    args = parse_args()
+    print(f"Building {args.ports} x {args.points} samples...")
+    series = make_series(args.ports, args.points)
+
+    canvas = None
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+        canvas = tk.Canvas(root, width=args.width, height=args.height, bg="#060e18", highlightthickness=0)
+        canvas.pack()
+        root.update()
+    except Exception as exc:
+        print(f"Tk unavailable ({exc}); item-based cases skipped, raster timed without blit.")
+
+    for lod in (False, True):
+        lines = project(series, args.width, args.height, lod)
+        label = "pyramid" if lod else "all points"
+        n_points = sum(len(xs) for xs, _ys, _level in lines)
+        if canvas is not None:
+            t = best_of(args.repeat, lambda: draw_items(canvas, lines, args.markers))
+            print(f"items  ({label:10s}, {n_points:>9d} pts): {t * 1000:9.1f} ms")
+        t = best_of(args.repeat, lambda: draw_raster(canvas, lines, args.markers, args.width, args.height))
+        print(f"raster ({label:10s}, {n_points:>9d} pts): {t * 1000:9.1f} ms")
+
+    # Legend std-dev of a window covering almost every sample, for every series.
+    n = max(len(s) for s in series)
+    t = best_of(args.repeat, lambda: [np.nanstd(s.values()[1 : n - 1], ddof=1) for s in series])
+    print(f"window std (raw scan):          {t * 1000:9.2f} ms")
+    t = best_of(args.repeat, lambda: [s.std(1, n - 1) for s in series])
+    print(f"window std (pyramid moments):   {t * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
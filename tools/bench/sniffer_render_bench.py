@@ -0,0 +1,103 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sbs_dsw.sniffer_format import TagRuns, format_ascii, format_binary, format_decimal, format_hex, format_hexdump  # noqa: E402
+
+MODES = ("hexdump", "hex", "ascii", "dec", "bin")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure sniffer display throughput (bytes/s) per display mode.")
+    parser.add_argument("--bytes", type=int, default=1_000_000, help="Bytes fed per mode (default: 1000000)")
+    parser.add_argument("--chunk", type=int, default=256, help="Bytes per reader chunk (default: 256)")
+    parser.add_argument(
+        "--data",
+        choices=("text", "binary"),
+        default="text",
+        help="Mostly printable NMEA-like text or uniform random bytes (default: text)",
+    )
+    parser.add_argument("--direction", choices=("none", "RX", "TX"), default="none", help="Mirror-mode direction tag")
+    parser.add_argument("--no-timestamps", action="store_true", help="Omit per-chunk timestamps")
+    return parser.parse_args()
+
+
+def make_chunks(total, chunk, kind):
+    rng = np.random.default_rng(0)
+    if kind == "binary":
+        raw = rng.integers(0, 256, total, dtype=np.uint8).tobytes()
+    else:
+        line = b"$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47\r\n"
+        raw = (line * (total // len(line) + 1))[:total]
+    return [raw[i:i + chunk] for i in range(0, total, chunk)]
+
+
+def format_chunk(mode, data, offset, ts_text, direction):
+    runs = TagRuns()
+    if direction:
+        runs.add(f"[{direction}] ", "rx" if direction == "RX" else "tx")
+    if mode == "hexdump":
+        offset = format_hexdump(runs, data, offset, ts_text, direction)
+    elif mode == "hex":
+        format_hex(runs, data, ts_text, direction)
+    elif mode == "ascii":
+        format_ascii(runs, data, ts_text, direction)
+    elif mode == "dec":
+        format_decimal(runs, data, ts_text, direction)
+    else:
+        format_binary(runs, data, ts_text, direction)
+    return runs, offset
+
+
+def run_mode(mode, chunks, ts_text, direction, text=None):
+    """Feed every chunk through the formatter (and the Text widget if given)."""
+    offset = 0
+    n_runs = 0
+    t0 = time.perf_counter()
+    for data in chunks:
+        runs, offset = format_chunk(mode, data, offset, ts_text, direction)
+        n_runs += len(runs)
+        if text is not None:
+            text.insert("end", *runs.parts)
+            text.see("end")
+    if text is not None:
+        text.update()
+    return time.perf_counter() - t0, n_runs
+
+
+def main():
+    args = parse_args()
+    chunks = make_chunks(args.bytes, args.chunk, args.data)
+    total = sum(len(c) for c in chunks)
+    ts_text = None if args.no_timestamps else "12:34:56.789"
+    direction = None if args.direction == "none" else args.direction
+
+    text = None
+    try:
+        import tkinter as tk
+
+        root = tk.Tk()
+        text = tk.Text(root, width=100, height=30, wrap=tk.NONE)
+        text.pack()
+        root.update()
+    except Exception as exc:
+        print(f"Tk unavailable ({exc}); timing formatting only.")
+
+    print(f"{total:,} bytes in {len(chunks):,} chunks of {args.chunk} ({args.data})")
+    for mode in MODES:
+        elapsed, n_runs = run_mode(mode, chunks, ts_text, direction)
+        line = f"{mode:8s} format: {total / elapsed / 1e6:8.2f} MB/s  ({n_runs / len(chunks):6.1f} runs/chunk)"
+        if text is not None:
+            text.delete("1.0", "end")
+            elapsed, _n = run_mode(mode, chunks, ts_text, direction, text)
+            line += f"  display: {total / elapsed / 1e6:8.2f} MB/s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sbs_dsw.sniffer_capture import SnifferCapture  # noqa: E402
+from sbs_dsw.sniffer_search import compile_pattern, search_capture  # noqa: E402
+
+PATTERNS = (("hex", "0D 0A"), ("hex", "AA ?? 55"), ("ascii", "$GPGGA"), ("regex", r"\$GP[A-Z]{3},\d+"))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time sniffer capture search over a synthetic capture.")
+    parser.add_argument("--mb", type=int, default=500, help="Capture size in MB (default: 500)")
+    parser.add_argument("--chunk", type=int, default=256, help="Bytes per captured read (default: 256)")
+    return parser.parse_args()
+
+
+def build_capture(path, total, chunk):
+    capture = SnifferCapture(path)
+    block = os.urandom(1 << 20)
+    now = time.time()
+    written = 0
+    while written < total:
+        batch = [(block[i:i + chunk], now, "RX" if i % (2 * chunk) else "TX") for i in range(0, len(block), chunk)]
+        capture.extend(batch)
+        written += len(block)
+    capture.extend([(b"$GPGGA,123519,4807.038,N\r\n", now, "RX")])
+    return capture
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        capture = build_capture(os.path.join(tmp, "bench.bin"), args.mb * 1024 * 1024, args.chunk)
+        print(f"Built {capture.total_bytes / 1e6:.0f} MB in {len(capture):,} chunks ({time.perf_counter() - t0:.1f} s)")
+        for kind, text in PATTERNS:
+            t0 = time.perf_counter()
+            offsets, _lengths, _times, _dirs, truncated = search_capture(capture, compile_pattern(text, kind))
+            elapsed = time.perf_counter() - t0
+            more = "+" if truncated else ""
+            print(
+                f"{kind:5s} {text!r:22s} {len(offsets):>6d}{more:1s} matches  "
+                f"{elapsed:6.2f} s  {capture.total_bytes / elapsed / 1e6:8.1f} MB/s"
+            )
+        capture.close()
+
+
+if __name__ == "__main__":
+    main()